@@ -27,7 +27,8 @@ from .excel_tools import (
     apply_excel_formula,
     apply_excel_formula_range,
     validate_excel_formula,
-    apply_conditional_formatting
+    apply_conditional_formatting,
+    ExcelSession
 )
 
 from .excel_table_pivot_tools import (
@@ -91,6 +92,7 @@ __all__ = [
     'apply_excel_formula_range',
     'validate_excel_formula',
     'apply_conditional_formatting',
+    'ExcelSession',
     # Pivot and Table tools
     'create_excel_table',
     'sort_excel_table',
@@ -1,97 +1,94 @@
 """Module for handling dependency imports and checks."""
 
+import importlib
+import importlib.util
 import os
 import sys
 from typing import Dict, Any, List
 
+# The optional libraries are slow to import, so availability is checked
+# without importing them and each module is imported on first use
+def _is_installed(module_name: str) -> bool:
+    return importlib.util.find_spec(module_name) is not None
+
 # PDF related imports
-try:
-    import PyPDF2
-except ImportError:
+if not _is_installed("PyPDF2"):
     print("PyPDF2 not installed. To read PDF files: pip install PyPDF2")
 
-try:
-    import fitz  # PyMuPDF
-    has_pymupdf = True
-except ImportError:
-    has_pymupdf = False
+has_pymupdf = _is_installed("fitz")  # PyMuPDF
+if not has_pymupdf:
     print("PyMuPDF not installed. For better PDF image detection: pip install pymupdf")
 
-try:
-    import pdfplumber
-    has_pdfplumber = True
-except ImportError:
-    has_pdfplumber = False
+has_pdfplumber = _is_installed("pdfplumber")
+if not has_pdfplumber:
     print("pdfplumber not installed. For better PDF text extraction: pip install pdfplumber")
 
-try:
-    import tabula
-    has_tabula = True
-except ImportError:
-    has_tabula = False
+has_tabula = _is_installed("tabula")
+if not has_tabula:
     print("Tabula-py not installed. For better PDF table extraction: pip install tabula-py")
 
 # Office document imports
-try:
-    import docx  # for .docx files
-except ImportError:
+if not _is_installed("docx"):
     print("python-docx not installed. To read Word files: pip install python-docx")
 
-try:
-    import openpyxl  # for .xlsx files
-except ImportError:
+if not _is_installed("openpyxl"):
     print("openpyxl not installed. To read Excel files: pip install openpyxl")
 
-try:
-    from pptx import Presentation  # for .pptx files
-except ImportError:
+if not _is_installed("pptx"):
     print("python-pptx not installed. To read PowerPoint files: pip install python-pptx")
 
 # Image handling
-try:
-    from PIL import Image
-    has_pil = True
-except ImportError:
+has_pil = _is_installed("PIL")
+if not has_pil:
     print("Pillow not installed. For better image analysis: pip install Pillow")
-    has_pil = False
 
 # Ebook and RTF support
-try:
-    import ebooklib
-    from ebooklib import epub
-    from bs4 import BeautifulSoup
-    has_epub_support = True
-except ImportError:
-    has_epub_support = False
-    print("EPUB support not available. To read EPUB files: pip install ebooklib beautifulsoup4")
+# The EPUB reader parses chapters with lxml, which is installed with ebooklib
+has_epub_support = _is_installed("ebooklib") and _is_installed("lxml")
+if not has_epub_support:
+    print("EPUB support not available. To read EPUB files: pip install ebooklib")
 
-try:
-    import striprtf.striprtf as striprtf
-    has_rtf_support = True
-except ImportError:
-    has_rtf_support = False
+has_rtf_support = _is_installed("striprtf")
+if not has_rtf_support:
     print("RTF support not available. To read RTF files: pip install striprtf")
 
-# Export all feature flags and modules
+# Module and attribute providing each lazily imported name (attribute None for the module itself)
+_LAZY_IMPORTS = {
+    'PyPDF2': ('PyPDF2', None),
+    'fitz': ('fitz', None),
+    'pdfplumber': ('pdfplumber', None),
+    'tabula': ('tabula', None),
+    'docx': ('docx', None),
+    'openpyxl': ('openpyxl', None),
+    'Presentation': ('pptx', 'Presentation'),
+    'Image': ('PIL.Image', None),
+    'ebooklib': ('ebooklib', None),
+    'epub': ('ebooklib.epub', None),
+    'BeautifulSoup': ('bs4', 'BeautifulSoup'),
+    'striprtf': ('striprtf.striprtf', None),
+}
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_IMPORTS[name]
+    try:
+        value = importlib.import_module(module_name)
+    except ImportError as e:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r} ({e})") from e
+    if attribute is not None:
+        value = getattr(value, attribute)
+    # Later lookups find the name directly
+    globals()[name] = value
+    return value
+
+# Export the feature flags; the optional modules are only imported when looked up by name,
+# so a star import does not load or require them
 __all__ = [
-    # Feature flags
     'has_pymupdf',
     'has_pdfplumber',
     'has_tabula',
     'has_pil',
     'has_epub_support',
-    'has_rtf_support',
-    
-    # Modules
-    'PyPDF2',
-    'fitz',
-    'pdfplumber',
-    'tabula',
-    'docx',
-    'openpyxl',
-    'Presentation',
-    'Image',
-    'epub',
-    'BeautifulSoup',
-    'striprtf'
+    'has_rtf_support'
 ] 
\ No newline at end of file
@@ -7,20 +7,28 @@ worksheets, ranges, and formatting. It builds upon openpyxl for Excel operations
 import os
 import logging
 import json
+import operator
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Union, Tuple
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union, Tuple
 import re
 import time
 
 from openpyxl import Workbook, load_workbook
 import openpyxl
 from openpyxl.utils import get_column_letter, column_index_from_string
-from openpyxl.utils.cell import range_boundaries
+from openpyxl.utils.cell import coordinate_to_tuple, range_boundaries
 from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.cell.cell import Cell, WriteOnlyCell
 from openpyxl.styles import Font, Border, PatternFill, Side, Alignment
 from openpyxl.styles.colors import Color
 from openpyxl.worksheet.datavalidation import DataValidation
+from openpyxl.worksheet.cell_range import MultiCellRange
+from openpyxl.worksheet._reader import WorkSheetParser
+
+from .utils.sheet_utils import EMPTY_VALUES, count_sheet_drawings, first_row_values, sheet_dimension
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -30,6 +38,21 @@ ARRAY_FORMULA_TYPES = ["XLOOKUP", "FILTER", "UNIQUE", "SORT", "SORTBY", "SEQUENC
 ARRAY_REFERENCE_PATTERN = r'([A-Z]+[0-9]+)#'  # Matches references like A2# used in spilled array references
 EXTERNAL_REF_PATTERN = r'\[([^\]]+)\]'
 
+# Default header style for newly added columns
+_DEFAULT_HEADER_STYLE = {
+    "bold": True,
+    "bg_color": None,  # No background color by default
+    "font_size": None,  # Keep default font size
+    "alignment": "center"
+}
+
+# Precompiled array formula detectors, matching the function name followed by an
+# opening parenthesis so that plain occurrences of the name are not picked up
+_ARRAY_FORMULA_RES = [
+    (array_type, re.compile(rf'\b{array_type}\s*\(', re.IGNORECASE))
+    for array_type in ARRAY_FORMULA_TYPES
+]
+
 # Exceptions
 class ExcelError(Exception):
     """Base exception for Excel operations"""
@@ -53,13 +76,28 @@ class ValidationError(ExcelError):
 
 # Add after imports section (around line 20)
 try:
-    from formulas import Parser
+    from formulas import ExcelModel, Parser
     from formulas.errors import FormulaError
     has_formula_engine = True
 except ImportError:
     has_formula_engine = False
     print("Formulas library not installed. For formula evaluation: pip install formulas")
 
+# Formula parsing builds large grammar tables, so one parser is shared by all calls
+_PARSER = Parser() if has_formula_engine else None
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+# Optional Rust based reader, used for the cell values of formula context
+try:
+    from python_calamine import CalamineWorkbook
+    has_calamine = True
+except ImportError:
+    has_calamine = False
+
 # Helper Functions
 def parse_cell_reference(cell_ref: str) -> Tuple[int, int]:
     """Parse a cell reference (e.g. 'A1') into row and column indices"""
@@ -94,6 +132,29 @@ def format_range_string(start_row: int, start_col: int, end_row: int, end_col: i
     """Format a range string from row and column indices"""
     return f"{get_column_letter(start_col)}{start_row}:{get_column_letter(end_col)}{end_row}"
 
+def fit_column_widths(
+    worksheet: Worksheet,
+    col_letters: List[str],
+    max_lengths: List[float],
+    min_width: float = 8,
+    max_width: float = 75
+) -> None:
+    """Set column widths from the longest content length of each column.
+    
+    Wider content gets more padding (2 characters below 20, otherwise 4) and the
+    result is clamped to [min_width, max_width]. The whole width vector is computed
+    in one numpy operation when numpy is available.
+    """
+    if not col_letters:
+        return
+    if _np is not None:
+        lengths = _np.asarray(max_lengths, dtype=float)
+        widths = _np.clip(lengths + _np.where(lengths < 20, 2, 4), min_width, max_width).tolist()
+    else:
+        widths = [min(max(length + (2 if length < 20 else 4), min_width), max_width) for length in max_lengths]
+    for col_letter, width in zip(col_letters, widths):
+        worksheet.column_dimensions[col_letter].width = width
+
 def find_file_in_allowed_dirs(filename: str, allowed_dirs: List[str]) -> Optional[str]:
     """Find a file in the allowed directories"""
     for base_dir in allowed_dirs:
@@ -104,6 +165,51 @@ def find_file_in_allowed_dirs(filename: str, allowed_dirs: List[str]) -> Optiona
     return None
 
 # Workbook Operations
+class ExcelSession:
+    """Keep a workbook open across several edits and save it once on exit.
+    
+    Each public tool function loads and saves the whole file. To chain several
+    edits on the same workbook, pass the session's workbook to the functions
+    that accept a wb argument:
+    
+        with ExcelSession(filepath) as session:
+            add_excel_column(filepath, "Sheet1", "Total", wb=session.wb)
+            apply_conditional_formatting(filepath, "Sheet1", "A1:D10", ">90", bold=True,
+                                         wb=session.wb, values_wb=session.values_wb)
+    
+    The workbook is saved when the block exits normally, unless discard() was
+    called. It is not saved if the block raises.
+    """
+    
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.wb = load_workbook(filepath)
+        self._values_wb = None
+        self._save = True
+    
+    @property
+    def values_wb(self) -> Workbook:
+        """The file loaded with data_only=True, for the calculated values of formula cells"""
+        if self._values_wb is None:
+            self._values_wb = load_workbook(self.filepath, data_only=True)
+        return self._values_wb
+    
+    def discard(self) -> None:
+        """Close the session without saving the workbook"""
+        self._save = False
+    
+    def __enter__(self) -> "ExcelSession":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            if exc_type is None and self._save:
+                self.wb.save(self.filepath)
+        finally:
+            self.wb.close()
+            if self._values_wb is not None:
+                self._values_wb.close()
+
 def create_excel_workbook(filepath: str, sheet_name: str = "Sheet1") -> Dict[str, Any]:
     """Create a new Excel workbook with optional custom sheet name"""
     try:
@@ -778,6 +884,43 @@ def write_excel_data(
             "error": f"Failed to write data: {str(e)}"
         }
 
+# Shared style objects. Equal styles are returned as the same instance across calls,
+# so building them is skipped and the workbook's style tables stay small
+_BORDER_STYLES = ("thin", "medium", "thick", "dashed", "dotted", "double")
+
+@lru_cache(maxsize=512)
+def _get_pattern_fill(color_hex: str) -> PatternFill:
+    return PatternFill(start_color=color_hex, end_color=color_hex, fill_type="solid")
+
+@lru_cache(maxsize=512)
+def _get_border(style_name: str) -> Optional[Border]:
+    """Border with the same side style on all four sides, or None for an unknown style"""
+    style_name = style_name.lower()
+    if style_name not in _BORDER_STYLES:
+        return None
+    side = Side(style=style_name)
+    return Border(left=side, right=side, top=side, bottom=side)
+
+@lru_cache(maxsize=512)
+def _get_alignment(horizontal: Optional[str], wrap_text: bool) -> Alignment:
+    return Alignment(horizontal=horizontal, wrap_text=wrap_text)
+
+@lru_cache(maxsize=512)
+def _get_font(font_items: frozenset) -> Font:
+    return Font(**dict(font_items))
+
+def _merge_font(font: Font, font_args: Dict[str, Any]) -> Font:
+    """Return the shared Font for an existing font updated with font_args"""
+    merged = {
+        "name": font.name,
+        "bold": font.bold,
+        "italic": font.italic,
+        "size": font.size,
+        "color": font.color
+    }
+    merged.update(font_args)
+    return _get_font(frozenset(merged.items()))
+
 def format_excel_range(
     filepath: str,
     sheet_name: str,
@@ -841,7 +984,7 @@ def format_excel_range(
             # Handle color format (with or without #)
             if bg_color.startswith("#"):
                 bg_color = bg_color[1:]
-            fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type="solid")
+            fill = _get_pattern_fill(bg_color)
             
         # Set up alignment
         align = None
@@ -854,22 +997,12 @@ def format_excel_range(
                     "right": "right"
                 }.get(alignment.lower())
                 
-            align = Alignment(horizontal=align_horz, wrap_text=wrap_text)
+            align = _get_alignment(align_horz, wrap_text)
             
         # Set up border
         border = None
         if border_style:
-            border_styles = {
-                "thin": Side(style="thin"),
-                "medium": Side(style="medium"),
-                "thick": Side(style="thick"),
-                "dashed": Side(style="dashed"),
-                "dotted": Side(style="dotted"),
-                "double": Side(style="double")
-            }
-            if border_style.lower() in border_styles:
-                side = border_styles[border_style.lower()]
-                border = Border(left=side, right=side, top=side, bottom=side)
+            border = _get_border(border_style)
         
         # Track max column widths if auto-adjusting
         max_col_width = {} if auto_adjust_width else None
@@ -882,17 +1015,7 @@ def format_excel_range(
                 # Apply font if any font properties set
                 if font_args:
                     # Start with existing font and update properties
-                    new_font = Font(
-                        name=cell.font.name,
-                        bold=cell.font.bold,
-                        italic=cell.font.italic,
-                        size=cell.font.size,
-                        color=cell.font.color
-                    )
-                    # Update with specified properties
-                    for key, value in font_args.items():
-                        setattr(new_font, key, value)
-                    cell.font = new_font
+                    cell.font = _merge_font(cell.font, font_args)
                 
                 # Apply fill if specified
                 if fill:
@@ -921,11 +1044,8 @@ def format_excel_range(
         
         # Adjust column widths if requested
         if auto_adjust_width and max_col_width:
-            for col_letter, width in max_col_width.items():
-                # Add padding based on content (more padding for wider content)
-                padding = 2 if width < 20 else 4
-                adjusted_width = min(width + padding, 75)  # Max 75 characters
-                worksheet.column_dimensions[col_letter].width = adjusted_width
+            # Add padding based on content (more padding for wider content), max 75 characters
+            fit_column_widths(worksheet, list(max_col_width), list(max_col_width.values()), min_width=0)
         
         # Save workbook
         wb.save(filepath)
@@ -1007,6 +1127,9 @@ def adjust_column_widths(
         
         # Auto-fit columns based on content
         if auto_fit:
+            fit_letters = []
+            fit_lengths = []
+            
             # For each column in range, find max content width
             for col_idx in range(start_col, end_col + 1):
                 col_letter = get_column_letter(col_idx)
@@ -1027,15 +1150,14 @@ def adjust_column_widths(
                             
                         max_length = max(max_length, length)
                 
-                # Set column width (with some padding) if content exists
+                # Only resize columns that have content
                 if max_length > 0:
-                    # Add padding based on content length
-                    padding = 2 if max_length < 20 else 4
-                    
-                    # Set width (with minimum and maximum limits)
-                    width = min(max(max_length + padding, 8), 75)  # Min 8, max 75 characters
-                    worksheet.column_dimensions[col_letter].width = width
-                    adjusted_columns.append(col_letter)
+                    fit_letters.append(col_letter)
+                    fit_lengths.append(max_length)
+            
+            # Set widths with padding, min 8 and max 75 characters
+            fit_column_widths(worksheet, fit_letters, fit_lengths)
+            adjusted_columns.extend(fit_letters)
         
         # Save workbook
         wb.save(filepath)
@@ -1053,6 +1175,18 @@ def adjust_column_widths(
             "error": f"Failed to adjust column widths: {str(e)}"
         }
 
+def _detect_array_formula_type(formula: str) -> Optional[str]:
+    """Return the first modern array function used in a formula, if any.
+    
+    This only runs the array formula scan, so it is much cheaper than
+    validate_excel_formula when the caller just needs to know whether a
+    formula (or formula template) will spill.
+    """
+    for array_type, pattern in _ARRAY_FORMULA_RES:
+        if pattern.search(formula):
+            return array_type
+    return None
+
 def validate_excel_formula(formula: str) -> Dict[str, Any]:
     """Validate Excel formula syntax and check for common errors.
     
@@ -1083,8 +1217,9 @@ def validate_excel_formula(formula: str) -> Dict[str, Any]:
         # Check for common syntax errors
         syntax_issues = []
         
-        # Check for unbalanced parentheses
-        open_count = formula_str.count("(") 
+        # Check for unbalanced parentheses. str.count is a C-level single-character
+        # scan; encoding to bytes or numpy first costs more than it saves
+        open_count = formula_str.count("(")
         close_count = formula_str.count(")")
         if open_count != close_count:
             syntax_issues.append(f"Unbalanced parentheses: {open_count} opening vs {close_count} closing")
@@ -1100,24 +1235,18 @@ def validate_excel_formula(formula: str) -> Dict[str, Any]:
         spill_direction = None
         
         # Enhanced detection of array formulas
-        for array_type in ARRAY_FORMULA_TYPES:
-            # Improved regex to better detect the actual function usage
-            # This pattern matches function name followed by opening parenthesis,
-            # ensuring we're matching actual function calls, not just occurrences of the name
-            pattern = rf'\b{array_type}\s*\('
-            if re.search(pattern, formula_str.upper()):
-                is_array_formula = True
-                array_formula_type = array_type
-                
-                # Determine likely spill direction
-                if array_type in ["UNIQUE", "FILTER", "SORT", "SORTBY"]:
-                    spill_direction = "vertical"  # These typically spill downward
-                elif array_type == "TRANSPOSE":
-                    spill_direction = "horizontal"  # TRANSPOSE spills horizontally
-                else:
-                    spill_direction = "undetermined"  # Default
-                    
-                break
+        array_type = _detect_array_formula_type(formula_str)
+        if array_type:
+            is_array_formula = True
+            array_formula_type = array_type
+            
+            # Determine likely spill direction
+            if array_type in ["UNIQUE", "FILTER", "SORT", "SORTBY"]:
+                spill_direction = "vertical"  # These typically spill downward
+            elif array_type == "TRANSPOSE":
+                spill_direction = "horizontal"  # TRANSPOSE spills horizontally
+            else:
+                spill_direction = "undetermined"  # Default
                 
         # Enhanced detection of array references (like A2#)
         array_references = []
@@ -1393,9 +1522,10 @@ def apply_excel_formula_range(
         if not (has_row_placeholder or has_col_placeholder):
             warnings.append("No {row} or {col} placeholder found in formula template. Using static formula.")
         
-        # Check if this is a modern array formula
-        validation = validate_excel_formula(formula_template.replace("{row}", str(min_row)).replace("{col}", get_column_letter(min_col)))
-        is_array_formula = validation["is_array_formula"]
+        # Check if this is a modern array formula. This only depends on the template,
+        # so skip the full validation here; each written formula is validated below
+        array_formula_type = _detect_array_formula_type(formula_template)
+        is_array_formula = array_formula_type is not None
         
         # For array formulas with dynamic calculation, we can optimize by applying once
         if is_array_formula and dynamic_calculation:
@@ -1419,14 +1549,14 @@ def apply_excel_formula_range(
             result["applied_as"] = "single_array_formula"
             
             # Add specific note about array formula behavior based on the formula type
-            if validation["array_formula_type"] == "UNIQUE":
+            if array_formula_type == "UNIQUE":
                 warnings.append(
                     "UNIQUE formula is designed to spill results automatically. "
                     "The formula has been applied to the top cell only, and will display all unique values below."
                 )
-            elif validation["array_formula_type"] in ["FILTER", "SORT", "SORTBY"]:
+            elif array_formula_type in ["FILTER", "SORT", "SORTBY"]:
                 warnings.append(
-                    f"{validation['array_formula_type']} formula is designed to spill results automatically. "
+                    f"{array_formula_type} formula is designed to spill results automatically. "
                     "The formula has been applied to the top cell only."
                 )
                 
@@ -1470,9 +1600,6 @@ def apply_excel_formula_range(
                             formulas_applied += 1
                         except Exception as cell_error:
                             errors.append(f"Error at {get_column_letter(col)}{row}: {str(cell_error)}")
-                
-                # Save after each chunk to minimize memory usage
-                wb.save(filepath)
         else:
             # Apply formulas to all cells in the range
             for row in range(min_row, max_row + 1):
@@ -1492,10 +1619,10 @@ def apply_excel_formula_range(
                     cell = ws.cell(row=row, column=col)
                     cell.value = final_formula
                     formulas_applied += 1
-            
-            # Save workbook once for small ranges
-            wb.save(filepath)
         
+        # Save once after all chunks: the workbook is fully in memory either way,
+        # so saving per chunk only re-serialized the whole file repeatedly
+        wb.save(filepath)
         wb.close()
         
         # Return success message
@@ -1527,13 +1654,217 @@ def apply_excel_formula_range(
             "error": f"Failed to apply formula range: {str(e)}"
         }
 
-def add_excel_column(
+def _shift_columns_right(ws: Worksheet, from_col: int) -> None:
+    """Shift all cells and column dimensions at or right of from_col one column right.
+    
+    This remaps the worksheet's cell dictionary in a single pass. openpyxl's
+    insert_cols first materializes every cell in the affected block, including
+    empty ones, and then moves the cells one by one in sorted order.
+    """
+    new_cells = {}
+    for (row, col), cell in ws._cells.items():
+        if col >= from_col:
+            col += 1
+            cell.column = col
+        new_cells[(row, col)] = cell
+    ws._cells = new_cells
+    
+    # Keep column widths and other column settings with their data
+    dims = ws.column_dimensions
+    shifted = []
+    for key in list(dims):
+        dim = dims[key]
+        start = dim.min or column_index_from_string(dim.index)
+        if start >= from_col:
+            shifted.append(dims.pop(key))
+        elif dim.max and dim.max >= from_col:
+            # Column group spanning the insertion point grows by one
+            dim.max += 1
+    for dim in shifted:
+        dim.index = get_column_letter(column_index_from_string(dim.index) + 1)
+        if dim.min:
+            dim.min += 1
+        if dim.max:
+            dim.max += 1
+        dims[dim.index] = dim
+
+def _streaming_header_cell(ws: Any, column_name: str, header_style: Optional[Dict[str, Any]]) -> WriteOnlyCell:
+    """Build the styled header cell for a column appended in write-only mode"""
+    style = {**_DEFAULT_HEADER_STYLE, **(header_style or {})}
+    cell = WriteOnlyCell(ws, value=column_name)
+    cell.font = Font(bold=style["bold"], size=style["font_size"] or None)
+    if style["bg_color"]:
+        cell.fill = _get_pattern_fill(style["bg_color"].lstrip("#"))
+    if style["alignment"]:
+        cell.alignment = Alignment(horizontal=style["alignment"])
+    return cell
+
+def _add_column_streaming(
     filepath: str,
     sheet_name: str,
     column_name: str,
     column_position: Optional[str] = None,
     data: Optional[List[Any]] = None,
     header_style: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """Append a column by streaming a read-only workbook into a write-only copy.
+    
+    Memory use stays flat regardless of the workbook size, but write-only
+    workbooks only carry values and formulas; see add_excel_column for what is
+    not copied.
+    
+    Returns:
+        The add_excel_column result, or None if the column has to be inserted
+        within existing data (which needs the full workbook)
+    """
+    wb_in = load_workbook(filepath, read_only=True)
+    try:
+        if sheet_name not in wb_in.sheetnames:
+            return None
+        ws_in = wb_in[sheet_name]
+        max_col = range_boundaries(sheet_dimension(ws_in))[2]
+        insert_col_idx = max_col + 1
+        if column_position:
+            try:
+                insert_col_idx = column_index_from_string(column_position)
+            except ValueError:
+                return {
+                    "success": False,
+                    "error": f"Invalid column position: {column_position}"
+                }
+            if insert_col_idx <= max_col:
+                return None
+        padding = [None] * (insert_col_idx - 1 - max_col)
+        
+        wb_out = Workbook(write_only=True)
+        for ws in wb_in.worksheets:
+            ws_out = wb_out.create_sheet(ws.title)
+            if ws.title != sheet_name:
+                for row in ws.iter_rows(values_only=True):
+                    ws_out.append(row)
+                continue
+            # The stored dimension can include leading empty rows, so the header goes
+            # on the first row that has a value
+            header_row = None
+            for row_idx, row in enumerate(ws.iter_rows(max_col=max_col, values_only=True), start=1):
+                if header_row is None:
+                    if any(value is not None for value in row):
+                        header_row = row_idx
+                        row = list(row) + padding + [_streaming_header_cell(ws_out, column_name, header_style)]
+                elif data and row_idx <= header_row + len(data):
+                    row = list(row) + padding + [data[row_idx - header_row - 1]]
+                ws_out.append(row)
+        
+        tmp_path = filepath + ".tmp"
+        try:
+            wb_out.save(tmp_path)
+            os.replace(tmp_path, filepath)
+        except Exception:
+            # Leave the original file as it was, without a partial copy next to it
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    finally:
+        wb_in.close()
+    
+    col_letter = get_column_letter(insert_col_idx)
+    return {
+        "success": True,
+        "message": f"Added column '{column_name}' at position {col_letter} in sheet '{sheet_name}'",
+        "column_position": col_letter,
+        "data_rows_affected": len(data) if data else 0
+    }
+
+def _add_excel_column_on_wb(
+    wb: Workbook,
+    sheet_name: str,
+    column_name: str,
+    column_position: Optional[str] = None,
+    data: Optional[List[Any]] = None,
+    header_style: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Add a column to a worksheet of an open workbook, see add_excel_column.
+    
+    The workbook is not saved.
+    """
+    # Validate sheet exists
+    if sheet_name not in wb.sheetnames:
+        return {
+            "success": False,
+            "error": f"Sheet '{sheet_name}' not found"
+        }
+    
+    ws = wb[sheet_name]
+    
+    # Find the current dimensions
+    min_col, min_row, max_col, max_row = range_boundaries(ws.calculate_dimension())
+    
+    # Merge provided header style with defaults
+    default_header_style = {**_DEFAULT_HEADER_STYLE, **(header_style or {})}
+    
+    # Determine insertion column index
+    insert_col_idx = max_col + 1  # Default to end of data
+    if column_position:
+        try:
+            insert_col_idx = column_index_from_string(column_position)
+            # If inserting within existing data, shift columns
+            if insert_col_idx <= max_col:
+                _shift_columns_right(ws, insert_col_idx)
+        except ValueError:
+            return {
+                "success": False,
+                "error": f"Invalid column position: {column_position}"
+            }
+    
+    # Add the header
+    header_cell = ws.cell(row=min_row, column=insert_col_idx)
+    header_cell.value = column_name
+    
+    # Apply header styling
+    header_cell.font = Font(bold=default_header_style["bold"])
+    if default_header_style["font_size"]:
+        header_cell.font = Font(bold=default_header_style["bold"], size=default_header_style["font_size"])
+    
+    if default_header_style["bg_color"]:
+        bg_color = default_header_style["bg_color"]
+        if bg_color.startswith("#"):
+            bg_color = bg_color[1:]  # Remove # if present
+        header_cell.fill = _get_pattern_fill(bg_color)
+    
+    if default_header_style["alignment"]:
+        header_cell.alignment = Alignment(horizontal=default_header_style["alignment"])
+    
+    # Add data if provided. The target column is empty at this point (past the data
+    # or just vacated by the shift), so cells are created directly rather than
+    # going through ws.cell()'s lookup-or-create path
+    if data:
+        ws_cells = ws._cells
+        for i, value in enumerate(data, start=1):
+            # Skip the header row (min_row), start from the next row
+            row_idx = min_row + i
+            # Don't exceed existing data rows
+            if row_idx > max_row:
+                break
+            ws_cells[(row_idx, insert_col_idx)] = Cell(ws, row=row_idx, column=insert_col_idx, value=value)
+    
+    # Prepare success message
+    col_letter = get_column_letter(insert_col_idx)
+    return {
+        "success": True,
+        "message": f"Added column '{column_name}' at position {col_letter} in sheet '{sheet_name}'",
+        "column_position": col_letter,
+        "data_rows_affected": len(data) if data else 0
+    }
+
+def add_excel_column(
+    filepath: Optional[str],
+    sheet_name: str,
+    column_name: str,
+    column_position: Optional[str] = None,
+    data: Optional[List[Any]] = None,
+    header_style: Optional[Dict[str, Any]] = None,
+    wb: Optional[Workbook] = None,
+    streaming: bool = False
 ) -> Dict[str, Any]:
     """Add a new column to an existing Excel worksheet without rewriting the entire sheet.
     
@@ -1549,110 +1880,227 @@ def add_excel_column(
         data: Optional list of values for the column. Length should match the data rows in the sheet.
         header_style: Optional dictionary of styling parameters for the header
                      (e.g., {'bold': True, 'bg_color': 'FFFF00'})
+        wb: Optional already open workbook to modify instead of loading filepath.
+            It is not saved, so several edits can share one load/save.
+        streaming: Whether to append the column by streaming the rows into a new file
+                   instead of loading the workbook (default False). It keeps memory use
+                   flat for very large workbooks, but only applies when appending after
+                   the existing data without wb, and the rewritten file keeps nothing
+                   but the sheets' cell values and formulas. It drops, on every sheet:
+                   - cell styles: fonts, fills, borders, alignment and number formats
+                   - column widths and row heights
+                   - merged cells
+                   - data validations and conditional formatting
+                   - comments and hyperlinks
+                   - charts and images
+                   and the workbook's defined names.
     
     Returns:
         Dictionary with success status and message
     """
     try:
-        # Load the workbook
-        wb = load_workbook(filepath)
-        
-        # Validate sheet exists
-        if sheet_name not in wb.sheetnames:
-            return {
-                "success": False,
-                "error": f"Sheet '{sheet_name}' not found"
-            }
+        if wb is not None:
+            return _add_excel_column_on_wb(wb, sheet_name, column_name, column_position, data, header_style)
         
-        ws = wb[sheet_name]
-        
-        # Find the current dimensions
-        min_col, min_row, max_col, max_row = range_boundaries(ws.calculate_dimension())
+        # Appending to a very large workbook can be done without materializing every cell
+        if streaming:
+            streamed = _add_column_streaming(
+                filepath, sheet_name, column_name, column_position, data, header_style
+            )
+            if streamed is not None:
+                return streamed
         
-        # Default header style
-        default_header_style = {
-            "bold": True,
-            "bg_color": None,  # No background color by default
-            "font_size": None,  # Keep default font size
-            "alignment": "center"
+        with ExcelSession(filepath) as session:
+            result = _add_excel_column_on_wb(
+                session.wb, sheet_name, column_name, column_position, data, header_style
+            )
+            if not result["success"]:
+                session.discard()
+            return result
+    
+    except Exception as e:
+        logger.error(f"Failed to add column: {e}")
+        return {
+            "success": False,
+            "error": f"Failed to add column: {str(e)}"
         }
+
+def _merge_data_validation(ws: Worksheet, dv: DataValidation, cell_range: str) -> bool:
+    """Extend an existing identical validation rule with cell_range instead of adding dv.
+    
+    Excel slows down badly on sheets with many sibling <dataValidation> nodes, so
+    repeated calls with the same rule on different ranges share a single node.
+    
+    Returns:
+        True if an existing rule was extended, False if dv still needs to be added
+    """
+    # Compare every rule attribute, only the covered ranges may differ
+    rule = tuple(getattr(dv, name) for name in _DATA_VALIDATION_DEFAULTS)
+    for existing in ws.data_validations.dataValidation:
+        if tuple(getattr(existing, name) for name in _DATA_VALIDATION_DEFAULTS) == rule:
+            existing.add(cell_range)
+            return True
+    return False
+
+# Default attribute values of a DataValidation, used when constructing one without
+# running openpyxl's descriptor checks
+_DATA_VALIDATION_DEFAULTS = {
+    "type": None,
+    "formula1": None,
+    "formula2": None,
+    "showErrorMessage": False,
+    "showInputMessage": False,
+    "showDropDown": False,
+    "allowBlank": False,
+    "promptTitle": None,
+    "errorStyle": None,
+    "error": None,
+    "prompt": None,
+    "errorTitle": None,
+    "imeMode": None,
+    "operator": None,
+}
+
+def _build_data_validation(
+    validation_type: str,
+    validation_criteria: Dict[str, Any],
+    error_message: Optional[str] = None,
+    skip_validation: bool = False
+) -> DataValidation:
+    """Create a DataValidation for a validation type and its criteria.
+    
+    With skip_validation the object is filled in directly instead of going through
+    openpyxl's per-attribute descriptor checks. Only use this for trusted input, as
+    invalid values will then only surface when Excel opens the file.
+    """
+    # Create appropriate validation rule based on type
+    if validation_type == "list":
+        source = validation_criteria.get("source")
+        if isinstance(source, list):
+            source_str = ",".join(f'"{item}"' for item in source)
+            rule = {"type": "list", "formula1": f"{source_str}"}
+        else:
+            rule = {"type": "list", "formula1": source}
+            
+    elif validation_type == "decimal":
+        operator = validation_criteria.get("operator", "between")
+        minimum = validation_criteria.get("minimum")
+        maximum = validation_criteria.get("maximum")
         
-        # Merge provided header style with defaults
-        if header_style:
-            for key, value in header_style.items():
-                default_header_style[key] = value
-        
-        # Determine insertion column index
-        insert_col_idx = max_col + 1  # Default to end of data
-        if column_position:
-            try:
-                insert_col_idx = column_index_from_string(column_position)
-                # If inserting within existing data, shift columns
-                if insert_col_idx <= max_col:
-                    ws.insert_cols(insert_col_idx)
-            except ValueError:
-                return {
-                    "success": False,
-                    "error": f"Invalid column position: {column_position}"
-                }
-        
-        # Add the header
-        header_cell = ws.cell(row=min_row, column=insert_col_idx)
-        header_cell.value = column_name
-        
-        # Apply header styling
-        header_cell.font = Font(bold=default_header_style["bold"])
-        if default_header_style["font_size"]:
-            header_cell.font = Font(bold=default_header_style["bold"], size=default_header_style["font_size"])
-        
-        if default_header_style["bg_color"]:
-            bg_color = default_header_style["bg_color"]
-            if bg_color.startswith("#"):
-                bg_color = bg_color[1:]  # Remove # if present
-            header_cell.fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type="solid")
-        
-        if default_header_style["alignment"]:
-            header_cell.alignment = Alignment(horizontal=default_header_style["alignment"])
-        
-        # Add data if provided
-        if data:
-            for i, value in enumerate(data, start=1):
-                # Skip the header row (min_row), start from the next row
-                row_idx = min_row + i
-                # Don't exceed existing data rows
-                if max_row >= row_idx:
-                    cell = ws.cell(row=row_idx, column=insert_col_idx)
-                    cell.value = value
-        
-        # Save the workbook
-        wb.save(filepath)
-        wb.close()
-        
-        # Prepare success message
-        col_letter = get_column_letter(insert_col_idx)
+        if operator == "between":
+            rule = {"type": "decimal", "operator": "between",
+                    "formula1": str(minimum), "formula2": str(maximum)}
+        else:
+            rule = {"type": "decimal", "operator": operator,
+                    "formula1": str(minimum)}
+                               
+    elif validation_type == "custom":
+        formula = validation_criteria.get("formula")
+        rule = {"type": "custom", "formula1": formula}
+    else:
+        raise ValidationError(f"Unsupported validation type: {validation_type}")
+    
+    # Set error message if provided
+    if error_message:
+        rule.update(errorTitle="Invalid Input", error=error_message, errorStyle="stop")
+    
+    if skip_validation:
+        dv = DataValidation.__new__(DataValidation)
+        dv.__dict__.update(_DATA_VALIDATION_DEFAULTS, sqref=MultiCellRange(), **rule)
+        return dv
+    return DataValidation(**rule)
+
+def _add_data_validations_on_wb(
+    wb: Workbook,
+    sheet_name: str,
+    rules: List[Dict[str, Any]],
+    skip_validation: bool = False
+) -> Dict[str, Any]:
+    """Add data validation rules to a worksheet of an open workbook, see add_data_validations.
+    
+    The workbook is not saved.
+    """
+    # Validate sheet
+    if sheet_name not in wb.sheetnames:
         return {
-            "success": True,
-            "message": f"Added column '{column_name}' at position {col_letter} in sheet '{sheet_name}'",
-            "column_position": col_letter,
-            "data_rows_affected": len(data) if data else 0
+            "success": False,
+            "error": f"Sheet '{sheet_name}' not found"
         }
+        
+    ws = wb[sheet_name]
+    
+    for rule in rules:
+        cell_range = rule["cell_range"]
+        dv = _build_data_validation(
+            rule["validation_type"],
+            rule.get("validation_criteria") or {},
+            rule.get("error_message"),
+            skip_validation
+        )
+        
+        # Add the validation to the worksheet, reusing an identical existing rule if any
+        if not _merge_data_validation(ws, dv, cell_range):
+            dv.add(cell_range)
+            ws.add_data_validation(dv)
+    
+    return {
+        "success": True,
+        "message": f"Added {len(rules)} data validation rules in sheet '{sheet_name}'",
+        "rules_added": len(rules)
+    }
+
+def add_data_validations(
+    filepath: Optional[str],
+    sheet_name: str,
+    rules: List[Dict[str, Any]],
+    skip_validation: bool = False,
+    wb: Optional[Workbook] = None
+) -> Dict[str, Any]:
+    """Add several data validation rules to a worksheet in one load/save cycle.
+    
+    Note that openpyxl's showDropDown flag is inverted relative to its name:
+    setting it to True hides the in-cell dropdown arrow in Excel. Rules built
+    here leave it False so list validations show their dropdown.
     
+    Args:
+        filepath: Path to Excel workbook
+        sheet_name: Target worksheet name
+        rules: List of rule dictionaries, each with "cell_range", "validation_type",
+               "validation_criteria" and optionally "error_message", as taken by
+               add_data_validation
+        skip_validation: Build the rules without openpyxl's attribute checks, for
+                         callers that have already validated their input
+        wb: Optional already open workbook to modify instead of loading filepath.
+            It is not saved, so several edits can share one load/save.
+        
+    Returns:
+        Result dictionary with success status and the number of rules added
+    """
+    try:
+        if wb is not None:
+            return _add_data_validations_on_wb(wb, sheet_name, rules, skip_validation)
+        
+        with ExcelSession(filepath) as session:
+            result = _add_data_validations_on_wb(session.wb, sheet_name, rules, skip_validation)
+            if not result["success"]:
+                session.discard()
+            return result
     except Exception as e:
-        logger.error(f"Failed to add column: {e}")
-        if 'wb' in locals():
-            wb.close()
+        logger.error(f"Failed to add data validation: {e}")
         return {
             "success": False,
-            "error": f"Failed to add column: {str(e)}"
+            "error": f"Failed to add data validation: {str(e)}"
         }
 
 def add_data_validation(
-    filepath: str,
+    filepath: Optional[str],
     sheet_name: str,
     cell_range: str,
     validation_type: str,
     validation_criteria: Dict[str, Any],
-    error_message: Optional[str] = None
+    error_message: Optional[str] = None,
+    skip_validation: bool = False,
+    wb: Optional[Workbook] = None
 ) -> Dict[str, Any]:
     """Add data validation rules to Excel cells.
     
@@ -1666,909 +2114,992 @@ def add_data_validation(
             For decimal: {"operator": "between", "minimum": 1, "maximum": 100}
             For custom: {"formula": "=AND(A1>0,A1<100)"}
         error_message: Optional custom error message
+        skip_validation: Build the rule without openpyxl's attribute checks
+        wb: Optional already open workbook to modify instead of loading filepath
         
     Returns:
         Result dictionary with success status
     """
-    try:
-        wb = load_workbook(filepath)
-        
-        # Validate sheet
-        if sheet_name not in wb.sheetnames:
-            return {
-                "success": False,
-                "error": f"Sheet '{sheet_name}' not found"
-            }
-            
-        ws = wb[sheet_name]
-        
-        # Create appropriate validation rule based on type
-        if validation_type == "list":
-            source = validation_criteria.get("source")
-            if isinstance(source, list):
-                source_str = ",".join(f'"{item}"' for item in source)
-                dv = DataValidation(type="list", formula1=f"{source_str}")
-            else:
-                dv = DataValidation(type="list", formula1=source)
-                
-        elif validation_type == "decimal":
-            operator = validation_criteria.get("operator", "between")
-            minimum = validation_criteria.get("minimum")
-            maximum = validation_criteria.get("maximum")
-            
-            if operator == "between":
-                dv = DataValidation(type="decimal", operator="between", 
-                                   formula1=str(minimum), formula2=str(maximum))
-            else:
-                dv = DataValidation(type="decimal", operator=operator, 
-                                   formula1=str(minimum))
-                                   
-        elif validation_type == "custom":
-            formula = validation_criteria.get("formula")
-            dv = DataValidation(type="custom", formula1=formula)
-        
-        # Set error message if provided
-        if error_message:
-            dv.errorTitle = "Invalid Input"
-            dv.error = error_message
-            dv.errorStyle = "stop"
-        
-        # Add the validation to the worksheet
-        dv.add(cell_range)
-        ws.add_data_validation(dv)
-        
-        wb.save(filepath)
+    result = add_data_validations(
+        filepath,
+        sheet_name,
+        [{
+            "cell_range": cell_range,
+            "validation_type": validation_type,
+            "validation_criteria": validation_criteria,
+            "error_message": error_message
+        }],
+        skip_validation,
+        wb
+    )
+    if result["success"]:
         return {
             "success": True,
             "message": f"Data validation added to {cell_range} in sheet '{sheet_name}'"
         }
-    except Exception as e:
-        logger.error(f"Failed to add data validation: {e}")
-        return {
-            "success": False,
-            "error": f"Failed to add data validation: {str(e)}"
-        }
+    return result
 
-def apply_conditional_formatting(
-    filepath: str,
-    sheet_name: str,
-    cell_range: str,
-    condition: str,
-    bold: bool = False,
-    italic: bool = False,
-    font_size: Optional[int] = None,
-    font_color: Optional[str] = None,
-    bg_color: Optional[str] = None,
-    alignment: Optional[str] = None,
-    wrap_text: bool = False,
-    border_style: Optional[str] = None,
-    condition_column: Optional[str] = None,
-    format_entire_row: bool = False,
-    columns_to_format: Optional[List[str]] = None,
-    handle_formulas: bool = True,
-    outside_range_columns: Optional[List[str]] = None,
-    compare_columns: Optional[Dict[str, str]] = None,
-    date_format: Optional[str] = None,
-    icon_set: Optional[str] = None
-) -> Dict[str, Any]:
-    """Apply conditional formatting to cells based on a specified condition.
-    
-    This function efficiently applies formatting to cells in a range that meet specified criteria,
-    eliminating the need to manually filter and format cells one by one.
+# Conditional formatting helpers
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+_COMMON_DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%Y/%m/%d", "%d-%m-%Y", "%m-%d-%Y"]
+_COLUMN_REF_RE = re.compile(r'\{([A-Z]+)\}')
+_DATE_FUNC_RE = re.compile(r'DATE\((\d+)\s*,\s*(\d+)\s*,\s*(\d+)\)', re.IGNORECASE)
+_TODAY_FUNC_RE = re.compile(r'TODAY\(\)', re.IGNORECASE)
+_AND_SPLIT_RE = re.compile(r'\s+AND\s+', re.IGNORECASE)
+_OR_SPLIT_RE = re.compile(r'\s+OR\s+', re.IGNORECASE)
+# Leading operator or function of a single condition, and the text after it
+_COND_RE = re.compile(
+    r"^(?P<op>>=|<=|<>|>|<|=|CONTAINS\(|STARTS_WITH\(|ENDS_WITH\(|REGEX\(|ISBLANK\(\)|NOTBLANK\(\))(?P<rest>.*)$",
+    re.DOTALL
+)
+
+_NUMERIC_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "<>": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    "=": operator.eq,
+}
+
+_TEXT_FUNCTIONS = {
+    "CONTAINS(": "contains",
+    "STARTS_WITH(": "starts_with",
+    "ENDS_WITH(": "ends_with",
+    "REGEX(": "regex",
+}
+
+_TEXT_OPERATORS = {
+    "eq": lambda value, text: value == text,
+    "ne": lambda value, text: value != text,
+    "contains": lambda value, text: text in value,
+    "starts_with": lambda value, text: value.startswith(text),
+    "ends_with": lambda value, text: value.endswith(text),
+}
+
+ConditionPredicate = Callable[[Any, Optional[int]], bool]
+
+def _match_condition(condition: str, upper: Optional[str] = None) -> Tuple[Optional[str], str]:
+    """Split a condition into its uppercased leading operator (or None) and the rest.
     
-    Args:
-        filepath: Path to the Excel workbook
-        sheet_name: Name of the worksheet
-        cell_range: Range of cells to check and potentially format (e.g., 'A1:D10')
-        condition: Condition for formatting, using syntax like ">90", "='Yes'", "CONTAINS('text')"
-                   Example formats:
-                   - Numeric: ">90", "<=50", "=100", "<>0" (not equal to zero)
-                   - Text: "='Yes'", "<>'No'", "CONTAINS('text')", "STARTS_WITH('A')"
-                   - Date: ">DATE(2023,1,1)", "<=TODAY()"
-                   - Blank: "=ISBLANK()", "<>ISBLANK()"
-                   - Compound conditions: ">50 AND <=70", "<20 OR >80", "CONTAINS('Pass') OR =ISBLANK()"
-                   - Column comparisons: ">{F}" (compare with column F), "<=2*{C}" (compare with twice value in column C)
-        bold: Whether to apply bold formatting to matching cells
-        italic: Whether to apply italic formatting to matching cells
-        font_size: Optional font size to apply to matching cells
-        font_color: Optional font color (hex code, with or without #) for matching cells
-        bg_color: Optional background color (hex code, with or without #) for matching cells 
-        alignment: Optional text alignment ('left', 'center', 'right') for matching cells
-        wrap_text: Whether to enable text wrapping for matching cells
-        border_style: Optional border style ('thin', 'medium', 'thick', 'dashed', 'dotted', 'double')
-        condition_column: Optional column letter to evaluate the condition on (e.g., 'D' for Units)
-        format_entire_row: Whether to format the entire row when condition is met (default False)
-        columns_to_format: Optional list of specific column letters to format when condition is met
-                           (e.g. ['A', 'C', 'D']). Only used when format_entire_row is False or
-                           when you want to format specific columns in the row
-        handle_formulas: Whether to evaluate formulas for condition checking (default True)
-        outside_range_columns: Optional list of columns outside the range to format when condition is met
-        compare_columns: Optional dictionary mapping column references in condition to actual column letters
-                         (e.g., {"profit": "F"} to refer to column F as "profit" in conditions)
-        date_format: Optional date format string for date comparisons (e.g., "%Y-%m-%d")
-        icon_set: Optional icon set to apply ('3arrows', '3trafficlights', '3symbols', '3stars', etc.)
-    
-    Returns:
-        Dictionary with success status, message, and count of formatted cells
+    The operator is matched on the uppercased condition, which callers that
+    already have it pass as upper; the rest keeps its original case.
     """
+    match = _COND_RE.match(condition.upper() if upper is None else upper)
+    if match is None:
+        return None, condition
+    return match.group("op"), condition[match.end("op"):]
+
+def _to_number(value: Any) -> Optional[float]:
+    """Convert a cell value for a numeric comparison; blank cells count as 0"""
+    if value is None:
+        return 0.0
     try:
-        # Load workbook with and without data_only option to access both formulas and calculated values
-        wb = load_workbook(filepath)
-        
-        if handle_formulas:
-            # Load workbook with data_only=True to get calculated values
-            wb_data_only = load_workbook(filepath, data_only=True)
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+def _to_excel_days(value: Any, date_format: Optional[str] = None) -> Optional[int]:
+    """Convert a cell value to an Excel serial day number, or None if it is not a date"""
+    if isinstance(value, datetime):
+        cell_date = value
+    elif isinstance(value, (int, float)):
+        # Excel stores dates as number of days since epoch
+        try:
+            cell_date = _EXCEL_EPOCH + timedelta(days=value)
+        except (OverflowError, ValueError):
+            return None
+    else:
+        # Try parsing the string with the provided format, or some common formats
+        for fmt in ([date_format] if date_format else _COMMON_DATE_FORMATS):
+            try:
+                cell_date = datetime.strptime(str(value), fmt)
+                break
+            except ValueError:
+                continue
         else:
-            wb_data_only = None
+            return None
+    return (cell_date.date() - _EXCEL_EPOCH.date()).days
+
+def _substitute_date_functions(condition: str) -> str:
+    """Replace TODAY() and DATE(y, m, d) in a condition with Excel serial day numbers"""
+    epoch = _EXCEL_EPOCH.date()
+    condition = _TODAY_FUNC_RE.sub(str((datetime.today().date() - epoch).days), condition)
+    
+    def to_serial(match):
+        try:
+            year, month, day = (int(part) for part in match.groups())
+            return str((datetime(year, month, day).date() - epoch).days)
+        except ValueError:
+            return match.group(0)
+    
+    return _DATE_FUNC_RE.sub(to_serial, condition)
+
+def _substitute_column_refs(
+    expr: str,
+    col_refs: List[str],
+    row: Optional[int],
+    resolve_column: Callable[[str, int], Any],
+    quote: bool
+) -> str:
+    """Replace {F} style column references in a condition with the values from a row.
+    
+    Numeric conditions get the value as a float (0 if it is not numeric), text
+    conditions get it as a quoted string. Empty referenced cells are left as is.
+    """
+    if not row:
+        return expr
+    for col_ref in col_refs:
+        placeholder = f"{{{col_ref}}}"
+        try:
+            ref_value = resolve_column(col_ref, row)
+        except ValueError:
+            # If column reference is invalid, replace with an empty value
+            expr = expr.replace(placeholder, "''" if quote else "0")
+            continue
+        if ref_value is None:
+            continue
+        if quote:
+            replacement = f"'{ref_value}'"
+        else:
+            try:
+                replacement = str(float(ref_value))
+            except (ValueError, TypeError):
+                replacement = "0"
+        expr = expr.replace(placeholder, replacement)
+    return expr
+
+def _parse_numeric_operand(operand: str) -> Optional[float]:
+    """Parse the right-hand side of a numeric condition, e.g. '90' or '2*45.5'"""
+    try:
+        return float(operand)
+    except ValueError:
+        pass
+    if any(op in operand for op in "*/+-"):
+        eval_result = evaluate_excel_formula(f"={operand}")
+        if eval_result.get("success", False):
+            try:
+                return float(eval_result["value"])
+            except (TypeError, ValueError):
+                return None
+    return None
+
+def _compile_numeric_condition(
+    condition: str,
+    resolve_column: Optional[Callable[[str, int], Any]] = None
+) -> ConditionPredicate:
+    """Compile a numeric comparison such as '>=90', '<>0' or '>{F}'"""
+    op, rest = _match_condition(condition)
+    if op in _NUMERIC_OPERATORS:
+        compare = _NUMERIC_OPERATORS[op]
+        operand = rest.strip()
+    else:
+        # A bare column reference like '{F}' compares for equality
+        compare = operator.eq
+        operand = condition.strip()
+    
+    col_refs = _COLUMN_REF_RE.findall(operand)
+    if col_refs and resolve_column:
+        # The threshold depends on the row, so resolve it per cell
+        def predicate(value, row=None):
+            number = _to_number(value)
+            if number is None:
+                return False
+            threshold = _parse_numeric_operand(
+                _substitute_column_refs(operand, col_refs, row, resolve_column, quote=False)
+            )
+            return threshold is not None and compare(number, threshold)
+        return predicate
+    
+    threshold = _parse_numeric_operand(operand)
+    if threshold is None:
+        return lambda value, row=None: False
+    
+    def predicate(value, row=None):
+        number = _to_number(value)
+        return number is not None and compare(number, threshold)
+    return predicate
+
+def _parse_text_condition(condition: str) -> Optional[Tuple[str, str]]:
+    """Split a text condition like "CONTAINS('abc')" into its operator and literal"""
+    op, rest = _match_condition(condition)
+    if not rest.startswith("'"):
+        return None
+    if op == "=":
+        # Exact match (case insensitive)
+        return "eq", rest[1:-1] if rest.endswith("'") else rest[1:]
+    if op == "<>":
+        # Not equal match (case insensitive)
+        return "ne", rest[1:-1] if rest.endswith("'") else rest[1:]
+    if op in _TEXT_FUNCTIONS:
+        return _TEXT_FUNCTIONS[op], rest[1:-2] if rest.endswith("')") else rest[1:-1]
+    return None
+
+def _build_text_matcher(parsed: Optional[Tuple[str, str]]) -> Callable[[str], bool]:
+    """Build a matcher for a parsed text condition, taking the cell text"""
+    if parsed is None:
+        return lambda text: False
+    kind, literal = parsed
+    if kind == "regex":
+        # Regular expressions keep their case, everything else is case insensitive
+        try:
+            pattern = re.compile(literal)
+        except re.error:
+            return lambda text: False
+        return lambda text: pattern.search(text) is not None
+    text_operator = _TEXT_OPERATORS[kind]
+    literal = literal.lower()
+    return lambda text: text_operator(text.lower(), literal)
+
+def _compile_text_condition(
+    condition: str,
+    resolve_column: Optional[Callable[[str, int], Any]] = None
+) -> ConditionPredicate:
+    """Compile a text condition such as "='Yes'" or "STARTS_WITH('A')" """
+    col_refs = _COLUMN_REF_RE.findall(condition)
+    if col_refs and resolve_column:
+        def predicate(value, row=None):
+            resolved = _substitute_column_refs(condition, col_refs, row, resolve_column, quote=True)
+            matcher = _build_text_matcher(_parse_text_condition(resolved))
+            return matcher("" if value is None else str(value))
+        return predicate
+    
+    matcher = _build_text_matcher(_parse_text_condition(condition))
+    return lambda value, row=None: matcher("" if value is None else str(value))
+
+def _is_blank(value: Any) -> bool:
+    return value is None or str(value).strip() == ""
+
+def _compile_condition(
+    condition: str,
+    resolve_column: Optional[Callable[[str, int], Any]] = None,
+    date_format: Optional[str] = None
+) -> ConditionPredicate:
+    """Compile a conditional formatting condition into a predicate.
+    
+    The condition string is parsed once, so checking a cell is a single call to
+    predicate(cell_value, row). Compound conditions are compiled recursively.
+    
+    Args:
+        condition: Condition string, e.g. ">90", "CONTAINS('text')" or ">50 AND <=70"
+        resolve_column: Optional callable (column_letter, row) -> value used to
+                        resolve column references like {F} in the condition
+        date_format: Optional date format string for parsing text dates
         
-        # Validate sheet
-        if sheet_name not in wb.sheetnames:
-            return {
-                "success": False,
-                "error": f"Sheet '{sheet_name}' not found"
-            }
-            
-        worksheet = wb[sheet_name]
-        worksheet_data_only = wb_data_only[sheet_name] if handle_formulas else None
+    Returns:
+        Callable taking (cell_value, row) and returning whether the condition is met
+    """
+    return _compile_condition_node(_parse_condition_tree(condition.strip()), resolve_column, date_format)
+
+def _parse_condition_tree(condition: str) -> Tuple[str, Any]:
+    """Split a condition into a tree of ("and" | "or", children) and ("leaf", text) nodes.
+    
+    AND is split first, matching the previous evaluator, and the keywords are
+    matched case-insensitively so the leaves keep their original case.
+    """
+    parts = _AND_SPLIT_RE.split(condition)
+    if len(parts) > 1:
+        return "and", [_parse_condition_tree(part.strip()) for part in parts]
+    parts = _OR_SPLIT_RE.split(condition)
+    if len(parts) > 1:
+        return "or", [_parse_condition_tree(part.strip()) for part in parts]
+    return "leaf", condition
+
+def _compile_condition_node(
+    node: Tuple[str, Any],
+    resolve_column: Optional[Callable[[str, int], Any]],
+    date_format: Optional[str]
+) -> ConditionPredicate:
+    kind, payload = node
+    if kind == "leaf":
+        return _compile_condition_leaf(payload, resolve_column, date_format)
+    parts = [_compile_condition_node(child, resolve_column, date_format) for child in payload]
+    if kind == "and":
+        return lambda value, row=None: all(part(value, row) for part in parts)
+    return lambda value, row=None: any(part(value, row) for part in parts)
+
+def _compile_condition_leaf(
+    condition: str,
+    resolve_column: Optional[Callable[[str, int], Any]],
+    date_format: Optional[str]
+) -> ConditionPredicate:
+    """Compile a single (non-compound) condition"""
+    # Keywords are matched on the uppercased form, literals are taken from the original
+    upper = condition.upper()
+    op, rest = _match_condition(condition, upper)
+    
+    # Date conditions compare Excel serial days
+    if ("DATE(" in upper or "TODAY(" in upper) and not (op == "=" and rest.startswith("'")):
+        days_predicate = _compile_numeric_condition(_substitute_date_functions(condition), resolve_column)
+        
+        def date_predicate(value, row=None):
+            days = _to_excel_days(value, date_format)
+            return days is not None and days_predicate(days, row)
+        return date_predicate
+    
+    # Blank/not blank conditions
+    if upper in ("=ISBLANK()", "ISBLANK()"):
+        return lambda value, row=None: _is_blank(value)
+    if upper in ("<>ISBLANK()", "NOTBLANK()"):
+        return lambda value, row=None: not _is_blank(value)
+    
+    # Text conditions
+    if (op in ("=", "<>") and rest.startswith("'")) or op in _TEXT_FUNCTIONS:
+        return _compile_text_condition(condition, resolve_column)
+    
+    # Numeric conditions, including column comparisons like {profit} or {C}
+    if op in _NUMERIC_OPERATORS or "{" in condition:
+        return _compile_numeric_condition(condition, resolve_column)
+    
+    # Fallback
+    return lambda value, row=None: False
+
+# Ranges with more cells than this evaluate purely numeric conditions as an array mask
+_VECTORIZE_MIN_CELLS = 10000
+
+def _numeric_mask(values: Any, symbol: str, threshold: float) -> Any:
+    """Evaluate one numeric comparison over an array of cell values, NaN never matches"""
+    return _NUMERIC_OPERATORS[symbol](values, threshold) & ~_np.isnan(values)
+
+def _compile_numeric_mask(condition: str) -> Optional[Callable[[Any], Any]]:
+    """Compile a condition made only of constant numeric comparisons into an array mask.
+    
+    Returns None if any part of the condition needs the per-cell predicate (text,
+    blank, date or column reference conditions, or formula operands).
+    """
+    if _np is None:
+        return None
+    return _compile_mask_node(_parse_condition_tree(condition.strip()))
+
+def _compile_mask_node(node: Tuple[str, Any]) -> Optional[Callable[[Any], Any]]:
+    kind, payload = node
+    if kind == "leaf":
+        return _compile_mask_leaf(payload)
+    parts = [_compile_mask_node(child) for child in payload]
+    if any(part is None for part in parts):
+        return None
+    combine = _np.logical_and if kind == "and" else _np.logical_or
+    
+    def mask(values):
+        result = parts[0](values)
+        for part in parts[1:]:
+            result = combine(result, part(values))
+        return result
+    return mask
+
+def _compile_mask_leaf(condition: str) -> Optional[Callable[[Any], Any]]:
+    upper = condition.upper()
+    if "DATE(" in upper or "TODAY(" in upper or "{" in condition:
+        return None
+    op, rest = _match_condition(condition, upper)
+    if op not in _NUMERIC_OPERATORS:
+        return None
+    try:
+        threshold = float(rest.strip())
+    except ValueError:
+        # Text, blank and formula operands need the per-cell predicate
+        return None
+    return lambda values: _numeric_mask(values, op, threshold)
+
+def _to_number_array(rows_values: List[Tuple[Any, ...]]) -> Optional[Any]:
+    """Convert rows of cell values to a float64 array, or None if any value is not numeric.
+    
+    Blank cells count as 0, matching _to_number.
+    """
+    cells = _np.array(rows_values, dtype=object)
+    try:
+        values = cells.astype(_np.float64)
+    except (TypeError, ValueError):
+        return None
+    values[_np.equal(cells, None)] = 0.0
+    return values
+
+def _apply_style(
+    cell: Cell,
+    font: Optional[Font],
+    fill: Optional[PatternFill],
+    align: Optional[Alignment],
+    border: Optional[Border]
+) -> None:
+    """Set the given style objects on a cell, leaving the others unchanged"""
+    if font:
+        cell.font = font
+    if fill:
+        cell.fill = fill
+    if align:
+        cell.alignment = align
+    if border:
+        cell.border = border
+
+def _apply_conditional_formatting_on_wb(
+    wb: Workbook,
+    wb_data_only: Optional[Workbook],
+    sheet_name: str,
+    cell_range: str,
+    condition: str,
+    bold: bool = False,
+    italic: bool = False,
+    font_size: Optional[int] = None,
+    font_color: Optional[str] = None,
+    bg_color: Optional[str] = None,
+    alignment: Optional[str] = None,
+    wrap_text: bool = False,
+    border_style: Optional[str] = None,
+    condition_column: Optional[str] = None,
+    format_entire_row: bool = False,
+    columns_to_format: Optional[List[str]] = None,
+    outside_range_columns: Optional[List[str]] = None,
+    compare_columns: Optional[Dict[str, str]] = None,
+    date_format: Optional[str] = None,
+    icon_set: Optional[str] = None
+) -> Dict[str, Any]:
+    """Apply conditional formatting to an open workbook, see apply_conditional_formatting.
+    
+    Calculated values of formula cells are read from wb_data_only, the same
+    workbook loaded with data_only=True, or from wb itself when it is None.
+    The workbook is not saved.
+    """
+    handle_formulas = wb_data_only is not None
+    
+    # Validate sheet
+    if sheet_name not in wb.sheetnames:
+        return {
+            "success": False,
+            "error": f"Sheet '{sheet_name}' not found"
+        }
         
-        # Parse cell range
+    worksheet = wb[sheet_name]
+    worksheet_data_only = wb_data_only[sheet_name] if handle_formulas else None
+    
+    # Parse cell range
+    try:
+        min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Invalid cell range: {cell_range} - {str(e)}"
+        }
+    
+    # If condition_column is specified, convert to column index
+    condition_col_idx = None
+    if condition_column:
         try:
-            min_col, min_row, max_col, max_row = range_boundaries(cell_range)
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Invalid cell range: {cell_range} - {str(e)}"
-            }
-        
-        # If condition_column is specified, convert to column index
-        condition_col_idx = None
-        if condition_column:
-            try:
-                condition_col_idx = column_index_from_string(condition_column.upper().strip())
-                # Verify the condition column is within the range or at least a valid column
-                if condition_col_idx < 1:
-                    return {
-                        "success": False,
-                        "error": f"Invalid condition column: {condition_column}"
-                    }
-            except Exception as e:
+            condition_col_idx = column_index_from_string(condition_column.upper().strip())
+            # Verify the condition column is within the range or at least a valid column
+            if condition_col_idx < 1:
                 return {
                     "success": False,
-                    "error": f"Invalid condition column: {condition_column} - {str(e)}"
+                    "error": f"Invalid condition column: {condition_column}"
                 }
-        
-        # If columns_to_format is specified, convert to column indices
-        format_col_indices = []
-        if columns_to_format:
-            for col_letter in columns_to_format:
-                try:
-                    col_idx = column_index_from_string(col_letter.upper().strip())
-                    format_col_indices.append(col_idx)
-                except Exception as e:
-                    return {
-                        "success": False,
-                        "error": f"Invalid format column: {col_letter} - {str(e)}"
-                    }
-            
-            # If columns_to_format is specified, we'll format only those specific columns
-            # regardless of what format_entire_row is set to
-            should_format_specific_columns = columns_to_format is not None and len(columns_to_format) > 0
-            
-            # If we're formatting specific columns, ensure format_entire_row is False
-            if should_format_specific_columns:
-                format_entire_row = False
-        else:
-            should_format_specific_columns = False
-        
-        # If outside_range_columns is specified, convert to column indices
-        outside_range_indices = []
-        if outside_range_columns:
-            for col_letter in outside_range_columns:
-                try:
-                    col_idx = column_index_from_string(col_letter.upper().strip())
-                    outside_range_indices.append(col_idx)
-                except Exception as e:
-                    return {
-                        "success": False,
-                        "error": f"Invalid outside range column: {col_letter} - {str(e)}"
-                    }
-        
-        # Build mapping for column comparisons if provided
-        column_name_to_letter = {}
-        column_name_to_index = {}
-        if compare_columns:
-            for name, col_letter in compare_columns.items():
-                try:
-                    column_name_to_letter[name] = col_letter.upper().strip()
-                    column_name_to_index[name] = column_index_from_string(col_letter.upper().strip())
-                except Exception as e:
-                    return {
-                        "success": False,
-                        "error": f"Invalid column mapping: {name} -> {col_letter} - {str(e)}"
-                    }
-        
-        # Set up font formatting options
-        font_args = {}
-        if bold:
-            font_args["bold"] = True
-        if italic:
-            font_args["italic"] = True
-        if font_size:
-            font_args["size"] = font_size
-        if font_color:
-            # Handle color format (with or without #)
-            if font_color.startswith("#"):
-                font_color = font_color[1:]
-            font_args["color"] = font_color
-        
-        # Set up fill
-        fill = None
-        if bg_color:
-            # Handle color format (with or without #)
-            if bg_color.startswith("#"):
-                bg_color = bg_color[1:]
-            fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type="solid")
-        
-        # Set up alignment
-        align = None
-        if alignment or wrap_text:
-            align_horz = None
-            if alignment:
-                align_horz = {
-                    "left": "left",
-                    "center": "center",
-                    "right": "right"
-                }.get(alignment.lower())
-            align = Alignment(horizontal=align_horz, wrap_text=wrap_text)
-        
-        # Set up border
-        border = None
-        if border_style:
-            border_styles = {
-                "thin": Side(style="thin"),
-                "medium": Side(style="medium"),
-                "thick": Side(style="thick"),
-                "dashed": Side(style="dashed"),
-                "dotted": Side(style="dotted"),
-                "double": Side(style="double")
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Invalid condition column: {condition_column} - {str(e)}"
             }
-            if border_style.lower() in border_styles:
-                side = border_styles[border_style.lower()]
-                border = Border(left=side, right=side, top=side, bottom=side)
-        
-        # Parse the condition
-        formatted_cells_count = 0
-        condition = condition.strip()
-        
-        # Pre-process condition to handle column name references like {profit} or {sales}
-        if compare_columns:
-            for col_name, col_letter in column_name_to_letter.items():
-                pattern = r'\{' + col_name + r'\}'
-                condition = re.sub(pattern, f"{{{col_letter}}}", condition, flags=re.IGNORECASE)
-        
-        # Create a dictionary to store formula calculated values
-        calculated_values = {}
-        if handle_formulas:
-            # First pass - collect all calculated formula values from the data_only workbook
-            for row in range(min_row, max_row + 1):
-                for col in range(1, worksheet.max_column + 1):
-                    regular_cell = worksheet.cell(row=row, column=col)
-                    cell_value = worksheet_data_only.cell(row=row, column=col).value
-                    
-                    # Check if this is a formula cell
-                    has_formula = regular_cell.data_type == 'f' if hasattr(regular_cell, 'data_type') else False
-                    if has_formula:
-                        cell_ref = f"{get_column_letter(col)}{row}"
-                        calculated_values[cell_ref] = cell_value
-
-        # Enhanced helper functions to evaluate conditions with support for complex logic
-        def evaluate_numeric_condition(cell_value, condition, row=None):
-            # Support for formula cells
-            if not isinstance(cell_value, (int, float)) and not (isinstance(cell_value, str) and cell_value.replace('.', '', 1).isdigit()):
-                try:
-                    cell_value = float(cell_value) if cell_value is not None else 0
-                except (ValueError, TypeError):
-                    return False
-            else:
-                cell_value = float(cell_value) if cell_value is not None else 0
-                
-            try:
-                # Check for column references like {F} in condition
-                col_refs = re.findall(r'\{([A-Z]+)\}', condition)
-                if col_refs and row:
-                    for col_ref in col_refs:
-                        if col_ref in column_name_to_letter:
-                            actual_col = column_name_to_letter[col_ref]
-                        else:
-                            actual_col = col_ref
-                            
-                        # Get the column index
-                        try:
-                            col_idx = column_index_from_string(actual_col)
-                            
-                            # Get the cell value from the data_only worksheet if available
-                            if worksheet_data_only:
-                                ref_cell_value = worksheet_data_only.cell(row=row, column=col_idx).value
-                            else:
-                                ref_cell_value = worksheet.cell(row=row, column=col_idx).value
-                                
-                            if ref_cell_value is not None:
-                                try:
-                                    ref_cell_value = float(ref_cell_value)
-                                    condition = condition.replace(f"{{{col_ref}}}", str(ref_cell_value))
-                                except (ValueError, TypeError):
-                                    # If we can't convert to float, treat it as 0
-                                    condition = condition.replace(f"{{{col_ref}}}", "0")
-                        except Exception:
-                            # If column reference is invalid, replace with 0
-                            condition = condition.replace(f"{{{col_ref}}}", "0")
-
-                # Handle date comparisons
-                if "DATE(" in condition.upper() or "TODAY(" in condition.upper():
-                    import datetime as dt
-                    
-                    # Convert cell value to date if it's a float (Excel dates are floats)
-                    if isinstance(cell_value, (int, float)):
-                        excel_epoch = dt.datetime(1899, 12, 30)
-                        try:
-                            cell_date = excel_epoch + dt.timedelta(days=cell_value)
-                        except Exception:
-                            return False
-                    elif isinstance(cell_value, dt.datetime):
-                        cell_date = cell_value
-                    else:
-                        # Try to parse string date
-                        if date_format:
-                            try:
-                                cell_date = dt.datetime.strptime(str(cell_value), date_format)
-                            except Exception:
-                                return False
-                        else:
-                            return False
-                    
-                    # Replace TODAY() with current date
-                    if "TODAY(" in condition.upper():
-                        today = dt.datetime.today().date()
-                        excel_days = (today - excel_epoch.date()).days
-                        condition = re.sub(r'TODAY\(\)', str(excel_days), condition, flags=re.IGNORECASE)
-                    
-                    # Replace DATE(year, month, day) with Excel date value
-                    date_patterns = re.findall(r'DATE\((\d+)\s*,\s*(\d+)\s*,\s*(\d+)\)', condition, re.IGNORECASE)
-                    for year, month, day in date_patterns:
-                        try:
-                            date_obj = dt.datetime(int(year), int(month), int(day))
-                            excel_days = (date_obj.date() - excel_epoch.date()).days
-                            condition = re.sub(r'DATE\(' + year + r'\s*,\s*' + month + r'\s*,\s*' + day + r'\)', 
-                                              str(excel_days), condition)
-                        except Exception:
-                            pass
-                    
-                    # Convert cell_date to Excel days for comparison
-                    cell_value = (cell_date.date() - excel_epoch.date()).days
-                
-                # Check for compound conditions (AND, OR)
-                if " AND " in condition.upper():
-                    parts = condition.upper().split(" AND ")
-                    return all(evaluate_numeric_condition(cell_value, part.strip(), row) for part in parts)
-                    
-                if " OR " in condition.upper():
-                    parts = condition.upper().split(" OR ")
-                    return any(evaluate_numeric_condition(cell_value, part.strip(), row) for part in parts)
-                
-                # Handle parenthesized groups
-                if "(" in condition and ")" in condition and not any(f in condition.upper() for f in ["DATE(", "TODAY("]):
-                    # Simple formula evaluation for basic expressions like (A>5 AND B<10)
-                    try:
-                        # Replace condition operators with Python operators
-                        py_condition = condition.replace("=", "==").replace("<>", "!=")
-                        py_condition = py_condition.replace("AND", "and").replace("OR", "or")
-                        
-                        # Replace cell_value placeholder
-                        py_condition = py_condition.replace("cell_value", str(cell_value))
-                        
-                        # Evaluate using safer eval
-                        return eval(py_condition, {"__builtins__": {}}, {"cell_value": cell_value})
-                    except Exception:
-                        # Fall back to standard comparison if eval fails
-                        pass
-                
-                # Single conditions
-                if condition.startswith(">="):
-                    threshold = float(condition[2:].strip())
-                    return cell_value >= threshold
-                elif condition.startswith("<="):
-                    threshold = float(condition[2:].strip())
-                    return cell_value <= threshold
-                elif condition.startswith("<>"):
-                    threshold = float(condition[2:].strip())
-                    return cell_value != threshold
-                elif condition.startswith(">"):
-                    threshold = float(condition[1:].strip())
-                    return cell_value > threshold
-                elif condition.startswith("<"):
-                    threshold = float(condition[1:].strip())
-                    return cell_value < threshold
-                elif condition.startswith("="):
-                    threshold = float(condition[1:].strip())
-                    return cell_value == threshold
-                    
-                # If we get here, try to evaluate the condition as a formula comparing to cell_value
-                try:
-                    # Build a formula like "=cell_value > 100" or "=cell_value <= 2*B5"
-                    formula = condition.replace("cell_value", str(cell_value))
-                    
-                    # Use evaluate_excel_formula if it's a complex formula
-                    if "*" in formula or "/" in formula or "+" in formula or "-" in formula:
-                        eval_result = evaluate_excel_formula(f"={formula}", {"cell_value": cell_value})
-                        if eval_result.get("success", False):
-                            return bool(eval_result["value"])
-                    
-                    # If not a complex formula, direct comparison
-                    comp_value = float(formula)
-                    return cell_value == comp_value
-                except Exception:
-                    return False
-                    
-                return False
-            except (ValueError, TypeError) as e:
-                # Log the error but continue processing
-                logger.warning(f"Error evaluating numeric condition: {e}")
-                return False
-        
-        def evaluate_text_condition(cell_value, condition, row=None):
-            if cell_value is None:
-                cell_value = ""
-            cell_value = str(cell_value).lower()
-            
-            # Check for column references like {F} in condition
-            col_refs = re.findall(r'\{([A-Z]+)\}', condition)
-            if col_refs and row:
-                for col_ref in col_refs:
-                    if col_ref in column_name_to_letter:
-                        actual_col = column_name_to_letter[col_ref]
-                    else:
-                        actual_col = col_ref
-                        
-                    # Get the column index
-                    try:
-                        col_idx = column_index_from_string(actual_col)
-                        
-                        # Get the cell value from the data_only worksheet if available
-                        if worksheet_data_only:
-                            ref_cell_value = worksheet_data_only.cell(row=row, column=col_idx).value
-                        else:
-                            ref_cell_value = worksheet.cell(row=row, column=col_idx).value
-                            
-                        if ref_cell_value is not None:
-                            ref_cell_value = str(ref_cell_value)
-                            # For text conditions, keep the quotes
-                            condition = condition.replace(f"{{{col_ref}}}", f"'{ref_cell_value}'")
-                    except Exception:
-                        # If column reference is invalid, replace with empty string
-                        condition = condition.replace(f"{{{col_ref}}}", "''")
-            
-            # Check for compound conditions (AND, OR)
-            if " AND " in condition.upper():
-                parts = condition.upper().split(" AND ")
-                return all(evaluate_text_condition(cell_value, part.strip(), row) for part in parts)
-                
-            if " OR " in condition.upper():
-                parts = condition.upper().split(" OR ")
-                return any(evaluate_text_condition(cell_value, part.strip(), row) for part in parts)
-            
-            if condition.startswith("='"):
-                # Exact match (case insensitive)
-                text = condition[2:-1].lower() if condition.endswith("'") else condition[2:].lower()
-                return cell_value == text
-            elif condition.startswith("<>'"):
-                # Not equal match (case insensitive)
-                text = condition[3:-1].lower() if condition.endswith("'") else condition[3:].lower()
-                return cell_value != text
-            elif condition.upper().startswith("CONTAINS('"):
-                # Contains text (case insensitive)
-                text = condition[10:-2].lower() if condition.endswith("')") else condition[10:-1].lower()
-                return text in cell_value
-            elif condition.upper().startswith("STARTS_WITH('"):
-                # Starts with text (case insensitive)
-                text = condition[13:-2].lower() if condition.endswith("')") else condition[13:-1].lower()
-                return cell_value.startswith(text)
-            elif condition.upper().startswith("ENDS_WITH('"):
-                # Ends with text (case insensitive)
-                text = condition[11:-2].lower() if condition.endswith("')") else condition[11:-1].lower()
-                return cell_value.endswith(text)
-            elif condition.upper().startswith("REGEX('"):
-                # Regular expression match
-                pattern = condition[7:-2] if condition.endswith("')") else condition[7:-1]
-                try:
-                    return bool(re.search(pattern, cell_value))
-                except re.error:
-                    return False
-            
-            return False
-        
-        def evaluate_blank_condition(cell_value, condition):
-            is_blank = cell_value is None or str(cell_value).strip() == ""
-            
-            # Check for compound conditions (AND, OR)
-            if " AND " in condition.upper():
-                parts = condition.upper().split(" AND ")
-                return all(evaluate_blank_condition(cell_value, part.strip()) for part in parts)
-                
-            if " OR " in condition.upper():
-                parts = condition.upper().split(" OR ")
-                return any(evaluate_blank_condition(cell_value, part.strip()) for part in parts)
-            
-            if condition.upper() == "=ISBLANK()" or condition.upper() == "ISBLANK()":
-                return is_blank
-            elif condition.upper() == "<>ISBLANK()" or condition.upper() == "NOTBLANK()":
-                return not is_blank
-            return False
-            
-        def evaluate_date_condition(cell_value, condition, row=None):
-            import datetime as dt
-            
-            # Excel epoch for date calculations
-            excel_epoch = dt.datetime(1899, 12, 30)
-            
-            # Convert cell value to date
-            cell_date = None
-            if isinstance(cell_value, dt.datetime):
-                cell_date = cell_value
-            elif isinstance(cell_value, (int, float)):
-                # Excel stores dates as number of days since epoch
-                try:
-                    cell_date = excel_epoch + dt.timedelta(days=cell_value)
-                except Exception:
-                    return False
-            else:
-                # Try parsing string with provided format
-                if date_format:
-                    try:
-                        cell_date = dt.datetime.strptime(str(cell_value), date_format)
-                    except Exception:
-                        return False
-                else:
-                    # Try some common formats
-                    common_formats = ["%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%Y/%m/%d", "%d-%m-%Y", "%m-%d-%Y"]
-                    for fmt in common_formats:
-                        try:
-                            cell_date = dt.datetime.strptime(str(cell_value), fmt)
-                            break
-                        except Exception:
-                            continue
-                    else:
-                        return False
-            
-            # Replace TODAY() with current date
-            if "TODAY(" in condition.upper():
-                today = dt.datetime.today()
-                today_excel_days = (today.date() - excel_epoch.date()).days
-                condition = re.sub(r'TODAY\(\)', str(today_excel_days), condition, flags=re.IGNORECASE)
-            
-            # Replace DATE(year, month, day) with Excel date value
-            date_patterns = re.findall(r'DATE\((\d+)\s*,\s*(\d+)\s*,\s*(\d+)\)', condition, re.IGNORECASE)
-            for year, month, day in date_patterns:
-                try:
-                    date_obj = dt.datetime(int(year), int(month), int(day))
-                    excel_days = (date_obj.date() - excel_epoch.date()).days
-                    condition = re.sub(r'DATE\(' + year + r'\s*,\s*' + month + r'\s*,\s*' + day + r'\)', 
-                                      str(excel_days), condition)
-                except Exception:
-                    pass
-            
-            # Get Excel serial date value for comparison
-            cell_excel_days = (cell_date.date() - excel_epoch.date()).days
-            
-            # Now evaluate as numeric condition
-            return evaluate_numeric_condition(cell_excel_days, condition, row)
-        
-        # Master condition evaluator that handles compound conditions across different types
-        def evaluate_condition(cell_value, condition, row=None, col=None):
-            # Extract any column references in the condition
-            cell_ref = None
-            if row and col:
-                cell_ref = f"{get_column_letter(col)}{row}"
-                
-                # If this cell contains a formula, use the calculated value from data_only worksheet
-                if cell_ref in calculated_values and handle_formulas:
-                    cell_value = calculated_values[cell_ref]
-            
-            # First check for top-level compound conditions
-            if " AND " in condition.upper():
-                parts = condition.upper().split(" AND ")
-                return all(evaluate_condition(cell_value, part.strip(), row, col) for part in parts)
-                
-            if " OR " in condition.upper():
-                parts = condition.upper().split(" OR ")
-                return any(evaluate_condition(cell_value, part.strip(), row, col) for part in parts)
-            
-            # Check if we're dealing with a date condition
-            if ("DATE(" in condition.upper() or "TODAY(" in condition.upper()) and not condition.startswith("='"):
-                return evaluate_date_condition(cell_value, condition, row)
-                
-            # Then evaluate based on condition type
-            # Numeric conditions
-            if any(condition.startswith(op) for op in ["=", ">", "<", "<=", ">=", "<>"]) and not condition.startswith("='") and not condition.startswith("<>'"):
-                return evaluate_numeric_condition(cell_value, condition, row)
-            
-            # Text conditions
-            elif condition.startswith("='") or condition.startswith("<>'") or \
-                 condition.upper().startswith(("CONTAINS('"), ("STARTS_WITH('"), ("ENDS_WITH("), ("REGEX(")):
-                return evaluate_text_condition(cell_value, condition, row)
-            
-            # Blank/not blank conditions
-            elif condition.upper() in ["=ISBLANK()", "<>ISBLANK()", "ISBLANK()", "NOTBLANK()"]:
-                return evaluate_blank_condition(cell_value, condition)
-                
-            # If we have column references in the condition like {profit} or {C}
-            if "{" in condition and "}" in condition:
-                # Already handled in the specific condition evaluators
-                return evaluate_numeric_condition(cell_value, condition, row)
-                
-            # Fallback
-            return False
-            
-        # Track rows to format based on condition
-        rows_to_format = set()
-        cells_to_format = []
-        
-        # Evaluate condition for each row or cell in the range
-        for row in range(min_row, max_row + 1):
-            # Skip header row if it exists (first row of range)
-            if row == min_row and min_row != max_row:  # Skip only if we have multiple rows
-                # Assume first row is header and skip evaluation
-                continue
-                
-            # If we're checking a specific column for the condition
-            if condition_col_idx:
-                # Get cell from the regular worksheet
-                cell = worksheet.cell(row=row, column=condition_col_idx)
-                cell_value = cell.value
-                
-                # If handling formulas and this is a formula cell, use the calculated value
-                if handle_formulas:
-                    cell_ref = f"{get_column_letter(condition_col_idx)}{row}"
-                    if cell_ref in calculated_values:
-                        cell_value = calculated_values[cell_ref]
-                    else:
-                        # Get from data_only worksheet
-                        cell_value = worksheet_data_only.cell(row=row, column=condition_col_idx).value
-                
-                # Use the master condition evaluator
-                should_format = evaluate_condition(cell_value, condition, row, condition_col_idx)
-                
-                # If condition is met, add row to formatting list
-                if should_format:
-                    if format_entire_row or should_format_specific_columns:
-                        rows_to_format.add(row)
-                    else:
-                        cells_to_format.append((row, condition_col_idx))
-            else:
-                # Check each cell in the range
-                row_matched = False
-                for col in range(min_col, max_col + 1):
-                    cell = worksheet.cell(row=row, column=col)
-                    cell_value = cell.value
-                    
-                    # If handling formulas and this is a formula cell, use the calculated value
-                    if handle_formulas:
-                        cell_ref = f"{get_column_letter(col)}{row}"
-                        if cell_ref in calculated_values:
-                            cell_value = calculated_values[cell_ref]
-                        else:
-                            # Get from data_only worksheet
-                            cell_value = worksheet_data_only.cell(row=row, column=col).value
-                    
-                    # Use the master condition evaluator
-                    should_format = evaluate_condition(cell_value, condition, row, col)
-                    
-                    # If condition is met, add cell to formatting list
-                    if should_format:
-                        row_matched = True
-                        if not (format_entire_row or should_format_specific_columns):
-                            cells_to_format.append((row, col))
-                
-                # If any cell in the row matched and we're formatting entire rows
-                if row_matched and (format_entire_row or should_format_specific_columns):
-                    rows_to_format.add(row)
-        
-        # Apply formatting to entire rows if needed
-        if format_entire_row and rows_to_format:
-            # Determine the full range of columns to format
-            min_format_col = 1  # Start from the first column in the worksheet
-            max_format_col = worksheet.max_column  # Format all columns in the worksheet
-            
-            for row in rows_to_format:
-                for col in range(min_format_col, max_format_col + 1):
-                    cell = worksheet.cell(row=row, column=col)
-                    
-                    # Apply font if any font properties set
-                    if font_args:
-                        # Start with existing font and update properties
-                        new_font = Font(
-                            name=cell.font.name,
-                            bold=cell.font.bold,
-                            italic=cell.font.italic,
-                            size=cell.font.size,
-                            color=cell.font.color
-                        )
-                        # Update with specified properties
-                        for key, value in font_args.items():
-                            setattr(new_font, key, value)
-                        cell.font = new_font
-                    
-                    # Apply fill if specified
-                    if fill:
-                        cell.fill = fill
-                        
-                    # Apply alignment if specified
-                    if align:
-                        cell.alignment = align
-                        
-                    # Apply border if specified
-                    if border:
-                        cell.border = border
-                    
-                    formatted_cells_count += 1
-                    
-        # Apply formatting to specific columns in matching rows
-        elif should_format_specific_columns and rows_to_format:
-            # Use both specified format columns and outside range columns
-            all_format_columns = list(format_col_indices)
-            all_format_columns.extend(outside_range_indices)
-            
-            for row in rows_to_format:
-                for col_idx in all_format_columns:
-                    cell = worksheet.cell(row=row, column=col_idx)
-                    
-                    # Apply font if any font properties set
-                    if font_args:
-                        # Start with existing font and update properties
-                        new_font = Font(
-                            name=cell.font.name,
-                            bold=cell.font.bold,
-                            italic=cell.font.italic,
-                            size=cell.font.size,
-                            color=cell.font.color
-                        )
-                        # Update with specified properties
-                        for key, value in font_args.items():
-                            setattr(new_font, key, value)
-                        cell.font = new_font
-                    
-                    # Apply fill if specified
-                    if fill:
-                        cell.fill = fill
-                        
-                    # Apply alignment if specified
-                    if align:
-                        cell.alignment = align
-                        
-                    # Apply border if specified
-                    if border:
-                        cell.border = border
-                    
-                    formatted_cells_count += 1
-        else:
-            # Apply formatting to individual cells, plus any outside range columns if specified
-            processed_cells = set()  # Track cells we've already processed
-            
-            for row, col in cells_to_format:
-                # Format the cell that matched the condition
-                if (row, col) not in processed_cells:
-                    cell = worksheet.cell(row=row, column=col)
-                    
-                    # Apply font if any font properties set
-                    if font_args:
-                        # Start with existing font and update properties
-                        new_font = Font(
-                            name=cell.font.name,
-                            bold=cell.font.bold,
-                            italic=cell.font.italic,
-                            size=cell.font.size,
-                            color=cell.font.color
-                        )
-                        # Update with specified properties
-                        for key, value in font_args.items():
-                            setattr(new_font, key, value)
-                        cell.font = new_font
-                    
-                    # Apply fill if specified
-                    if fill:
-                        cell.fill = fill
-                        
-                    # Apply alignment if specified
-                    if align:
-                        cell.alignment = align
-                        
-                    # Apply border if specified
-                    if border:
-                        cell.border = border
-                    
-                    processed_cells.add((row, col))
-                    formatted_cells_count += 1
-                
-                # Format outside range columns for this row if specified
-                if outside_range_indices:
-                    for outside_col in outside_range_indices:
-                        if (row, outside_col) not in processed_cells:
-                            outside_cell = worksheet.cell(row=row, column=outside_col)
-                            
-                            # Apply font if any font properties set
-                            if font_args:
-                                # Start with existing font and update properties
-                                new_font = Font(
-                                    name=outside_cell.font.name,
-                                    bold=outside_cell.font.bold,
-                                    italic=outside_cell.font.italic,
-                                    size=outside_cell.font.size,
-                                    color=outside_cell.font.color
-                                )
-                                # Update with specified properties
-                                for key, value in font_args.items():
-                                    setattr(new_font, key, value)
-                                outside_cell.font = new_font
-                            
-                            # Apply fill if specified
-                            if fill:
-                                outside_cell.fill = fill
-                                
-                            # Apply alignment if specified
-                            if align:
-                                outside_cell.alignment = align
-                                
-                            # Apply border if specified
-                            if border:
-                                outside_cell.border = border
-                            
-                            processed_cells.add((row, outside_col))
-                            formatted_cells_count += 1
-        
-        # Apply icon sets if specified
-        if icon_set:
-            # This is a simplified version - actual icon sets require different approach
-            # For now, just provide a message about the limitation
-            icon_set_message = f"Note: Icon set '{icon_set}' was requested but requires Excel's built-in conditional formatting feature."
-        else:
-            icon_set_message = None
-        
-        # Save workbook
-        wb.save(filepath)
-        if wb_data_only:
-            wb_data_only.close()
-        wb.close()
-        
-        # Format message based on formatting mode
-        format_mode = "rows" if format_entire_row else "cells"
-        if columns_to_format:
-            format_mode = f"specified columns ({', '.join(columns_to_format)}) in matching rows"
+    
+    # If columns_to_format is specified, convert to column indices
+    format_col_indices = []
+    if columns_to_format:
+        for col_letter in columns_to_format:
+            try:
+                col_idx = column_index_from_string(col_letter.upper().strip())
+                format_col_indices.append(col_idx)
+            except Exception as e:
+                return {
+                    "success": False,
+                    "error": f"Invalid format column: {col_letter} - {str(e)}"
+                }
         
-        condition_info = f" in column {condition_column}" if condition_column else ""
+        # If columns_to_format is specified, we'll format only those specific columns
+        # regardless of what format_entire_row is set to
+        should_format_specific_columns = columns_to_format is not None and len(columns_to_format) > 0
         
-        result = {
-            "success": True,
-            "message": f"Conditional formatting applied to {formatted_cells_count} {format_mode} matching condition '{condition}'{condition_info} in range {cell_range}",
-            "cells_formatted": formatted_cells_count,
-            "condition_applied": condition,
-            "formatted_entire_rows": format_entire_row,
-            "formula_handling_enabled": handle_formulas
-        }
+        # If we're formatting specific columns, ensure format_entire_row is False
+        if should_format_specific_columns:
+            format_entire_row = False
+    else:
+        should_format_specific_columns = False
+    
+    # If outside_range_columns is specified, convert to column indices
+    outside_range_indices = []
+    if outside_range_columns:
+        for col_letter in outside_range_columns:
+            try:
+                col_idx = column_index_from_string(col_letter.upper().strip())
+                outside_range_indices.append(col_idx)
+            except Exception as e:
+                return {
+                    "success": False,
+                    "error": f"Invalid outside range column: {col_letter} - {str(e)}"
+                }
+    
+    # Build mapping for column comparisons if provided
+    column_name_to_letter = {}
+    column_name_to_index = {}
+    if compare_columns:
+        for name, col_letter in compare_columns.items():
+            try:
+                column_name_to_letter[name] = col_letter.upper().strip()
+                column_name_to_index[name] = column_index_from_string(col_letter.upper().strip())
+            except Exception as e:
+                return {
+                    "success": False,
+                    "error": f"Invalid column mapping: {name} -> {col_letter} - {str(e)}"
+                }
+    
+    # Set up font formatting options
+    font_args = {}
+    if bold:
+        font_args["bold"] = True
+    if italic:
+        font_args["italic"] = True
+    if font_size:
+        font_args["size"] = font_size
+    if font_color:
+        # Handle color format (with or without #)
+        if font_color.startswith("#"):
+            font_color = font_color[1:]
+        font_args["color"] = font_color
+    
+    # Set up fill
+    fill = None
+    if bg_color:
+        # Handle color format (with or without #)
+        if bg_color.startswith("#"):
+            bg_color = bg_color[1:]
+        fill = _get_pattern_fill(bg_color)
+    
+    # Set up alignment
+    align = None
+    if alignment or wrap_text:
+        align_horz = None
+        if alignment:
+            align_horz = {
+                "left": "left",
+                "center": "center",
+                "right": "right"
+            }.get(alignment.lower())
+        align = _get_alignment(align_horz, wrap_text)
+    
+    # Set up border
+    border = None
+    if border_style:
+        border = _get_border(border_style)
+    
+    # Parse the condition
+    formatted_cells_count = 0
+    condition = condition.strip()
+    
+    # Pre-process condition to handle column name references like {profit} or {sales}
+    if compare_columns:
+        for col_name, col_letter in column_name_to_letter.items():
+            pattern = r'\{' + col_name + r'\}'
+            condition = re.sub(pattern, f"{{{col_letter}}}", condition, flags=re.IGNORECASE)
+    
+    # With formula handling every cell is read from the data_only worksheet, which
+    # holds the calculated value for formula cells and the plain value otherwise
+    value_worksheet = worksheet_data_only if handle_formulas else worksheet
+
+    def resolve_column(col_ref, row):
+        # Column references read calculated values when formulas are handled
+        actual_col = column_name_to_letter.get(col_ref, col_ref)
+        source = worksheet_data_only if worksheet_data_only else worksheet
+        return source.cell(row=row, column=column_index_from_string(actual_col)).value
+    
+    # Parse the condition once; each cell check is then a single predicate call
+    predicate = _compile_condition(condition, resolve_column, date_format)
         
-        if icon_set_message:
-            result["icon_set_message"] = icon_set_message
-            
-        return result
+    # With more than one row, the first row of the range is a header and is not evaluated
+    scan_min_row = min_row + 1 if min_row != max_row else min_row
+    scan_row_count = max_row - scan_min_row + 1
+    
+    # Track rows to format based on condition. Large ranges mark matching rows in a
+    # boolean mask instead of hashing them into a set
+    rows_to_format = set()
+    cells_to_format = []
+    row_mask = None
+    if _np is not None and scan_row_count > _VECTORIZE_MIN_CELLS:
+        row_mask = _np.zeros(scan_row_count, dtype=bool)
+        
+        def mark_row(row):
+            row_mask[row - scan_min_row] = True
+    else:
+        mark_row = rows_to_format.add
+    
+    # Evaluate condition for each row or cell in the range. Values are read in one
+    # bulk iter_rows pass instead of a worksheet.cell() lookup per cell
+    scan_min_col = condition_col_idx or min_col
+    scan_max_col = condition_col_idx or max_col
+    scanned_rows = value_worksheet.iter_rows(
+        min_row=scan_min_row, max_row=max_row,
+        min_col=scan_min_col, max_col=scan_max_col,
+        values_only=True
+    )
+    
+    # Large ranges with a purely numeric condition are evaluated as one array mask
+    match_mask = None
+    if scan_row_count * (scan_max_col - scan_min_col + 1) > _VECTORIZE_MIN_CELLS:
+        numeric_mask = _compile_numeric_mask(condition)
+        if numeric_mask is not None:
+            scanned_rows = list(scanned_rows)
+            values = _to_number_array(scanned_rows)
+            if values is not None:
+                match_mask = numeric_mask(values)
+    
+    if match_mask is not None:
+        if format_entire_row or should_format_specific_columns:
+            matched_rows = match_mask.any(axis=1)
+            if row_mask is not None:
+                row_mask |= matched_rows
+            else:
+                rows_to_format.update((_np.flatnonzero(matched_rows) + scan_min_row).tolist())
+        elif condition_col_idx:
+            for offset in _np.flatnonzero(match_mask[:, 0]):
+                cells_to_format.append((scan_min_row + int(offset), condition_col_idx))
+        else:
+            for row_offset, col_offset in zip(*_np.nonzero(match_mask)):
+                cells_to_format.append((scan_min_row + int(row_offset), min_col + int(col_offset)))
+        scanned_rows = ()
+    
+    for row, row_values in enumerate(scanned_rows, start=scan_min_row):
+        # If we're checking a specific column for the condition
+        if condition_col_idx:
+            # If condition is met, add row to formatting list
+            if predicate(row_values[0], row):
+                if format_entire_row or should_format_specific_columns:
+                    mark_row(row)
+                else:
+                    cells_to_format.append((row, condition_col_idx))
+        else:
+            # Check each cell in the range
+            row_matched = False
+            for col, cell_value in enumerate(row_values, start=min_col):
+                # If condition is met, add cell to formatting list
+                if predicate(cell_value, row):
+                    row_matched = True
+                    if not (format_entire_row or should_format_specific_columns):
+                        cells_to_format.append((row, col))
+            
+            # If any cell in the row matched and we're formatting entire rows
+            if row_matched and (format_entire_row or should_format_specific_columns):
+                mark_row(row)
+    
+    if row_mask is not None:
+        rows_to_format = (_np.flatnonzero(row_mask) + scan_min_row).tolist()
+    
+    # Matching cells that share a font also share the merged font, so build it once
+    # per distinct existing font instead of allocating a new Font for every cell
+    merged_fonts = {}
+    
+    def merged_font(cell):
+        font_id = cell._style.fontId if cell.has_style else 0
+        new_font = merged_fonts.get(font_id)
+        if new_font is None:
+            # Start with existing font and update properties
+            new_font = merged_fonts[font_id] = _merge_font(cell.font, font_args)
+        return new_font
+    
+    # Collect the cells to format for the active mode
+    if format_entire_row:
+        # Format all columns in the worksheet
+        max_format_col = worksheet.max_column
+        targets = [(row, col) for row in rows_to_format for col in range(1, max_format_col + 1)]
+    elif should_format_specific_columns:
+        # Use both specified format columns and outside range columns
+        all_format_columns = format_col_indices + outside_range_indices
+        targets = [(row, col) for row in rows_to_format for col in all_format_columns]
+    else:
+        # Individual matching cells, plus any outside range columns of their rows,
+        # each formatted once
+        targets = []
+        processed_cells = set()
+        for row, col in cells_to_format:
+            for target in [(row, col)] + [(row, outside_col) for outside_col in outside_range_indices]:
+                if target not in processed_cells:
+                    processed_cells.add(target)
+                    targets.append(target)
+    
+    for row, col in targets:
+        cell = worksheet.cell(row=row, column=col)
+        _apply_style(cell, merged_font(cell) if font_args else None, fill, align, border)
+    formatted_cells_count += len(targets)
+    
+    return _conditional_formatting_result(
+        formatted_cells_count, condition, condition_column, cell_range,
+        format_entire_row, columns_to_format, handle_formulas, icon_set
+    )
+
+def _conditional_formatting_result(
+    formatted_cells_count: int,
+    condition: str,
+    condition_column: Optional[str],
+    cell_range: str,
+    format_entire_row: bool,
+    columns_to_format: Optional[List[str]],
+    handle_formulas: bool,
+    icon_set: Optional[str]
+) -> Dict[str, Any]:
+    """Build the result dictionary of apply_conditional_formatting"""
+    # Apply icon sets if specified
+    if icon_set:
+        # This is a simplified version - actual icon sets require different approach
+        # For now, just provide a message about the limitation
+        icon_set_message = f"Note: Icon set '{icon_set}' was requested but requires Excel's built-in conditional formatting feature."
+    else:
+        icon_set_message = None
+    
+    # Format message based on formatting mode
+    format_mode = "rows" if format_entire_row else "cells"
+    if columns_to_format:
+        format_mode = f"specified columns ({', '.join(columns_to_format)}) in matching rows"
+    
+    condition_info = f" in column {condition_column}" if condition_column else ""
+    
+    result = {
+        "success": True,
+        "message": f"Conditional formatting applied to {formatted_cells_count} {format_mode} matching condition '{condition}'{condition_info} in range {cell_range}",
+        "cells_formatted": formatted_cells_count,
+        "condition_applied": condition,
+        "formatted_entire_rows": format_entire_row,
+        "formula_handling_enabled": handle_formulas
+    }
+    
+    if icon_set_message:
+        result["icon_set_message"] = icon_set_message
         
+    return result
+
+def _condition_column_has_match(
+    values_wb: Workbook,
+    sheet_name: str,
+    cell_range: str,
+    condition: str,
+    condition_column: str,
+    date_format: Optional[str] = None
+) -> Optional[bool]:
+    """Check whether any row of cell_range meets a condition on a single column.
+    
+    Returns:
+        True or False, or None if the sheet, range or column is invalid and the
+        full formatting pass should report the error
+    """
+    if sheet_name not in values_wb.sheetnames:
+        return None
+    try:
+        _, min_row, _, max_row = range_boundaries(cell_range)
+        condition_col_idx = column_index_from_string(condition_column.upper().strip())
+    except Exception:
+        return None
+    predicate = _compile_condition(condition, date_format=date_format)
+    scan_min_row = min_row + 1 if min_row != max_row else min_row
+    for row, (value,) in enumerate(
+        values_wb[sheet_name].iter_rows(
+            min_row=scan_min_row, max_row=max_row,
+            min_col=condition_col_idx, max_col=condition_col_idx,
+            values_only=True
+        ),
+        start=scan_min_row
+    ):
+        if predicate(value, row):
+            return True
+    return False
+
+def apply_conditional_formatting(
+    filepath: Optional[str],
+    sheet_name: str,
+    cell_range: str,
+    condition: str,
+    bold: bool = False,
+    italic: bool = False,
+    font_size: Optional[int] = None,
+    font_color: Optional[str] = None,
+    bg_color: Optional[str] = None,
+    alignment: Optional[str] = None,
+    wrap_text: bool = False,
+    border_style: Optional[str] = None,
+    condition_column: Optional[str] = None,
+    format_entire_row: bool = False,
+    columns_to_format: Optional[List[str]] = None,
+    handle_formulas: bool = True,
+    outside_range_columns: Optional[List[str]] = None,
+    compare_columns: Optional[Dict[str, str]] = None,
+    date_format: Optional[str] = None,
+    icon_set: Optional[str] = None,
+    wb: Optional[Workbook] = None,
+    values_wb: Optional[Workbook] = None
+) -> Dict[str, Any]:
+    """Apply conditional formatting to cells based on a specified condition.
+    
+    This function efficiently applies formatting to cells in a range that meet specified criteria,
+    eliminating the need to manually filter and format cells one by one.
+    
+    Args:
+        filepath: Path to the Excel workbook
+        sheet_name: Name of the worksheet
+        cell_range: Range of cells to check and potentially format (e.g., 'A1:D10')
+        condition: Condition for formatting, using syntax like ">90", "='Yes'", "CONTAINS('text')"
+                   Example formats:
+                   - Numeric: ">90", "<=50", "=100", "<>0" (not equal to zero)
+                   - Text: "='Yes'", "<>'No'", "CONTAINS('text')", "STARTS_WITH('A')"
+                   - Date: ">DATE(2023,1,1)", "<=TODAY()"
+                   - Blank: "=ISBLANK()", "<>ISBLANK()"
+                   - Compound conditions: ">50 AND <=70", "<20 OR >80", "CONTAINS('Pass') OR =ISBLANK()"
+                   - Column comparisons: ">{F}" (compare with column F), "<=2*{C}" (compare with twice value in column C)
+        bold: Whether to apply bold formatting to matching cells
+        italic: Whether to apply italic formatting to matching cells
+        font_size: Optional font size to apply to matching cells
+        font_color: Optional font color (hex code, with or without #) for matching cells
+        bg_color: Optional background color (hex code, with or without #) for matching cells 
+        alignment: Optional text alignment ('left', 'center', 'right') for matching cells
+        wrap_text: Whether to enable text wrapping for matching cells
+        border_style: Optional border style ('thin', 'medium', 'thick', 'dashed', 'dotted', 'double')
+        condition_column: Optional column letter to evaluate the condition on (e.g., 'D' for Units)
+        format_entire_row: Whether to format the entire row when condition is met (default False)
+        columns_to_format: Optional list of specific column letters to format when condition is met
+                           (e.g. ['A', 'C', 'D']). Only used when format_entire_row is False or
+                           when you want to format specific columns in the row
+        handle_formulas: Whether to evaluate formulas for condition checking (default True)
+        outside_range_columns: Optional list of columns outside the range to format when condition is met
+        compare_columns: Optional dictionary mapping column references in condition to actual column letters
+                         (e.g., {"profit": "F"} to refer to column F as "profit" in conditions)
+        date_format: Optional date format string for date comparisons (e.g., "%Y-%m-%d")
+        icon_set: Optional icon set to apply ('3arrows', '3trafficlights', '3symbols', '3stars', etc.)
+        wb: Optional already open workbook to modify instead of loading filepath. It is
+            not saved; calculated values are still read from filepath if one is given.
+        values_wb: Optional data_only workbook to read calculated values from when wb is
+                   given, such as an ExcelSession's values_wb. It must not be read-only,
+                   as column comparisons look cells up by position.
+    
+    Returns:
+        Dictionary with success status, message, and count of formatted cells
+    """
+    format_args = (
+        sheet_name, cell_range, condition, bold, italic, font_size, font_color, bg_color,
+        alignment, wrap_text, border_style, condition_column, format_entire_row,
+        columns_to_format, outside_range_columns, compare_columns, date_format, icon_set
+    )
+    owned_values_wb = None
+    try:
+        if wb is not None:
+            # The open workbook only holds formulas, calculated values come from the saved
+            # file. It is loaded in full, since column comparisons look cells up one by one
+            if handle_formulas and values_wb is None and filepath:
+                values_wb = owned_values_wb = load_workbook(filepath, data_only=True)
+            return _apply_conditional_formatting_on_wb(wb, values_wb if handle_formulas else None, *format_args)
+        
+        # Without wb, calculated values are read from filepath like the workbook itself
+        values_wb = None
+        
+        # A condition that only reads condition_column is first checked in a read-only
+        # pass, which skips the full load when nothing matches and otherwise also
+        # serves as the source of calculated values
+        if (condition_column and not format_entire_row and not columns_to_format
+                and not outside_range_columns and not compare_columns and "{" not in condition):
+            values_wb = owned_values_wb = load_workbook(filepath, read_only=True, data_only=handle_formulas)
+            has_match = _condition_column_has_match(
+                values_wb, sheet_name, cell_range, condition, condition_column, date_format
+            )
+            if has_match is False:
+                return _conditional_formatting_result(
+                    0, condition.strip(), condition_column, cell_range,
+                    format_entire_row, columns_to_format, handle_formulas, icon_set
+                )
+            if not handle_formulas:
+                values_wb.close()
+                values_wb = owned_values_wb = None
+        
+        with ExcelSession(filepath) as session:
+            if handle_formulas and values_wb is None:
+                values_wb = session.values_wb
+            result = _apply_conditional_formatting_on_wb(session.wb, values_wb, *format_args)
+            if not result["success"]:
+                session.discard()
+            return result
     except Exception as e:
         logger.error(f"Failed to apply conditional formatting: {e}")
-        if 'wb' in locals():
-            wb.close()
-        if 'wb_data_only' in locals() and wb_data_only:
-            wb_data_only.close()
         return {
             "success": False,
             "error": f"Failed to apply conditional formatting: {str(e)}"
         }
+    finally:
+        if owned_values_wb is not None:
+            owned_values_wb.close()
+
+# Two-operand arithmetic such as =A1*B1 or =A1+5, evaluated without the formulas library
+_NUMERIC_BINOPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+_SIMPLE_BINOP = re.compile(
+    r"^=?\s*([A-Z]+\d+|\d+(?:\.\d+)?)\s*([+\-*/])\s*([A-Z]+\d+|\d+(?:\.\d+)?)\s*$",
+    re.IGNORECASE
+)
+
+def _evaluate_simple_binop(formula_str: str, context_values: Optional[dict]) -> Optional[float]:
+    """Evaluate a two-operand arithmetic formula, or return None if it is not one"""
+    match = _SIMPLE_BINOP.match(formula_str)
+    if match is None:
+        return None
+    left, op, right = match.groups()
+    references = {str(ref).upper(): value for ref, value in (context_values or {}).items()}
+    operands = []
+    for operand in (left, right):
+        if operand[0].isdigit():
+            operands.append(float(operand))
+            continue
+        value = references.get(operand.upper())
+        if value is None:
+            return None
+        try:
+            operands.append(float(value))
+        except (TypeError, ValueError):
+            return None
+    if op == "/" and operands[1] == 0:
+        # Leave the #DIV/0! error to the formulas library
+        return None
+    return _NUMERIC_BINOPS[op](operands[0], operands[1])
+
+# Result types that are returned as they are
+_JSON_SCALAR_TYPES = frozenset((int, float, str, bool, type(None)))
+
+def _formula_result_to_python(result: Any) -> Any:
+    """Convert a result of the formulas library to a JSON serializable value"""
+    # Results are numpy array subclasses, so this is an isinstance check
+    if _np is not None and isinstance(result, _np.ndarray) and result.size == 1:
+        result = result.item()  # Convert numpy array to Python scalar
+        
+    # Convert other types if needed, such as errors, to a number or their text
+    if type(result) in _JSON_SCALAR_TYPES:
+        return result
+    try:
+        return float(result)
+    except (TypeError, ValueError):
+        return str(result)
+
+def _calculate_workbook_formulas(filepath: str) -> Dict[str, Any]:
+    """Calculate every formula of a workbook in one pass of the formulas library.
+    
+    Returns:
+        Dictionary mapping "SHEET!A1" references, with the sheet name uppercased,
+        to the calculated values
+    """
+    solution = ExcelModel().loads(filepath).finish().calculate()
+    results = {}
+    for key, ranges in solution.items():
+        # Keys look like '[book.xlsx]SHEET'!A1; multi-cell ranges and errors are skipped
+        sheet, _, ref = str(key).rpartition("!")
+        if not sheet or ":" in ref:
+            continue
+        sheet = sheet.strip("'").partition("]")[2].replace("''", "'")
+        results[f"{sheet}!{ref}"] = _formula_result_to_python(ranges.value)
+    return results
+
+@lru_cache(maxsize=1024)
+def _compile_formula_cached(formula_str: str) -> Callable:
+    """Parse and compile a formula once; the compiled function takes its inputs positionally"""
+    return _PARSER.ast(formula_str)[1].compile()
 
 def evaluate_excel_formula(formula_str: str, context_values: dict = None) -> Dict[str, Any]:
     """Evaluate an Excel formula using the formulas library.
@@ -2580,6 +3111,17 @@ def evaluate_excel_formula(formula_str: str, context_values: dict = None) -> Dic
     Returns:
         Dictionary with evaluation result and metadata
     """
+    # Simple arithmetic is computed directly, without parsing the formula
+    result = _evaluate_simple_binop(formula_str, context_values)
+    if result is not None:
+        return {
+            "success": True,
+            "formula": formula_str if formula_str.startswith('=') else f"={formula_str}",
+            "value": result,
+            "value_type": type(result).__name__,
+            "evaluated_by": "fast_path"
+        }
+    
     if not has_formula_engine:
         return {
             "success": False,
@@ -2593,36 +3135,20 @@ def evaluate_excel_formula(formula_str: str, context_values: dict = None) -> Dic
         if not formula_str.startswith('='):
             formula_str = f"={formula_str}"
             
-        # Create a parser and parse the formula
-        parser = Parser()
-        ast = parser.ast(formula_str)[1].compile()
+        # Parse and compile the formula, reusing the compiled function for repeated formulas
+        ast = _compile_formula_cached(formula_str)
         
         # If we have context values, use them for evaluation
         if context_values:
-            inputs = context_values
+            inputs = {str(ref).upper(): value for ref, value in context_values.items()}
         else:
             inputs = {}
             
-        # Evaluate the formula
-        result = ast(inputs)
+        # Evaluate the formula, passing the referenced cells in the order it expects
+        result = ast(*(inputs.get(ref) for ref in ast.inputs))
         
         # Handle special types for JSON serialization
-        try:
-            import numpy as np
-            if isinstance(result, np.ndarray):
-                result = result.item()  # Convert numpy array to Python scalar
-        except (ImportError, AttributeError, Exception):
-            pass
-            
-        # Convert other types if needed
-        if not isinstance(result, (int, float, str, bool, type(None))):
-            try:
-                result = float(result)
-            except (TypeError, ValueError):
-                try:
-                    result = str(result)
-                except Exception:
-                    result = None
+        result = _formula_result_to_python(result)
             
         return {
             "success": True,
@@ -2664,7 +3190,459 @@ def evaluate_excel_formula(formula_str: str, context_values: dict = None) -> Dic
             "value": None
         }
 
-def read_excel_with_formulas(filepath: str, sheet_name: str = None, cell_range: str = None) -> Dict[str, Any]:
+class _CachedValueParser(WorkSheetParser):
+    """Worksheet parser that also keeps the cached result of formula cells.
+    
+    openpyxl reads either the formula or, with data_only=True, the value Excel
+    last calculated for it. This parser returns the formula as usual and adds
+    the calculated value under "cached_value", so one pass gives both.
+    """
+    
+    def parse_cell(self, element):
+        cell = super().parse_cell(element)
+        if cell["data_type"] == "f":
+            self.data_only = True
+            try:
+                cell["cached_value"] = super().parse_cell(element)["value"]
+            finally:
+                self.data_only = False
+        return cell
+
+def _iter_sheet_cells(ws: Any) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """Yield (row, cells) for each stored row of a read-only worksheet.
+    
+    Cells are dictionaries with "column", "value" and "data_type" keys, and
+    "cached_value" for formula cells.
+    """
+    workbook = ws.parent
+    with ws._get_source() as src:
+        parser = _CachedValueParser(
+            src,
+            ws._shared_strings,
+            epoch=workbook.epoch,
+            date_formats=workbook._date_formats,
+            timedelta_formats=workbook._timedelta_formats
+        )
+        yield from parser.parse()
+
+# Simple formulas calculated directly from the collected cell values, such as =D2*E2,
+# =D*E, =F2*0.25, =B2+C2 or =SUM(B2:B9). References without a row number refer to
+# the current row
+_FAST_OPERAND = r"([A-Z]+\d*|\d+(?:\.\d+)?)"
+_MUL_PATTERN = re.compile(rf"=\s*{_FAST_OPERAND}\s*\*\s*{_FAST_OPERAND}\s*$")
+_ADD_PATTERN = re.compile(rf"=\s*{_FAST_OPERAND}\s*([+\-])\s*{_FAST_OPERAND}\s*$")
+_SUM_PATTERN = re.compile(r"=\s*SUM\(\s*([A-Z]+\d+)\s*:\s*([A-Z]+\d+)\s*\)\s*$")
+
+def _fast_operands(operands: Tuple[str, ...], row: int, all_values: Mapping) -> Optional[List[float]]:
+    """Resolve formula operands to numbers, or None if any of them is missing or not numeric"""
+    if all(operand[0].isdigit() for operand in operands):
+        return None
+    numbers = []
+    for operand in operands:
+        if not operand[0].isdigit():
+            # Look the reference up, on the current row when it has no row number
+            operand = all_values.get(operand if operand[-1].isdigit() else f"{operand}{row}")
+            if operand is None:
+                return None
+        try:
+            numbers.append(float(operand))
+        except (TypeError, ValueError):
+            return None
+    return numbers
+
+def _fast_mul(match: re.Match, row: int, all_values: Mapping) -> Optional[float]:
+    numbers = _fast_operands(match.groups(), row, all_values)
+    return numbers[0] * numbers[1] if numbers else None
+
+def _fast_add(match: re.Match, row: int, all_values: Mapping) -> Optional[float]:
+    left, op, right = match.groups()
+    numbers = _fast_operands((left, right), row, all_values)
+    return _NUMERIC_BINOPS[op](numbers[0], numbers[1]) if numbers else None
+
+def _fast_sum(match: re.Match, row: int, all_values: Mapping) -> Optional[float]:
+    # A missing cell may be a formula without a cached value, so the range must be complete
+    min_col, min_row, max_col, max_row = range_boundaries(f"{match.group(1)}:{match.group(2)}")
+    total = 0.0
+    for r in range(min_row, max_row + 1):
+        for c in range(min_col, max_col + 1):
+            value = all_values.get(f"{get_column_letter(c)}{r}")
+            if value is None:
+                return None
+            # Like Excel, SUM skips text and logical values in references
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                total += value
+    return total
+
+# Checked in order; the first pattern matching a formula decides its fast path
+_FAST_FORMULAS = (
+    (_MUL_PATTERN, _fast_mul),
+    (_ADD_PATTERN, _fast_add),
+    (_SUM_PATTERN, _fast_sum),
+)
+
+def _row_product_template(formula: str, row: int) -> Optional[Tuple[Tuple[str, Any], ...]]:
+    """Describe a product of references on the given row, like =D7*E7 or =F7*0.25.
+    
+    Each operand becomes ("col", column index) or ("const", number), so formulas
+    repeated down a column share one template. Returns None for other formulas.
+    """
+    match = _MUL_PATTERN.match(formula)
+    if match is None:
+        return None
+    template = []
+    for operand in match.groups():
+        if operand[0].isdigit():
+            template.append(("const", float(operand)))
+            continue
+        letters = operand.rstrip("0123456789")
+        if letters != operand and int(operand[len(letters):]) != row:
+            return None
+        template.append(("col", column_index_from_string(letters)))
+    if all(kind == "const" for kind, _ in template):
+        return None
+    return tuple(template)
+
+def _batch_row_products(rows: Dict[int, Dict[int, Dict[str, Any]]], all_values: Mapping) -> Dict[Tuple[int, int], float]:
+    """Calculate products repeated down a column, such as =Dn*En, one column at a time.
+    
+    Returns the products by (row, column) for the formula cells whose operands are
+    all numeric; the other cells are left to _evaluate_fast_formula.
+    """
+    if _np is None or not isinstance(all_values, _CellValueGrid):
+        return {}
+    groups = {}
+    for row, row_cells in rows.items():
+        for col, cell in row_cells.items():
+            if cell["data_type"] == "f":
+                template = _row_product_template(cell["value"], row)
+                if template is not None:
+                    groups.setdefault((col, template), []).append(row)
+    
+    products = {}
+    for (col, template), group_rows in groups.items():
+        row_indexes = _np.array(group_rows)
+        result = _np.ones(len(group_rows))
+        valid = _np.ones(len(group_rows), dtype=bool)
+        try:
+            for kind, operand in template:
+                if kind == "const":
+                    result *= operand
+                    continue
+                cells = all_values.column_values(row_indexes, operand)
+                present = _np.not_equal(cells, None)
+                cells[~present] = 0.0
+                result *= cells.astype(_np.float64)
+                valid &= present
+        except (TypeError, ValueError):
+            # Some operand is not numeric; these cells are calculated one by one
+            continue
+        products.update(
+            ((row, col), product)
+            for row, product, is_valid in zip(group_rows, result.tolist(), valid.tolist())
+            if is_valid
+        )
+    return products
+
+def _evaluate_fast_formula(formula: str, row: int, all_values: Mapping) -> Optional[float]:
+    """Calculate a simple formula from the collected cell values, or return None"""
+    for pattern, evaluate in _FAST_FORMULAS:
+        match = pattern.match(formula)
+        if match is not None:
+            return evaluate(match, row, all_values)
+    return None
+
+@lru_cache(maxsize=4096)
+def _split_cell_ref(ref: str) -> Optional[Tuple[int, int]]:
+    """Split a cell reference such as "D7" into (row, column) indexes, or None if it is not one"""
+    try:
+        return coordinate_to_tuple(ref)
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+class _CellValueGrid(Mapping):
+    """Cell values of a sheet stored by (row, column) position.
+    
+    Values are set and read with integer indexes, without building a reference
+    string per cell, while the grid can still be passed wherever a mapping of
+    "A1" references to values is expected.
+    """
+    
+    def __init__(self, max_row: int, max_col: int):
+        self._values = _np.empty((max_row + 1, max_col + 1), dtype=object) if _np is not None else {}
+    
+    def set(self, row: int, col: int, value: Any) -> None:
+        self._values[row, col] = value
+    
+    def set_cells(self, rows: List[int], cols: List[int], values: List[Any]) -> None:
+        """Store many values at once, the i-th value at (rows[i], cols[i]); None leaves a cell empty"""
+        if _np is None:
+            self._values.update(((row, col), value) for row, col, value in zip(rows, cols, values) if value is not None)
+            return
+        cells = _np.empty(len(values), dtype=object)
+        cells[:] = values
+        self._values[rows, cols] = cells
+    
+    def set_block(self, first_row: int, first_col: int, rows: List[List[Any]], empty: Any = None) -> None:
+        """Store a rectangle of values starting at the given cell; `empty` values leave their cell empty"""
+        if _np is None:
+            for row, row_values in enumerate(rows, start=first_row):
+                self._values.update(
+                    ((row, col), value)
+                    for col, value in enumerate(row_values, start=first_col)
+                    if value is not None and value != empty
+                )
+            return
+        block = _np.empty((len(rows), len(rows[0]) if rows else 0), dtype=object)
+        block[...] = rows
+        if empty is not None:
+            block[_np.equal(block, empty)] = None
+        self._values[first_row:first_row + block.shape[0], first_col:first_col + block.shape[1]] = block
+    
+    def convert_dates(self) -> None:
+        """Replace every date value with its Excel serial number, one column at a time.
+        
+        The types of a column are collected first, so columns without dates are
+        skipped without testing each of their cells.
+        """
+        if _np is None:
+            positions = [position for position, value in self._values.items() if isinstance(value, date)]
+            for position, excel_date in zip(positions, _excel_serial_dates([self._values[p] for p in positions])):
+                self._values[position] = excel_date
+            return
+        for col in range(self._values.shape[1]):
+            cells = self._values[:, col].tolist()
+            if not any(issubclass(value_type, date) for value_type in set(map(type, cells))):
+                continue
+            rows = [row for row, value in enumerate(cells) if isinstance(value, date)]
+            self._values[rows, col] = _excel_serial_dates([cells[row] for row in rows])
+    
+    def column_values(self, rows: Any, col: int) -> Any:
+        """Return a copy of the values of one column on the given rows, as an object array"""
+        if col >= self._values.shape[1]:
+            return _np.full(len(rows), None, dtype=object)
+        return self._values[rows, col]
+    
+    def get_cell(self, row: int, col: int) -> Any:
+        if _np is None:
+            return self._values.get((row, col))
+        if row < self._values.shape[0] and col < self._values.shape[1]:
+            return self._values[row, col]
+        return None
+    
+    def _positions(self) -> List[Tuple[int, int]]:
+        if _np is None:
+            return list(self._values)
+        return list(zip(*(indexes.tolist() for indexes in _np.nonzero(_np.not_equal(self._values, None)))))
+    
+    def __getitem__(self, ref: str) -> Any:
+        position = _split_cell_ref(ref)
+        value = self.get_cell(*position) if position is not None else None
+        if value is None:
+            raise KeyError(ref)
+        return value
+    
+    def __iter__(self) -> Iterator[str]:
+        return (f"{get_column_letter(col)}{row}" for row, col in self._positions())
+    
+    def __len__(self) -> int:
+        return len(self._positions())
+
+def _calamine_value_grid(filepath: str, ws_name: str, max_row: int, max_col: int) -> _CellValueGrid:
+    """Collect the calculated values of a sheet with python-calamine.
+    
+    Values match the first pass of read_excel_with_formulas: formula cells hold
+    their cached result and dates are converted to Excel serial numbers.
+    """
+    workbook = CalamineWorkbook.from_path(filepath)
+    try:
+        sheet = workbook.get_sheet_by_name(ws_name)
+        if sheet.start is None:
+            return _CellValueGrid(max_row, max_col)
+        (start_row, start_col), (end_row, end_col) = sheet.start, sheet.end
+        values = _CellValueGrid(max(max_row, end_row + 1), max(max_col, end_col + 1))
+        # calamine returns empty cells as empty strings
+        values.set_block(start_row + 1, start_col + 1, sheet.to_python(skip_empty_area=True), empty="")
+        values.convert_dates()
+        return values
+    finally:
+        workbook.close()
+
+def _excel_serial_dates(dates: List[date]) -> List[float]:
+    """Convert dates to Excel serial date numbers, as one array operation when numpy is available"""
+    dates = [value if isinstance(value, datetime) else datetime.combine(value, datetime.min.time()) for value in dates]
+    if _np is not None and dates:
+        epoch = _np.datetime64("1899-12-30")
+        return ((_np.array(dates, dtype="datetime64[us]") - epoch) / _np.timedelta64(1, "D")).tolist()
+    excel_epoch = datetime(1899, 12, 30)
+    return [(date - excel_epoch) / timedelta(days=1) for date in dates]
+
+# Start tag of a cell formula in worksheet XML, with or without a namespace prefix
+_FORMULA_TAG = re.compile(rb"<(?:\w+:)?f[\s>/]")
+
+def _sheet_has_formulas(ws: Any) -> bool:
+    """Check the raw XML of a read-only worksheet for formulas, without parsing it"""
+    tail = b""
+    with ws._get_source() as src:
+        for chunk in iter(lambda: src.read(1 << 20), b""):
+            if _FORMULA_TAG.search(tail + chunk):
+                return True
+            # Keep the end of the chunk in case a tag is split across reads
+            tail = chunk[-16:]
+    return False
+
+def _sheet_info(ws: Any) -> Dict[str, Any]:
+    """Collect the dimensions and column headers of a read-only worksheet"""
+    # Get sheet dimensions, measured from the cells rather than the dimension record
+    dimensions = sheet_dimension(ws)
+    min_col, min_row, max_col, max_row = range_boundaries(dimensions)
+    
+    # Get column headers (first row)
+    column_refs = [get_column_letter(col) for col in range(min_col, max_col + 1)]
+    header_row = first_row_values(ws, min_row, min_col, max_col)
+    columns = [
+        header if header is not None else f"Column {column_ref}"
+        for header, column_ref in zip(header_row, column_refs)
+    ]
+    
+    return {
+        "name": ws.title,
+        "dimensions": dimensions,
+        "row_count": max_row,
+        "column_count": max_col - min_col + 1,
+        "columns": columns,
+        "column_refs": column_refs
+    }
+
+def _formula_records(
+    filepath: str,
+    ws_name: str,
+    rows: Dict[int, Dict[int, Dict[str, Any]]],
+    all_values: Mapping,
+    col_letters: List[str],
+    min_row: int,
+    max_row: int,
+    min_col: int,
+    max_col: int,
+    include_cell_refs: bool = True
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Build the records of the non-empty rows of a range read by read_excel_with_formulas.
+    
+    Args:
+        filepath: Path to the workbook, calculated with the formulas library when needed
+        ws_name: Name of the sheet the rows belong to
+        rows: Parsed cells of the range, as {row: {col: cell}}
+        all_values: Calculated values of the sheet, used as formula context
+        col_letters: Column letters indexed by column number
+        min_row, max_row, min_col, max_col: Bounds of the range, including its header row
+        include_cell_refs: Whether records list the reference of each of their cells
+    
+    Returns:
+        The row records and the formula cells of the range
+    """
+    records = []
+    formula_cells = []
+    calculated_values = None
+    range_letters = col_letters[min_col:max_col + 1]
+    # Products repeated down a column are calculated for the whole column at once
+    row_products = _batch_row_products(rows, all_values)
+    for row in range(min_row + 1, max_row + 1):
+        row_cells = rows.get(row, {})
+        values = []
+        formulas = []
+        row_number = str(row)
+        cell_refs = [letter + row_number for letter in range_letters]
+        row_has_data = False
+        row_has_formula = False
+        
+        for col, cell_ref in zip(range(min_col, max_col + 1), cell_refs):
+            # Get both formula and value versions
+            cell = row_cells.get(col)
+            
+            # Check if cell has formula
+            has_formula = cell is not None and cell["data_type"] == 'f'
+            formula = cell["value"] if has_formula else None
+            
+            # Get calculated value
+            if has_formula:
+                value = cell["cached_value"]
+            else:
+                value = cell["value"] if cell is not None else None
+            
+            # Convert datetime objects to ISO format for JSON serialization
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            
+            # Try to manually calculate simple formulas like D*E, F*0.25 or SUM(B2:B9),
+            # keeping Excel's cached value (and its number format) when there is one
+            fast_value = None
+            if has_formula and cell["cached_value"] is None:
+                fast_value = row_products.get((row, col))
+                if fast_value is None:
+                    fast_value = _evaluate_fast_formula(formula, row, all_values)
+                if fast_value is not None:
+                    value = fast_value
+            
+            # If neither openpyxl nor the fast path calculated the formula value, try with formulas library
+            if has_formula and fast_value is None and value is None and has_formula_engine and formula:
+                # The whole workbook is calculated once, on the first formula the fast
+                # path cannot calculate without a cached value, and later cells are
+                # looked up in the results
+                if calculated_values is None:
+                    try:
+                        calculated_values = _calculate_workbook_formulas(filepath)
+                    except Exception as e:
+                        logger.warning(f"Error calculating workbook formulas: {str(e)}")
+                        calculated_values = {}
+                try:
+                    result_key = f"{ws_name.upper()}!{cell_ref}"
+                    if result_key in calculated_values:
+                        value = calculated_values[result_key]
+                    else:
+                        # Try to evaluate the formula using all collected context values
+                        eval_result = evaluate_excel_formula(formula, all_values)
+                        if eval_result.get("success", False):
+                            value = eval_result["value"]
+                except Exception as e:
+                    logger.warning(f"Error evaluating formula in {cell_ref}: {str(e)}")
+            
+            # Store formula info for cells with formulas
+            if has_formula:
+                formula_cells.append({
+                    "cell": cell_ref,
+                    "formula": formula,
+                    "calculated_value": value
+                })
+                row_has_formula = True
+            
+            # Append value to the row data
+            values.append(value)
+            formulas.append(formula)
+            
+            if has_formula or value not in EMPTY_VALUES:
+                row_has_data = True
+        
+        if row_has_data:
+            record = {
+                "row": row,
+                "values": values,
+            }
+            if include_cell_refs:
+                record["cell_refs"] = cell_refs
+            
+            # Only include formulas when they exist
+            if row_has_formula:
+                record["formulas"] = formulas
+                
+            records.append(record)
+    
+    return records, formula_cells
+
+def read_excel_with_formulas(
+    filepath: str,
+    sheet_name: str = None,
+    cell_range: str = None,
+    include_cell_refs: bool = True
+) -> Dict[str, Any]:
     """Read Excel data with enhanced formula handling.
     
     This function reads Excel data and handles formulas properly, returning both the 
@@ -2675,16 +3653,16 @@ def read_excel_with_formulas(filepath: str, sheet_name: str = None, cell_range:
         filepath: Path to the Excel file
         sheet_name: Optional specific sheet to read. If None, returns file info only
         cell_range: Optional cell range to read (e.g. 'A1:D10'). If None, reads all cells
+        include_cell_refs: Whether each record lists the cell reference of its values
         
     Returns:
         Dictionary containing file info and optionally sheet data with formula handling
     """
     try:
-        # First load without data_only to get formulas
-        workbook_formulas = openpyxl.load_workbook(filepath, data_only=False)
-        
-        # Then load with data_only to get calculated values
-        workbook_values = openpyxl.load_workbook(filepath, data_only=True)
+        # The workbook is opened read-only and streamed, which avoids building every cell
+        # object up front. Formulas and their cached values are read in the same pass, so
+        # no second data_only load is needed
+        workbook_formulas = openpyxl.load_workbook(filepath, data_only=False, read_only=True, keep_links=False)
         
         # Basic file info
         file_info = {
@@ -2695,32 +3673,16 @@ def read_excel_with_formulas(filepath: str, sheet_name: str = None, cell_range:
         # Get info for all sheets
         for ws_name in workbook_formulas.sheetnames:
             ws_formulas = workbook_formulas[ws_name]
-            ws_values = workbook_values[ws_name]
-            
-            # Get sheet dimensions
-            min_col, min_row, max_col, max_row = range_boundaries(ws_formulas.calculate_dimension())
-            
-            # Get column headers (first row)
-            columns = []
-            column_refs = []
-            for col in range(min_col, max_col + 1):
-                cell = ws_formulas.cell(min_row, col)
-                header = cell.value if cell.value is not None else f"Column {get_column_letter(col)}"
-                columns.append(header)
-                column_refs.append(get_column_letter(col))
-            
-            sheet_info = {
-                "name": ws_name,
-                "dimensions": ws_formulas.calculate_dimension(),
-                "row_count": ws_formulas.max_row,
-                "column_count": max_col - min_col + 1,
-                "columns": columns,
-                "column_refs": column_refs
-            }
+            sheet_info = _sheet_info(ws_formulas)
             file_info["sheets"].append(sheet_info)
             
             # If this is the requested sheet, collect detailed data
             if sheet_name and ws_name == sheet_name:
+                # Get sheet dimensions
+                min_col, min_row, max_col, max_row = range_boundaries(sheet_info["dimensions"])
+                sheet_max_col = max_col
+                sheet_max_row = max_row
+                
                 # Parse cell range if provided
                 if cell_range:
                     try:
@@ -2732,203 +3694,70 @@ def read_excel_with_formulas(filepath: str, sheet_name: str = None, cell_range:
                         }
                 
                 # Get column headers (first row)
-                columns = []
-                for col in range(min_col, max_col + 1):
-                    cell = ws_formulas.cell(min_row, col)
-                    columns.append(cell.value if cell.value is not None else "")
+                header_row = next(ws_formulas.iter_rows(
+                    min_row=min_row, max_row=min_row, min_col=min_col, max_col=max_col, values_only=True
+                ), None) or (None,) * (max_col - min_col + 1)
+                columns = [value if value is not None else "" for value in header_row]
                 
-                # Build context values for formula evaluation - collect all cell values from data_only workbook
+                # Column letters by column index, looked up instead of converted per cell
+                col_letters = [""] + [get_column_letter(col) for col in range(1, max(sheet_max_col, max_col) + 1)]
+                
+                # Build context values for formula evaluation - collect all calculated cell values.
+                # They are only needed when the sheet has formulas
+                collect_values = _sheet_has_formulas(ws_formulas)
                 context_values = {}
                 all_values = {}
+                if collect_values and has_calamine:
+                    # python-calamine reads the values much faster, so the pass below
+                    # only needs the cells of the range
+                    all_values = _calamine_value_grid(filepath, ws_name, sheet_max_row, sheet_max_col)
+                    collect_values = False
+                # Cells of the requested range, as {row: {col: parsed cell}}
+                range_cells = {}
+                # Positions and values of all cells, stored in the grid together after the pass
+                value_rows = []
+                value_cols = []
+                values = []
                 
-                # First pass - collect all values from the data_only workbook
-                for r in range(1, ws_values.max_row + 1):
-                    for c in range(1, ws_values.max_column + 1):
-                        cell_ref = f"{get_column_letter(c)}{r}"
-                        cell_value = ws_values.cell(row=r, column=c).value
-                        
-                        # Skip None values to avoid formula evaluation issues
-                        if cell_value is not None:
-                            # Handle datetime objects for formula calculations
-                            if isinstance(cell_value, datetime):
-                                import datetime as dt
-                                excel_epoch = dt.datetime(1899, 12, 30)
-                                delta = cell_value - excel_epoch
-                                excel_date = delta.days + (delta.seconds / 86400)
-                                all_values[cell_ref] = excel_date
-                            else:
-                                all_values[cell_ref] = cell_value
+                # First pass - collect all values, using the cached result for formula cells
+                for r, row_cells in _iter_sheet_cells(ws_formulas):
+                    if min_row < r <= max_row:
+                        range_cells[r] = {
+                            cell["column"]: cell for cell in row_cells if min_col <= cell["column"] <= max_col
+                        }
+                    if not collect_values:
+                        if r >= max_row:
+                            break
+                        continue
+                    for cell in row_cells:
+                        value_rows.append(r)
+                        value_cols.append(cell["column"])
+                        values.append(cell["cached_value"] if cell["data_type"] == "f" else cell["value"])
+                if collect_values:
+                    # The grid is sized from the cells parsed, not from the dimensions
+                    all_values = _CellValueGrid(max(value_rows, default=0), max(value_cols, default=0))
+                    all_values.set_cells(value_rows, value_cols, values)
+                    # Dates are converted to Excel serial numbers for formula calculations
+                    all_values.convert_dates()
                 
                 # Collect all cells including formula info
-                records = []
-                formula_cells = []
-                
-                for row in range(min_row + 1, max_row + 1):
-                    values = []
-                    formulas = []
-                    cell_refs = []
-                    row_has_data = False
-                    row_has_formula = False
-                    
-                    for col in range(min_col, max_col + 1):
-                        # Get both formula and value versions
-                        cell_formula = ws_formulas.cell(row, col)
-                        cell_value = ws_values.cell(row, col)
-                        cell_ref = f"{get_column_letter(col)}{row}"
-                        cell_refs.append(cell_ref)
-                        
-                        # Check if cell has formula
-                        has_formula = cell_formula.data_type == 'f' if hasattr(cell_formula, 'data_type') else False
-                        formula = cell_formula.value if has_formula else None
-                        
-                        # Get calculated value
-                        value = cell_value.value
-                        
-                        # Convert datetime objects to ISO format for JSON serialization
-                        if isinstance(value, datetime):
-                            value = value.isoformat()
-                        
-                        # If openpyxl couldn't calculate the formula value, try with formulas library
-                        if has_formula and (value is None) and has_formula_engine and formula:
-                            try:
-                                # Try to evaluate the formula using all collected context values
-                                eval_result = evaluate_excel_formula(formula, all_values)
-                                if eval_result.get("success", False):
-                                    value = eval_result["value"]
-                                    
-                                    # If value is numpy array or other complex type, convert to Python native type
-                                    try:
-                                        import numpy as np
-                                        if isinstance(value, np.ndarray):
-                                            value = value.item()
-                                    except (ImportError, AttributeError, Exception):
-                                        try:
-                                            value = float(value)
-                                        except (TypeError, ValueError):
-                                            try:
-                                                value = str(value)
-                                            except Exception:
-                                                value = None
-                            except Exception as e:
-                                logger.warning(f"Error evaluating formula in {cell_ref}: {str(e)}")
-                        
-                        # Store formula info for cells with formulas
-                        if has_formula:
-                            # Try to manually calculate simple formulas like D*E or F*0.25
-                            if formula and formula.startswith("="):
-                                # First check for simple multiplication with a constant
-                                if "*" in formula and formula.count("*") == 1 and any(c.isdigit() for c in formula):
-                                    try:
-                                        # Extract the parts of the formula
-                                        parts = formula[1:].split("*")
-                                        
-                                        # Check if one part is a cell reference and the other is a number
-                                        cell_ref_part = None
-                                        number_part = None
-                                        
-                                        for part in parts:
-                                            part = part.strip()
-                                            # Check if part looks like a cell reference
-                                            if any(c.isalpha() for c in part) and any(c.isdigit() for c in part):
-                                                cell_ref_part = part
-                                            # Check if part is a number
-                                            elif part.replace('.', '', 1).isdigit():
-                                                number_part = part
-                                                
-                                        # If we have both parts, get the cell value and calculate
-                                        if cell_ref_part and number_part:
-                                            cell_value = all_values.get(cell_ref_part)
-                                            
-                                            if cell_value is not None:
-                                                try:
-                                                    cell_value = float(cell_value)
-                                                    number_value = float(number_part)
-                                                    manually_calculated = cell_value * number_value
-                                                    value = manually_calculated
-                                                except (ValueError, TypeError):
-                                                    pass
-                                        # Otherwise try the D*E pattern for two cell references
-                                        elif "*" in formula and formula.count("*") == 1:
-                                            # Try the cell reference pattern like D2*E2
-                                            cell_refs_in_formula = formula[1:].split("*")
-                                            if len(cell_refs_in_formula) == 2:
-                                                ref1, ref2 = cell_refs_in_formula
-                                                
-                                                # Get values directly - handle both D*E pattern and D2*E2 pattern
-                                                cell1_val = None
-                                                cell2_val = None
-                                                
-                                                # For D2*E2 pattern, extract row and column
-                                                if any(c.isdigit() for c in ref1) and any(c.isdigit() for c in ref2):
-                                                    # First get values from our context
-                                                    cell1_val = all_values.get(ref1)
-                                                    cell2_val = all_values.get(ref2)
-                                                else:
-                                                    # For D*E pattern in the current row, look up values
-                                                    # Extract column letter from each reference
-                                                    col1_letter = ''.join(c for c in ref1 if c.isalpha())
-                                                    col2_letter = ''.join(c for c in ref2 if c.isalpha())
-                                                    
-                                                    # Get cell references for current row
-                                                    new_ref1 = f"{col1_letter}{row}"
-                                                    new_ref2 = f"{col2_letter}{row}"
-                                                    
-                                                    # Get values
-                                                    cell1_val = all_values.get(new_ref1)
-                                                    cell2_val = all_values.get(new_ref2)
-                                                
-                                                # Calculate if we have both values
-                                                if cell1_val is not None and cell2_val is not None:
-                                                    try:
-                                                        cell1_val = float(cell1_val)
-                                                        cell2_val = float(cell2_val)
-                                                        manually_calculated = cell1_val * cell2_val
-                                                        value = manually_calculated
-                                                    except (ValueError, TypeError):
-                                                        pass
-                                    except Exception as calc_error:
-                                        logger.warning(f"Error calculating formula: {calc_error}")
-                            
-                            formula_cells.append({
-                                "cell": cell_ref,
-                                "formula": formula,
-                                "calculated_value": value
-                            })
-                            row_has_formula = True
-                        
-                        # Append value to the row data
-                        values.append(value)
-                        formulas.append(formula)
-                        
-                        if value is not None and value != "" or has_formula:
-                            row_has_data = True
-                    
-                    if row_has_data:
-                        record = {
-                            "row": row,
-                            "values": values,
-                            "cell_refs": cell_refs,
-                        }
-                        
-                        # Only include formulas when they exist
-                        if row_has_formula:
-                            record["formulas"] = formulas
-                            
-                        records.append(record)
+                records, formula_cells = _formula_records(
+                    filepath, ws_name, range_cells, all_values, col_letters,
+                    min_row, max_row, min_col, max_col, include_cell_refs
+                )
                 
                 # Count charts and images
-                chart_count = len([drawing for drawing in ws_values._charts])
-                image_count = len([drawing for drawing in ws_values._images])
+                chart_count, image_count = count_sheet_drawings(ws_formulas)
                 
                 # Prepare sheet data
                 sheet_data = {
                     "sheet_name": sheet_name,
-                    "dimensions": cell_range or ws_formulas.calculate_dimension(),
+                    "dimensions": cell_range or sheet_info["dimensions"],
                     "non_empty_cells": len(records),
                     "charts": chart_count,
                     "images": image_count,
                     "columns": columns,
-                    "column_refs": [get_column_letter(col) for col in range(min_col, max_col + 1)],
+                    "column_refs": col_letters[min_col:max_col + 1],
                     "records": records,
                     "has_formulas": len(formula_cells) > 0,
                     "formula_cells": formula_cells
@@ -2947,7 +3776,6 @@ def read_excel_with_formulas(filepath: str, sheet_name: str = None, cell_range:
             
         # Clean up
         workbook_formulas.close()
-        workbook_values.close()
         
         return file_info
         
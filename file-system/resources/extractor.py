@@ -1,15 +1,68 @@
 """File content extraction module."""
 import os
-import json
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Any, Dict
 
-from .readers import (
-    read_text_file, read_pdf_file, read_docx_file, read_xlsx_file,
-    read_pptx_file, read_csv_file, read_epub_file, read_rtf_file
-)
+from . import readers
+from .readers import read_text_file
 from .utils.formatters import summarize_content
 
-def extract_file_content(file_path: str, sheet_name: str = None, cell_range: str = None) -> Dict[str, Any]:
+# Parsed Excel files are kept for this many recently read files, and only for files up
+# to this size, since their values take several times the file size in memory
+_XLSX_CACHE_SIZE = 4
+_XLSX_CACHE_MAX_FILE_SIZE = 5_000_000
+
+# Parsed Excel files by path, each with the modification time and size it was read at
+_xlsx_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+def _read_xlsx(file_path: str, sheet_name: str = None, cell_range: str = None) -> Dict[str, Any]:
+    """Read an Excel file, reusing its parsed sheets while the file is unchanged.
+    
+    Reads of another range of an already read sheet slice its stored values.
+    Errors are not cached.
+    """
+    stat = os.stat(file_path)
+    if stat.st_size > _XLSX_CACHE_MAX_FILE_SIZE:
+        return readers.read_xlsx_file(file_path, sheet_name=sheet_name, cell_range=cell_range)
+    
+    # The modification time in nanoseconds together with the size tells a rewritten file apart
+    path = os.path.abspath(file_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    entry = _xlsx_cache.pop(path, None)
+    if entry is not None and entry[0] == stamp:
+        parsed = entry[1]
+    else:
+        try:
+            parsed = readers.ParsedXlsxFile(file_path)
+        except Exception:
+            # read_xlsx_file reports the error
+            return readers.read_xlsx_file(file_path, sheet_name=sheet_name, cell_range=cell_range)
+    _xlsx_cache[path] = (stamp, parsed)
+    while len(_xlsx_cache) > _XLSX_CACHE_SIZE:
+        _xlsx_cache.popitem(last=False)
+    return parsed.read(sheet_name, cell_range)
+
+# Extensions read as plain text
+_TEXT_EXTENSIONS = frozenset([
+    '.txt', '.md', '.json', '.html', '.xml', '.log', '.py', '.js', '.css', '.java', '.ini', '.conf', '.cfg'
+])
+
+# Reader for each other supported extension, except Excel files which take sheet options.
+# Readers are named rather than imported so their modules load on first use
+_READERS: Dict[str, str] = {
+    '.pdf': 'read_pdf_file',
+    '.docx': 'read_docx_file',
+    '.pptx': 'read_pptx_file',
+    '.csv': 'read_csv_file',
+    '.epub': 'read_epub_file',
+    '.rtf': 'read_rtf_file',
+}
+
+# Extensions whose document properties can be read without loading the document
+_OFFICE_EXTENSIONS = frozenset(['.docx', '.xlsx', '.pptx'])
+
+def extract_file_content(file_path: str, sheet_name: str = None, cell_range: str = None,
+                         metadata_only: bool = False) -> Dict[str, Any]:
     """Extract content from a file based on its extension."""
     if not os.path.exists(file_path):
         return {"success": False, "error": f"File not found: {file_path}", "content": ""}
@@ -19,27 +72,14 @@ def extract_file_content(file_path: str, sheet_name: str = None, cell_range: str
     
     try:
         # Handle different file types
-        if file_extension in ['.txt', '.md', '.json', '.html', '.xml', '.log', '.py', '.js', '.css', '.java', '.ini', '.conf', '.cfg']:
+        if metadata_only and file_extension in _OFFICE_EXTENSIONS:
+            content = readers.read_office_properties(file_path)
+        elif file_extension in _TEXT_EXTENSIONS:
             content = read_text_file(file_path)
-        elif file_extension == '.pdf':
-            content = read_pdf_file(file_path)
-        elif file_extension == '.docx':
-            content = read_docx_file(file_path)
         elif file_extension == '.xlsx':
-            content = read_xlsx_file(file_path, sheet_name=sheet_name, cell_range=cell_range)
-            # Parse JSON string back to dict for consistent return
-            try:
-                content = json.loads(content)
-            except json.JSONDecodeError:
-                return {"success": False, "error": "Failed to parse Excel file output", "content": content}
-        elif file_extension == '.pptx':
-            content = read_pptx_file(file_path)
-        elif file_extension == '.csv':
-            content = read_csv_file(file_path)
-        elif file_extension == '.epub':
-            content = read_epub_file(file_path)
-        elif file_extension == '.rtf':
-            content = read_rtf_file(file_path)
+            content = _read_xlsx(file_path, sheet_name=sheet_name, cell_range=cell_range)
+        elif file_extension in _READERS:
+            content = getattr(readers, _READERS[file_extension])(file_path)
         else:
             # Try to read as text file first, then fall back to binary warning
             try:
@@ -57,7 +97,7 @@ def extract_file_content(file_path: str, sheet_name: str = None, cell_range: str
         return {"success": False, "error": str(e), "content": ""}
 
 def read_file(path: str, summarize: bool = False, max_summary_length: int = 500,
-              sheet_name: str = None, cell_range: str = None) -> Dict[str, Any]:
+              sheet_name: str = None, cell_range: str = None, metadata_only: bool = False) -> Dict[str, Any]:
     """
     Reads and returns the contents of the file at 'path' with appropriate handling per file type.
     
@@ -67,6 +107,7 @@ def read_file(path: str, summarize: bool = False, max_summary_length: int = 500,
         max_summary_length (int): Maximum length for summary if summarizing
         sheet_name (str, optional): For Excel files, specific sheet to read
         cell_range (str, optional): For Excel files, cell range to read (e.g. 'A1:D10')
+        metadata_only (bool): For Office files, read only the document properties
         
     Returns:
         Dict with keys:
@@ -76,7 +117,7 @@ def read_file(path: str, summarize: bool = False, max_summary_length: int = 500,
         - file_type (str): File extension
         - error (str, optional): Error message if success is False
     """
-    result = extract_file_content(path, sheet_name=sheet_name, cell_range=cell_range)
+    result = extract_file_content(path, sheet_name=sheet_name, cell_range=cell_range, metadata_only=metadata_only)
     
     # Handle summarization for text content only (not for JSON/dict content from Excel)
     if summarize and result["success"] and isinstance(result["content"], str) and len(result["content"]) > max_summary_length:
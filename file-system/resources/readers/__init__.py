@@ -1,19 +1,51 @@
-"""File readers for different file formats."""
+"""File readers for different file formats.
+
+The reader modules import heavy optional libraries, so each module is only
+imported when one of its names is first used.
+"""
+import importlib
 
-# Import dependencies check variables
 from .text_reader import read_text_file
-from .pdf_reader import read_pdf_file, has_pymupdf, has_tabula, has_pdfplumber
-from .office_readers import read_docx_file, read_xlsx_file, read_pptx_file, has_pil
-from .data_readers import read_csv_file
-from .ebook_readers import read_epub_file, has_epub_support
-from .format_readers import read_rtf_file, has_rtf_support
+
+# Module defining each lazily imported name, including the dependency check variables
+_LAZY_EXPORTS = {
+    'read_pdf_file': '.pdf_reader',
+    'has_pymupdf': '.pdf_reader',
+    'has_tabula': '.pdf_reader',
+    'has_pdfplumber': '.pdf_reader',
+    'read_docx_file': '.office_readers',
+    'read_xlsx_file': '.office_readers',
+    'ParsedXlsxFile': '.office_readers',
+    'read_pptx_file': '.office_readers',
+    'read_office_properties': '.office_readers',
+    'has_pil': '.office_readers',
+    'read_csv_file': '.data_readers',
+    'read_epub_file': '.ebook_readers',
+    'has_epub_support': '.ebook_readers',
+    'read_rtf_file': '.format_readers',
+    'has_rtf_support': '.format_readers',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Later lookups find the name directly
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
 __all__ = [
     'read_text_file',
     'read_pdf_file',
     'read_docx_file',
     'read_xlsx_file',
+    'ParsedXlsxFile',
     'read_pptx_file',
+    'read_office_properties',
     'read_csv_file',
     'read_epub_file',
     'read_rtf_file',
@@ -23,4 +55,4 @@ __all__ = [
     'has_pil',
     'has_epub_support',
     'has_rtf_support',
-] 
\ No newline at end of file
+]
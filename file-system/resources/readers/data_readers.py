@@ -1,111 +1,190 @@
 """Data file readers module for CSV and other data formats."""
+import codecs
 import csv
+import io
 import os
+import re
+from itertools import islice, zip_longest
+from typing import Optional
+
+import numpy as np
+
+# Shared dialect and header detector
+_SNIFFER = csv.Sniffer()
+
+# Buffer size for streaming CSV files, larger than the 8 KiB default to need fewer reads
+_READ_BUFFER_SIZE = 1 << 20
+
+# Delimiters tried when the sniffer cannot detect the dialect
+_DELIMITER_CANDIDATES = [',', ';', '\t', '|']
+
+# Values the column analysis counts as numeric, the same ones pandas.to_numeric parses
+# to a number (so not empty or "nan" values)
+_NUMERIC_VALUE = re.compile(
+    r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|[+-]?inf(?:inity)?",
+    re.IGNORECASE | re.ASCII
+)
+
+
+# Number of bytes at the start of a file its encoding is detected from
+_ENCODING_SAMPLE_SIZE = 1 << 16
+
+def _detect_encoding(file_path: str) -> str:
+    """Detect the encoding of a CSV file from its first bytes.
+    
+    The first of UTF-8 (with or without a byte order mark) and Windows-1252 that
+    decodes them is used, and Latin-1, which decodes any bytes, otherwise.
+    """
+    with open(file_path, 'rb') as file:
+        head = file.read(_ENCODING_SAMPLE_SIZE)
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # A character cut off at the end of the sample is not an error
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    try:
+        head.decode('windows-1252')
+        return 'windows-1252'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+def _guess_delimiter(sample: str) -> Optional[str]:
+    """Pick the candidate delimiter whose count varies least across the lines of a sample.
+    
+    Only complete, non-blank lines are scored, and ties go to the delimiter found
+    more often per line. Returns None if no candidate appears in the sample.
+    """
+    data = np.frombuffer(sample.encode('utf-8', errors='replace'), dtype=np.uint8)
+    # The sample may end in the middle of a line, which would skew its counts
+    newlines = np.flatnonzero(data == ord('\n'))
+    if len(newlines):
+        data = data[:newlines[-1]]
+    if not len(data):
+        return None
+    
+    byte_counts = np.bincount(data, minlength=256)
+    line_ids = np.cumsum(data == ord('\n'))
+    line_count = int(line_ids[-1]) + 1
+    is_content = (data != ord('\n')) & (data != ord('\r'))
+    non_blank = np.bincount(line_ids[is_content], minlength=line_count) > 0
+    
+    best_delimiter = None
+    best_score = None
+    for delimiter in _DELIMITER_CANDIDATES:
+        if not byte_counts[ord(delimiter)]:
+            continue
+        per_line = np.bincount(line_ids[data == ord(delimiter)], minlength=line_count)[non_blank]
+        score = (per_line.var(), -per_line.mean())
+        if best_score is None or score < best_score:
+            best_delimiter = delimiter
+            best_score = score
+    return best_delimiter
+
 
 def read_csv_file(file_path: str) -> str:
     """Read CSV files with enhanced delimiter detection and rich formatting."""
     try:
-        # Try multiple encodings
-        encodings = ['utf-8-sig', 'utf-8', 'latin-1', 'windows-1252']
+        # Detect the encoding once, reading as Latin-1 if a later part of the file does not decode
+        encodings = [_detect_encoding(file_path), 'latin-1']
         
         for encoding in encodings:
             try:
                 # Try to detect delimiter and file structure
-                with open(file_path, 'r', newline='', encoding=encoding) as csvfile:
+                with open(file_path, 'r', newline='', encoding=encoding, buffering=_READ_BUFFER_SIZE) as csvfile:
                     # Read a sample to analyze
                     sample = csvfile.read(8192)  # Read larger sample for better detection
                     csvfile.seek(0)  # Reset to beginning of file
                     
-                    # Analyze file structure
-                    result = []
-                    result.append(f"--- CSV File Analysis: {os.path.basename(file_path)} ---")
+                    # Analyze file structure; the output is written as it is produced,
+                    # each line after the first starting with its line break
+                    out = io.StringIO()
+                    out.write(f"--- CSV File Analysis: {os.path.basename(file_path)} ---")
                     
-                    # Count lines in the file
+                    # Count lines in the sample, scaled by the file size if the sample is not the whole file
                     line_count = sample.count('\n')
-                    if csvfile.read() != '':  # If there's more content after the sample
-                        line_count = line_count + 1 + '...'
-                    csvfile.seek(0)  # Reset again
+                    file_size = os.path.getsize(file_path)
+                    sample_size = len(sample.encode(encoding))
+                    if file_size > sample_size:
+                        line_count = f"~{int(line_count * file_size / sample_size)}"
                     
-                    result.append(f"Estimated number of rows: {line_count if isinstance(line_count, int) else '1000+'}")
+                    out.write(f"\nEstimated number of rows: {line_count}")
                     
                     # Try to detect the dialect
                     try:
-                        dialect = csv.Sniffer().sniff(sample)
+                        dialect = _SNIFFER.sniff(sample)
                         delimiter = dialect.delimiter
-                        result.append(f"Detected delimiter: '{delimiter}'")
-                        result.append(f"Quote character: '{dialect.quotechar}'")
+                        out.write(f"\nDetected delimiter: '{delimiter}'")
+                        out.write(f"\nQuote character: '{dialect.quotechar}'")
                         
                         # Check if file has a header
-                        has_header = csv.Sniffer().has_header(sample)
-                        result.append(f"Has header row: {has_header}")
+                        has_header = _SNIFFER.has_header(sample)
+                        out.write(f"\nHas header row: {has_header}")
                     except:
-                        # If sniffing fails, try common delimiters
-                        for delimiter in [',', ';', '\t', '|']:
-                            if delimiter in sample:
-                                result.append(f"Using delimiter: '{delimiter}'")
-                                break
+                        # If sniffing fails, use the common delimiter with the most regular count per line
+                        delimiter = _guess_delimiter(sample)
+                        if delimiter is not None:
+                            out.write(f"\nUsing delimiter: '{delimiter}'")
+                        else:
+                            delimiter = ','
                         has_header = True  # Assume header by default
                     
                     # Add separator
-                    result.append("-" * 40)
+                    out.write("\n" + "-" * 40)
                     
                     # Read and format CSV data
                     reader = csv.reader(csvfile, delimiter=delimiter)
-                    rows = []
                     
                     # Read header if present
                     header = next(reader) if has_header else None
                     if header:
-                        result.append(f"Column count: {len(header)}")
-                        result.append(f"Headers: {', '.join(header)}")
-                        result.append("-" * 40)
-                        rows.append("\t".join(header))
+                        out.write(f"\nColumn count: {len(header)}")
+                        out.write(f"\nHeaders: {', '.join(header)}")
+                        out.write("\n" + "-" * 40)
                     
-                    # Process data rows
-                    row_count = 0
+                    # Process data rows, kept for the column analysis that precedes them
                     max_rows = 2000  # Reasonable limit for large files
-                    column_stats = {}  # Track stats about each column
-                    
-                    for row in reader:
-                        rows.append("\t".join(row))
-                        
-                        # Gather column statistics
-                        for i, value in enumerate(row):
-                            if i not in column_stats:
-                                column_stats[i] = {'numeric': 0, 'empty': 0, 'total': 0}
-                            
-                            column_stats[i]['total'] += 1
-                            if not value.strip():
-                                column_stats[i]['empty'] += 1
-                            elif value.strip().replace('.', '', 1).replace('-', '', 1).isdigit():
-                                column_stats[i]['numeric'] += 1
-                        
-                        row_count += 1
-                        if row_count >= max_rows:
-                            rows.append("... (truncated due to large size)")
-                            break
+                    data_rows = list(islice(reader, max_rows))
+                    row_count = len(data_rows)
                     
                     # Add column analysis if we have enough data
                     if row_count > 10 and header:
-                        result.append("\nColumn Analysis:")
+                        out.write("\n\nColumn Analysis:")
+                        # Short rows are padded with None, which is left out of the counts
+                        totals = []
+                        empty_counts = []
+                        numeric_counts = []
+                        for column in zip_longest(*data_rows):
+                            values = [value.strip() for value in column if value is not None]
+                            totals.append(len(values))
+                            empty_counts.append(values.count(""))
+                            numeric_counts.append(sum(1 for _ in filter(_NUMERIC_VALUE.fullmatch, values)))
+                        
                         for i, col_name in enumerate(header):
-                            if i in column_stats and column_stats[i]['total'] > 0:
-                                stats = column_stats[i]
-                                pct_numeric = (stats['numeric'] / stats['total']) * 100
-                                pct_empty = (stats['empty'] / stats['total']) * 100
+                            if i < len(totals) and totals[i] > 0:
+                                pct_numeric = (numeric_counts[i] / totals[i]) * 100
+                                pct_empty = (empty_counts[i] / totals[i]) * 100
                                 
                                 col_type = 'Numeric' if pct_numeric > 90 else 'Text'
                                 if pct_empty > 50:
                                     col_type += " (Sparse)"
                                 
-                                result.append(f"  {col_name}: {col_type}")
+                                out.write(f"\n  {col_name}: {col_type}")
                         
-                        result.append("-" * 40)
+                        out.write("\n" + "-" * 40)
                     
                     # Add the actual data
-                    result.extend(rows)
+                    if header:
+                        out.write("\n" + "\t".join(header))
+                    for row in data_rows:
+                        out.write("\n")
+                        out.write("\t".join(row))
+                    if row_count >= max_rows:
+                        out.write("\n... (truncated due to large size)")
                     
-                    return "\n".join(result)
+                    return out.getvalue()
             except UnicodeDecodeError:
                 continue  # Try next encoding
         
@@ -4,16 +4,55 @@
 try:
     import ebooklib
     from ebooklib import epub
-    from bs4 import BeautifulSoup
+    from lxml import etree
+    from lxml import html as lxml_html
     has_epub_support = True
 except ImportError:
     has_epub_support = False
-    print("EPUB support not available. To read EPUB files: pip install ebooklib beautifulsoup4")
+    print("EPUB support not available. To read EPUB files: pip install ebooklib")
+
+def _clean_whitespace(text: str) -> str:
+    """Put each line or double-space separated phrase of a text on its own stripped line.
+    
+    Lines are joined with a double space so the text is split into phrases in one
+    call, and the phrases are stripped and filtered without per-phrase Python code.
+    """
+    return '\n'.join(filter(None, map(str.strip, "  ".join(text.splitlines()).split("  "))))
+
+# EPUB content documents are UTF-8, and without an XML declaration or charset meta tag
+# lxml's HTML parser would read them as Latin-1. The encoding is set on the parser, as
+# lxml rejects strings that carry an encoding declaration
+_CHAPTER_PARSER = lxml_html.HTMLParser(encoding='utf-8') if has_epub_support else None
+
+def _chapter_to_text(html_content: bytes) -> str:
+    """Extract the title and text of an EPUB HTML document."""
+    # lxml rejects documents without any markup, which hold no text anyway
+    if not html_content.strip():
+        return ""
+    try:
+        tree = lxml_html.fromstring(html_content, parser=_CHAPTER_PARSER)
+        
+        # Extract title if available
+        title = tree.find('.//title')
+        title_text = f"Chapter: {title.text_content()}\n" if title is not None else ""
+        
+        # Remove script and style elements, keeping the text that follows them
+        etree.strip_elements(tree, "script", "style", with_tail=False)
+        
+        # Get text
+        text = "\n".join(tree.itertext())
+        
+        # Clean whitespace
+        text = _clean_whitespace(text)
+        
+        return title_text + text
+    except Exception as e:
+        return f"[Error processing HTML content: {str(e)}]"
 
 def read_epub_file(file_path: str) -> str:
     """Extract content from EPUB e-books."""
     if not has_epub_support:
-        return "EPUB support not available. Install required packages with: pip install ebooklib beautifulsoup4"
+        return "EPUB support not available. Install required packages with: pip install ebooklib"
     
     try:
         content = []
@@ -95,38 +134,16 @@ def read_epub_file(file_path: str) -> str:
         # Extract text content from HTML documents
         content.append("--- Content ---")
         
-        # Helper function to extract text from HTML
-        def chapter_to_text(html_content):
-            try:
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                # Extract title if available
-                title = soup.find('title')
-                title_text = f"Chapter: {title.text}\n" if title else ""
-                
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.extract()
-                
-                # Get text
-                text = soup.get_text(separator='\n')
-                
-                # Clean whitespace
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = '\n'.join(chunk for chunk in chunks if chunk)
-                
-                return title_text + text
-            except Exception as e:
-                return f"[Error processing HTML content: {str(e)}]"
-        
         # Process spine documents in order
         processed_items = set()
+        # Items by id, built once rather than searching book.items for each spine entry;
+        # built in reverse so that, like get_item_with_id, the first item with an id wins
+        items_by_id = {item.id: item for item in reversed(book.items)}
         for item_id in book.spine:
-            item = book.get_item_with_id(item_id[0] if isinstance(item_id, tuple) else item_id)
+            item = items_by_id.get(item_id[0] if isinstance(item_id, tuple) else item_id)
             if item and item.get_content() and item.media_type == 'application/xhtml+xml':
                 processed_items.add(item.id)
-                chapter_text = chapter_to_text(item.get_content().decode('utf-8'))
+                chapter_text = _chapter_to_text(item.get_content())
                 if chapter_text:
                     content.append(f"--- Document: {item.get_name()} ---")
                     content.append(chapter_text)
@@ -137,7 +154,7 @@ def read_epub_file(file_path: str) -> str:
             if (item.id not in processed_items and 
                 item.media_type == 'application/xhtml+xml' and 
                 not item.get_name().startswith('nav')):  # Skip navigation files
-                chapter_text = chapter_to_text(item.get_content().decode('utf-8'))
+                chapter_text = _chapter_to_text(item.get_content())
                 if chapter_text:
                     content.append(f"--- Additional Document: {item.get_name()} ---")
                     content.append(chapter_text)
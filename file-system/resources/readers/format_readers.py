@@ -1,5 +1,8 @@
 """Format readers module for RTF and other specialized formats."""
 import os
+import shutil
+import subprocess
+from typing import Optional
 
 # For RTF documents
 try:
@@ -9,23 +12,57 @@ except ImportError:
     has_rtf_support = False
     print("RTF support not available. To read RTF files: pip install striprtf")
 
+# The unrtf command line tool converts large RTF files much faster than striprtf, which
+# parses in pure Python, so it is used for files from this size up when it is installed
+_UNRTF_PATH = shutil.which('unrtf')
+_UNRTF_MIN_SIZE = 1 << 20
+_UNRTF_TIMEOUT = 30
+
+def _unrtf_to_text(file_path: str) -> Optional[str]:
+    """Convert an RTF file to plain text with unrtf, returning None if it fails"""
+    try:
+        result = subprocess.run(
+            [_UNRTF_PATH, '--text', '--nopict', file_path],
+            capture_output=True, timeout=_UNRTF_TIMEOUT, check=False
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    
+    # Text output starts with "###" comment lines and a line of dashes before the document text
+    lines = result.stdout.decode('utf-8', 'ignore').splitlines()
+    start = 0
+    while start < len(lines) and lines[start].startswith('###'):
+        start += 1
+    if start < len(lines) and lines[start] and not lines[start].strip('-'):
+        start += 1
+    return "\n".join(lines[start:])
+
 def read_rtf_file(file_path: str) -> str:
     """Extract text content from RTF files."""
     if not has_rtf_support:
         return "RTF support not available. Install required package with: pip install striprtf"
     
     try:
-        # Read RTF content
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-            rtf_text = file.read()
+        file_size = os.path.getsize(file_path)
+        
+        plain_text = None
+        if _UNRTF_PATH and file_size >= _UNRTF_MIN_SIZE:
+            plain_text = _unrtf_to_text(file_path)
         
-        # Convert RTF to plain text
-        plain_text = striprtf.rtf_to_text(rtf_text)
+        if plain_text is None:
+            # Read RTF content
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
+                rtf_text = file.read()
+            
+            # Convert RTF to plain text
+            plain_text = striprtf.rtf_to_text(rtf_text)
         
         # Format output
         content = []
         content.append(f"--- RTF Document: {os.path.basename(file_path)} ---")
-        content.append(f"Size: {os.path.getsize(file_path) / 1024:.2f} KB")
+        content.append(f"Size: {file_size / 1024:.2f} KB")
         content.append("-" * 40)
         content.append(plain_text)
         
@@ -1,118 +1,218 @@
 """Office document reader module for Word, Excel and PowerPoint files."""
 import os
-import json
-from datetime import datetime
-from typing import Dict, Any, List, Optional, Union
+import re
+import zipfile
+from functools import lru_cache
+from importlib.util import find_spec
+import xml.etree.ElementTree as ET
+from datetime import date, datetime
+from itertools import islice, zip_longest
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 
-# For image detection and properties
-try:
-    from PIL import Image
-    has_pil = True
-except ImportError:
+from ..utils.sheet_utils import EMPTY_VALUES, count_sheet_drawings, first_row_values, sheet_dimension
+
+# For image detection and properties, imported when a document has images
+has_pil = find_spec("PIL") is not None
+if not has_pil:
     print("Pillow not installed. For better image analysis: pip install Pillow")
-    has_pil = False
 
-# For Microsoft Office documents
-try:
-    import docx  # for .docx files
-    from docx.oxml.ns import qn  # for accessing embedded objects
-    from docx.oxml import OxmlElement
-except ImportError:
-    print("python-docx not installed. To read Word files: pip install python-docx")
+# openpyxl is already loaded by excel_tools
+import openpyxl  # for .xlsx files
+from openpyxl.cell.text import Text
+from openpyxl.reader.excel import ExcelReader
+from openpyxl.utils import get_column_letter
+from openpyxl.xml.constants import SHARED_STRINGS, SHEET_MAIN_NS
+from openpyxl.xml.functions import iterparse
 
+# Optional faster reader for .xlsx cell values
 try:
-    import openpyxl  # for .xlsx files
-    from openpyxl.drawing.image import Image as XlsxImage
-    from openpyxl.utils import get_column_letter
+    from python_calamine import CalamineWorkbook
+    has_calamine = True
 except ImportError:
-    print("openpyxl not installed. To read Excel files: pip install openpyxl")
+    has_calamine = False
 
-try:
-    from pptx import Presentation  # for .pptx files
-    from pptx.enum.shapes import MSO_SHAPE_TYPE
-except ImportError:
-    print("python-pptx not installed. To read PowerPoint files: pip install python-pptx")
+# python-docx and python-pptx are slow to import, so each is only
+# imported by the first read of its file type
+@lru_cache(maxsize=None)
+def _import_docx() -> Any:
+    """Import python-docx, returning None if it is not installed"""
+    try:
+        import docx  # for .docx files
+    except ImportError:
+        print("python-docx not installed. To read Word files: pip install python-docx")
+        return None
+    return docx
+
+@lru_cache(maxsize=None)
+def _import_pptx() -> Any:
+    """Import python-pptx, returning None if it is not installed"""
+    try:
+        import pptx  # for .pptx files
+        import pptx.enum.shapes
+    except ImportError:
+        print("python-pptx not installed. To read PowerPoint files: pip install python-pptx")
+        return None
+    return pptx
+
+def _table_column_widths(table_data: List[List[str]]) -> List[int]:
+    """Get the width of each column of a table, as the longest line in any of its cells"""
+    # Joining a column's cells splits all of their lines in one call instead of one per cell
+    return [
+        max(map(len, "\n".join(column).split("\n")))
+        for column in zip_longest(*table_data, fillvalue="")
+    ]
+
+# Widest a rendered table column is padded to
+_MAX_COLUMN_WIDTH = 30
+
+def _format_table_row(cells: List[str], widths: List[int]) -> str:
+    """Format one line of a rendered table, padding each cell to its column width"""
+    return "| " + " | ".join(map(str.ljust, cells, widths)) + " |"
+
+# Core properties listed by each reader, in the order they are shown
+_DOCX_CORE_PROPERTIES = ('title', 'author', 'created', 'modified', 'comments', 'category', 'subject', 'keywords')
+_PPTX_CORE_PROPERTIES = ('title', 'author', 'subject', 'keywords', 'created', 'modified')
+
+def _append_core_properties(full_text: List[str], core_props: Any, names: tuple) -> None:
+    """Append a "Name: value" line for each named core property that is set"""
+    for name in names:
+        # Each property is parsed from the properties XML when read, so it is only read once
+        value = getattr(core_props, name, None)
+        if value:
+            full_text.append(f"{name.capitalize()}: {value}")
+
+# Namespace of the WordprocessingML elements read from a document body
+_WORD_NAMESPACES = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+
+# Run content python-docx reads as a paragraph's text, in document order: the
+# text, tab and break children of the paragraph's runs, including hyperlink runs
+_PARAGRAPH_TEXT_XPATH = (
+    "(w:r | w:hyperlink/w:r)/*[self::w:t or self::w:tab or self::w:br or self::w:cr"
+    " or self::w:noBreakHyphen or self::w:ptab]"
+)
+
+# Elements that embed an image or other object in a run
+_EMBEDDED_OBJECT_TAGS = tuple('{%s}%s' % (_WORD_NAMESPACES['w'], name) for name in ('drawing', 'pict'))
+
+def _has_embedded_object(element: Any) -> bool:
+    """Check whether an element contains a drawing or picture, stopping at the first one"""
+    return next(element.iter(*_EMBEDDED_OBJECT_TAGS), None) is not None
+
+@lru_cache(maxsize=None)
+def _word_xpath(expression: str) -> Any:
+    """Compile an XPath over WordprocessingML elements, once for each expression"""
+    from lxml import etree
+    # Text results are returned as plain strings, without a link back to their element
+    return etree.XPath(expression, namespaces=_WORD_NAMESPACES, smart_strings=False)
 
 # Function definitions will go here (added in separate edit)
-def read_docx_file(file_path: str) -> str:
-    """Extract text and identify objects from Microsoft Word (.docx) files in sequential order."""
+def read_docx_file(file_path: str, include_objects: bool = True) -> str:
+    """Extract text and identify objects from Microsoft Word (.docx) files in sequential order.
+    
+    Args:
+        file_path: Path to the Word file
+        include_objects: Whether to report images, drawings and other embedded objects. If
+            False, only the properties, statistics and text are read
+        
+    Returns:
+        The document's text, with its tables in place
+    """
+    docx = _import_docx()
+    if docx is None:
+        return "Error reading DOCX file: python-docx is not installed"
+    from docx.text.paragraph import Paragraph
+    
+    # XPaths used for every paragraph, run and drawing
+    paragraph_text_path = _word_xpath(_PARAGRAPH_TEXT_XPATH)
+    find_drawings = _word_xpath(".//w:drawing")
+    # The non-empty text of a drawing's text elements, selected as strings by libxml2
+    find_texts = _word_xpath(".//w:t/text()")
+    
     try:
         doc = docx.Document(file_path)
         full_text = []
         
+        # Paragraph text is read straight from the XML, with one compiled XPath per paragraph
+        # instead of python-docx's per-run text properties
+        def paragraph_text(p_element) -> str:
+            # Each run content element converts to its text equivalent, e.g. w:tab to a tab
+            return "".join(map(str, paragraph_text_path(p_element)))
+        
+        body = doc.element.body
+        
+        # Paragraphs and tables are the body's children, so their positions in the body,
+        # which order the content below, come from one pass over it
+        paragraph_tag = '{%s}p' % _WORD_NAMESPACES['w']
+        table_tag = '{%s}tbl' % _WORD_NAMESPACES['w']
+        paragraph_elements = []
+        paragraph_positions = []
+        table_positions = []
+        for position, child in enumerate(body.iterchildren()):
+            if child.tag == paragraph_tag:
+                paragraph_elements.append(child)
+                paragraph_positions.append(position)
+            elif child.tag == table_tag:
+                table_positions.append(position)
+        
         # Document properties first
         try:
             full_text.append("--- Document Properties ---")
-            core_props = doc.core_properties
-            if hasattr(core_props, 'title') and core_props.title:
-                full_text.append(f"Title: {core_props.title}")
-            if hasattr(core_props, 'author') and core_props.author:
-                full_text.append(f"Author: {core_props.author}")
-            if hasattr(core_props, 'created') and core_props.created:
-                full_text.append(f"Created: {core_props.created}")
-            if hasattr(core_props, 'modified') and core_props.modified:
-                full_text.append(f"Modified: {core_props.modified}")
-            if hasattr(core_props, 'comments') and core_props.comments:
-                full_text.append(f"Comments: {core_props.comments}")
-            if hasattr(core_props, 'category') and core_props.category:
-                full_text.append(f"Category: {core_props.category}")
-            if hasattr(core_props, 'subject') and core_props.subject:
-                full_text.append(f"Subject: {core_props.subject}")
-            if hasattr(core_props, 'keywords') and core_props.keywords:
-                full_text.append(f"Keywords: {core_props.keywords}")
+            _append_core_properties(full_text, doc.core_properties, _DOCX_CORE_PROPERTIES)
             full_text.append("-" * 40)
-        except:
+        except Exception:
             pass  # Ignore if properties can't be accessed
         
         # Document statistics
         full_text.append("--- Document Statistics ---")
-        full_text.append(f"Paragraphs: {len(doc.paragraphs)}")
+        full_text.append(f"Paragraphs: {len(paragraph_elements)}")
         full_text.append(f"Sections: {len(doc.sections)}")
         full_text.append(f"Tables: {len(doc.tables)}")
         
         # Detect images and other embedded objects
         try:
-            # Scan for embedded objects by looking at the underlying XML
-            image_count = 0
+            # Scan for embedded objects by looking at the underlying XML, classifying
+            # each relationship once and keeping the images for their details
+            image_rels = []
             chart_count = 0
             shape_count = 0
             drawing_count = 0
             
-            for rel in doc.part.rels.values():
-                if rel.reltype == 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/image':
-                    image_count += 1
-                elif rel.reltype == 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/chart':
+            # Without objects there are no relationships to classify or images to open
+            for rel_id, rel in (doc.part.rels.items() if include_objects else ()):
+                reltype = rel.reltype
+                if reltype == 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/image':
+                    image_rels.append((rel_id, rel))
+                elif reltype == 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/chart':
                     chart_count += 1
-                elif rel.reltype == 'http://schemas.microsoft.com/office/2007/relationships/shape':
+                elif reltype == 'http://schemas.microsoft.com/office/2007/relationships/shape':
                     shape_count += 1
-                elif 'drawing' in rel.reltype:
+                elif 'drawing' in reltype:
                     drawing_count += 1
             
-            if image_count > 0:
-                full_text.append(f"Images: {image_count}")
+            if image_rels:
+                full_text.append(f"Images: {len(image_rels)}")
                 
-                # Get more detailed image information if possible
-                try:
-                    image_details = []
-                    for rel_id, rel in doc.part.rels.items():
-                        if rel.reltype == 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/image':
-                            try:
-                                # Try to get image dimensions
-                                image_part = rel.target_part
-                                if has_pil and image_part and hasattr(image_part, 'blob'):
-                                    from io import BytesIO
-                                    img = Image.open(BytesIO(image_part.blob))
-                                    image_details.append(f"  Image {rel_id}: {img.format} {img.width}x{img.height}")
-                                else:
-                                    image_details.append(f"  Image {rel_id}")
-                            except:
-                                image_details.append(f"  Image {rel_id}")
-                    
-                    if image_details:
-                        full_text.append("Image details:")
-                        full_text.extend(image_details)
-                except:
-                    pass  # Skip if detailed image info can't be obtained
+                # Get more detailed image information if possible, listing an image
+                # without details if it can't be read
+                image_details = []
+                for rel_id, rel in image_rels:
+                    try:
+                        # Try to get image dimensions
+                        image_part = rel.target_part
+                        if has_pil and image_part and hasattr(image_part, 'blob'):
+                            from io import BytesIO
+                            from PIL import Image
+                            # Opening an image only reads its header, and it is closed once its size is read
+                            with Image.open(BytesIO(image_part.blob)) as img:
+                                image_details.append(f"  Image {rel_id}: {img.format} {img.width}x{img.height}")
+                        else:
+                            image_details.append(f"  Image {rel_id}")
+                    except Exception:
+                        image_details.append(f"  Image {rel_id}")
+                
+                if image_details:
+                    full_text.append("Image details:")
+                    full_text.extend(image_details)
             
             if chart_count > 0:
                 full_text.append(f"Charts: {chart_count}")
@@ -122,7 +222,7 @@ def read_docx_file(file_path: str) -> str:
                 full_text.append(f"Drawings: {drawing_count}")
             
             full_text.append("-" * 40)
-        except:
+        except Exception:
             full_text.append("-" * 40)  # Add separator even if object detection fails
         
         # Main content extraction - preserving sequence
@@ -131,49 +231,55 @@ def read_docx_file(file_path: str) -> str:
         # We need to track all content elements (paragraphs, tables, images) and their positions
         content_elements = []
         
+        # Heading level of each paragraph style id, as resolving a paragraph's style
+        # through python-docx searches the document's styles every time
+        heading_levels = {}
+        
         # Track paragraphs and their sequence
-        for i, para in enumerate(doc.paragraphs):
+        for position, p_element in zip(paragraph_positions, paragraph_elements):
+            text = paragraph_text(p_element)
             # Skip empty paragraphs
-            if not para.text.strip():
+            if not text.strip():
                 continue
                 
             # Check for headings
-            heading_level = 0
-            if para.style and para.style.name.startswith('Heading'):
-                try:
-                    heading_level = int(para.style.name.replace('Heading', ''))
-                except ValueError:
-                    heading_level = 0
+            style_id = p_element.style
+            heading_level = heading_levels.get(style_id)
+            if heading_level is None:
+                heading_level = 0
+                style = Paragraph(p_element, doc).style
+                if style and style.name.startswith('Heading'):
+                    try:
+                        heading_level = int(style.name.replace('Heading', ''))
+                    except ValueError:
+                        heading_level = 0
+                heading_levels[style_id] = heading_level
             
             # Check for images or other objects within this paragraph
             has_objects = False
             has_drawings = False
             drawing_texts = []
             
-            for run in para.runs:
+            # Most paragraphs have no objects, so runs are only checked in paragraphs that contain one
+            object_runs = p_element.r_lst if include_objects and _has_embedded_object(p_element) else ()
+            for run_element in object_runs:
                 # Check for embedded images
-                if run.element.findall('.//'+qn('w:drawing')) or run.element.findall('.//'+qn('w:pict')):
+                if _has_embedded_object(run_element):
                     has_objects = True
                     
                     # Try to extract text from drawing elements (text boxes, etc.)
-                    for drawing in run.element.findall('.//'+qn('w:drawing')):
+                    for drawing in find_drawings(run_element):
                         has_drawings = True
-                        # Try to extract any text from the drawing
-                        try:
-                            # Look for text elements in the drawing
-                            texts = drawing.findall('.//' + qn('w:t'))
-                            if texts:
-                                drawing_text = ' '.join([t.text for t in texts if t.text])
-                                if drawing_text.strip():
-                                    drawing_texts.append(drawing_text.strip())
-                        except:
-                            pass
+                        # Extract any text from the text elements in the drawing
+                        drawing_text = ' '.join(find_texts(drawing)).strip()
+                        if drawing_text:
+                            drawing_texts.append(drawing_text)
             
             # Create the paragraph text with appropriate heading level
             if heading_level > 0:
-                para_text = f"{'#' * heading_level} {para.text}"
+                para_text = f"{'#' * heading_level} {text}"
             else:
-                para_text = para.text
+                para_text = text
             
             # Add information about embedded objects/drawings
             if has_objects:
@@ -185,7 +291,7 @@ def read_docx_file(file_path: str) -> str:
             # Store the paragraph with its document position
             content_elements.append({
                 'type': 'paragraph',
-                'position': i,
+                'position': position,
                 'content': para_text,
                 'has_objects': has_objects,
                 'has_drawings': has_drawings,
@@ -193,49 +299,28 @@ def read_docx_file(file_path: str) -> str:
             })
         
         # Track tables and their sequence
-        for i, table in enumerate(doc.tables):
-            # Find the paragraph immediately before the table to determine position
-            table_position = -1
-            
-            # This is an approximation as the exact position might be harder to determine
-            # We'll use XML to try to find where this table appears
-            try:
-                # Get all paragraphs and tables in order from the body
-                body = doc._body._body
-                elements = body.findall('.//')
-                
-                # Walk through elements to find this table's position
-                current_position = 0
-                for elem in elements:
-                    if elem.tag.endswith('tbl'):  # Table element
-                        if current_position == i:  # If this is our target table
-                            table_position = current_position
-                            break
-                        current_position += 1
-                    elif elem.tag.endswith('p'):  # Paragraph element
-                        current_position += 1
-            except:
-                # If we can't determine position, just use the table index
-                table_position = i * 1000  # Arbitrary large value to put tables after paragraphs
-            
+        for table, table_position in zip(doc.tables, table_positions):
             # Format table data
             table_data = []
-            col_widths = []
             
             # Process the table - similar to previous implementation
             for row in table.rows:
                 row_data = []
                 for cell in row.cells:
+                    cell_paragraphs = cell._tc.p_lst
+                    
                     # Combine all text in the cell, handling paragraphs
-                    cell_text = '\n'.join([p.text for p in cell.paragraphs if p.text.strip()])
+                    cell_texts = map(paragraph_text, cell_paragraphs)
+                    cell_text = '\n'.join([text for text in cell_texts if text.strip()])
                     
                     # Check for embedded objects in the cell
                     has_objects = False
-                    for paragraph in cell.paragraphs:
-                        for run in paragraph.runs:
-                            if run.element.findall('.//'+qn('w:drawing')) or run.element.findall('.//'+qn('w:pict')):
-                                has_objects = True
-                                break
+                    if include_objects and _has_embedded_object(cell._tc):
+                        for p_element in cell_paragraphs:
+                            for run_element in p_element.r_lst:
+                                if _has_embedded_object(run_element):
+                                    has_objects = True
+                                    break
                     
                     if has_objects:
                         cell_text += " [Contains embedded object(s)]"
@@ -244,24 +329,14 @@ def read_docx_file(file_path: str) -> str:
                     cell_text = cell_text.strip()
                     row_data.append(cell_text)
                 
-                # Update column widths
-                for i, cell_text in enumerate(row_data):
-                    # For multiline content, get the max line width
-                    lines = cell_text.split('\n')
-                    max_line_width = max([len(line) for line in lines]) if lines else 0
-                    
-                    while len(col_widths) <= i:
-                        col_widths.append(0)
-                    col_widths[i] = max(col_widths[i], max_line_width)
-                
                 table_data.append(row_data)
             
-            # Store the formatted table data
+            # Store the formatted table data, with column widths measured over all rows at once
             content_elements.append({
                 'type': 'table',
                 'position': table_position,
                 'content': table_data,
-                'col_widths': col_widths
+                'col_widths': _table_column_widths(table_data)
             })
         
         # Sort content elements by their position to maintain document flow
@@ -273,7 +348,8 @@ def read_docx_file(file_path: str) -> str:
                 full_text.append(element['content'])
             elif element['type'] == 'table':
                 table_data = element['content']
-                col_widths = element['col_widths']
+                # Limit width to reasonable size
+                widths = [min(width, _MAX_COLUMN_WIDTH) for width in element['col_widths']]
                 
                 full_text.append("\n--- Table ---")
                 
@@ -281,74 +357,55 @@ def read_docx_file(file_path: str) -> str:
                 if table_data:
                     # Header row
                     header_row = table_data[0]
-                    header_line = []
-                    for i, cell in enumerate(header_row):
-                        width = min(col_widths[i], 30)  # Limit width to reasonable size
-                        header_line.append(cell.ljust(width))
-                    full_text.append("| " + " | ".join(header_line) + " |")
+                    full_text.append(_format_table_row(header_row, widths))
                     
                     # Separator row
-                    separator = []
-                    for i in range(len(header_row)):
-                        width = min(col_widths[i], 30)
-                        separator.append("-" * width)
-                    full_text.append("| " + " | ".join(separator) + " |")
+                    full_text.append(_format_table_row(["-" * width for width in widths[:len(header_row)]], widths))
                     
-                    # Data rows
-                    for row_idx, row_data in enumerate(table_data):
-                        if row_idx == 0:  # Skip header row as we already displayed it
+                    # Data rows, skipping the header row as we already displayed it
+                    for row_data in table_data[1:]:
+                        # Most rows have no multiline cells and are output as a single line
+                        if '\n' not in "".join(row_data):
+                            full_text.append(_format_table_row(row_data, widths))
                             continue
                         
                         # Handle multiline cells
-                        row_lines = []
-                        max_lines = 1
-                        
-                        for i, cell in enumerate(row_data):
-                            if not cell:
-                                row_lines.append([""])
-                                continue
-                                
-                            lines = cell.split('\n')
-                            row_lines.append(lines)
-                            max_lines = max(max_lines, len(lines))
+                        row_lines = [cell.split('\n') for cell in row_data]
+                        max_lines = max(map(len, row_lines), default=1)
                         
                         # Now create and output each line of the row
                         for line_idx in range(max_lines):
-                            line_parts = []
-                            for col_idx, cell_lines in enumerate(row_lines):
-                                if line_idx < len(cell_lines):
-                                    content = cell_lines[line_idx]
-                                else:
-                                    content = ""
-                                    
-                                width = min(col_widths[col_idx], 30)
-                                line_parts.append(content.ljust(width))
-                            
-                            full_text.append("| " + " | ".join(line_parts) + " |")
+                            line_cells = [
+                                cell_lines[line_idx] if line_idx < len(cell_lines) else ""
+                                for cell_lines in row_lines
+                            ]
+                            full_text.append(_format_table_row(line_cells, widths))
                 
                 full_text.append("--- End Table ---\n")
         
         # Check for image-only or drawing-only objects not attached to paragraphs
         # This requires special handling at the XML level
+        if not include_objects:
+            return "\n".join(full_text)
         try:
             body = doc._body._body
             
             # Function to extract text from a drawing object
             def extract_drawing_text(drawing_elem):
-                drawing_texts = []
-                try:
-                    texts = drawing_elem.findall('.//' + qn('w:t'))
-                    if texts:
-                        drawing_text = ' '.join([t.text for t in texts if t.text])
-                        if drawing_text.strip():
-                            drawing_texts.append(drawing_text.strip())
-                except:
-                    pass
-                return drawing_texts
+                drawing_text = ' '.join(find_texts(drawing_elem)).strip()
+                return [drawing_text] if drawing_text else []
+            
+            # Texts of the drawings already shown with their paragraphs
+            paragraph_drawing_texts = {
+                dt
+                for e in content_elements
+                if e['type'] == 'paragraph' and e['has_drawings']
+                for dt in e['drawing_texts']
+            }
             
             # Find standalone drawing objects
             standalone_drawings = []
-            for elem in body.findall('.//'+qn('w:drawing')):
+            for elem in find_drawings(body):
                 # Check if this drawing is directly in the body, not inside a paragraph we already processed
                 parent = elem.getparent()
                 if parent is not None and parent.tag.endswith('r'):  # Inside a run
@@ -359,15 +416,7 @@ def read_docx_file(file_path: str) -> str:
                         drawing_texts = extract_drawing_text(elem)
                         if drawing_texts:
                             # Check if this text is in any of our existing paragraphs with drawings
-                            found = False
-                            for e in content_elements:
-                                if e['type'] == 'paragraph' and e['has_drawings']:
-                                    for dt in e['drawing_texts']:
-                                        if dt in drawing_texts:
-                                            found = True
-                                            break
-                            
-                            if not found:
+                            if paragraph_drawing_texts.isdisjoint(drawing_texts):
                                 standalone_drawings.append({
                                     'type': 'drawing',
                                     'texts': drawing_texts
@@ -382,14 +431,212 @@ def read_docx_file(file_path: str) -> str:
                         full_text.append(f"  {text}")
                 full_text.append("--- End Drawings ---\n")
                 
-        except:
+        except Exception:
             pass  # Skip if we can't process standalone drawings
         
         return "\n".join(full_text)
     except Exception as e:
         return f"Error reading DOCX file: {str(e)}"
 
-def read_xlsx_file(file_path: str, sheet_name: str = None, cell_range: str = None) -> str:
+# calamine reads every number as a float, while openpyxl reads numbers stored without a
+# decimal point or exponent as ints. Excel and openpyxl write whole numbers that way
+# below this magnitude, and larger ones in exponent notation
+_PLAIN_INTEGER_LIMIT = 1e16
+
+def _calamine_cell_value(value: Any) -> Any:
+    """Convert a calamine cell value to the value openpyxl reads for the cell"""
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer() and abs(value) < _PLAIN_INTEGER_LIMIT:
+        return int(value)
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+# calamine loads a whole sheet at once, so ranges with fewer rows than this are streamed
+# by openpyxl, which stops reading after the last row of the range
+_CALAMINE_MIN_ROWS = 1000
+
+# Cell contents that calamine reads differently from openpyxl: escaped characters such as
+# _x000D_, which calamine decodes while openpyxl keeps them, and error cells, which
+# calamine reads as empty
+_CALAMINE_MISMATCH = re.compile(rb'_x[0-9A-Fa-f]{4}_|\st="e"')
+
+def _part_matches(src: Any, pattern: re.Pattern) -> bool:
+    """Check a file-like workbook part for a pattern, reading it in chunks"""
+    tail = b""
+    for chunk in iter(lambda: src.read(1 << 20), b""):
+        if pattern.search(tail + chunk):
+            return True
+        # Keep the end of the chunk in case a match is split across reads
+        tail = chunk[-16:]
+    return False
+
+def _calamine_matches_openpyxl(sheet: Any) -> bool:
+    """Check that calamine reads the same values as openpyxl for a read-only worksheet"""
+    with sheet._get_source() as src:
+        if _part_matches(src, _CALAMINE_MISMATCH):
+            return False
+    strings_path = getattr(sheet.parent.shared_strings, "path", None)
+    if strings_path is not None:
+        with sheet.parent._archive.open(strings_path) as src:
+            if _part_matches(src, _CALAMINE_MISMATCH):
+                return False
+    return True
+
+def _iter_sheet_values(file_path: str, sheet: Any, min_row: int, max_row: int, min_col: int, max_col: int) -> Iterator[tuple]:
+    """Yield the values of each row of a worksheet range, read with calamine for large ranges.
+    
+    Both readers give the same values; sheets whose contents calamine would read
+    differently are always read with openpyxl. Rows past the last row of the sheet
+    are not yielded.
+    """
+    if (has_calamine and max_row - min_row + 1 >= _CALAMINE_MIN_ROWS
+            and _calamine_matches_openpyxl(sheet)):
+        workbook = CalamineWorkbook.from_path(file_path)
+        try:
+            data = workbook.get_sheet_by_name(sheet.title).to_python(skip_empty_area=False, nrows=max_row)
+        finally:
+            workbook.close()
+        width = max_col - min_col + 1
+        for values in data[min_row - 1:max_row]:
+            values = [_calamine_cell_value(value) for value in values[min_col - 1:max_col]]
+            yield tuple(values) + (None,) * (width - len(values))
+        return
+    yield from sheet.iter_rows(
+        min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True
+    )
+
+def _iter_shared_strings(archive: zipfile.ZipFile, path: str) -> Iterator[str]:
+    """Yield the strings of a workbook's shared string table, read the way openpyxl reads them"""
+    string_tag = '{%s}si' % SHEET_MAIN_NS
+    text_tag = '{%s}t' % SHEET_MAIN_NS
+    with archive.open(path) as src:
+        for _, node in iterparse(src):
+            if node.tag == string_tag:
+                if len(node) == 1 and node[0].tag == text_tag:
+                    # Plain strings, most of the table, without building openpyxl's rich text model
+                    text = node[0].text or ""
+                else:
+                    text = Text.from_tree(node).content
+                text = text.replace('x005F_', '')
+                node.clear()
+                yield text
+
+class _LazySharedStrings:
+    """Shared string table of a workbook, parsed only as far as the highest index looked up"""
+    
+    def __init__(self, archive: zipfile.ZipFile, path: str):
+        self.path = path
+        self._strings = []
+        self._remaining = _iter_shared_strings(archive, path)
+    
+    def __getitem__(self, index: int) -> str:
+        if index >= len(self._strings):
+            self._strings.extend(islice(self._remaining, index + 1 - len(self._strings)))
+        return self._strings[index]
+    
+    def close(self) -> None:
+        """Stop reading the table, closing its file in the workbook archive"""
+        self._remaining.close()
+
+class _LazyStringsExcelReader(ExcelReader):
+    """Read-only workbook reader that leaves the shared string table to be parsed on demand.
+    
+    openpyxl parses the whole table when the workbook is loaded, which for a large
+    workbook takes longer than reading the first rows of its sheets.
+    """
+    
+    def read_strings(self):
+        ct = self.package.find(SHARED_STRINGS)
+        if ct is not None:
+            self.shared_strings = _LazySharedStrings(self.archive, ct.PartName[1:])
+    
+    def close(self):
+        """Close the workbook and its shared string table"""
+        if isinstance(self.shared_strings, _LazySharedStrings):
+            self.shared_strings.close()
+        self.wb.close()
+
+def _xlsx_file_info(file_path: str, workbook: Any) -> Dict[str, Any]:
+    """Collect the file info of a read-only workbook: the dimensions and headers of each sheet"""
+    # Basic file info
+    file_info = {
+        "file": os.path.basename(file_path),
+        "sheets": []
+    }
+    
+    # Get info for all sheets
+    for ws in workbook.worksheets:
+        # Get sheet dimensions, measured from the cells rather than the dimension record
+        dimensions = sheet_dimension(ws)
+        min_col, min_row, max_col, max_row = openpyxl.utils.range_boundaries(dimensions)
+        
+        # Get column headers (first row)
+        column_refs = [get_column_letter(col) for col in range(min_col, max_col + 1)]
+        columns = [
+            header if header is not None else f"Column {column_ref}"
+            for header, column_ref in zip(first_row_values(ws, min_row, min_col, max_col), column_refs)
+        ]
+        
+        file_info["sheets"].append({
+            "name": ws.title,
+            "dimensions": dimensions,
+            "row_count": max_row,
+            "column_count": max_col - min_col + 1,
+            "columns": columns,
+            "column_refs": column_refs
+        })
+    return file_info
+
+def _xlsx_sheet_data(
+    sheet_name: str,
+    dimensions: str,
+    rows: Iterator[tuple],
+    min_row: int,
+    min_col: int,
+    max_col: int,
+    drawings: tuple
+) -> Dict[str, Any]:
+    """Build the sheet data of read_xlsx_file from the values of a range, header row first"""
+    header = next(rows, None) or (None,) * (max_col - min_col + 1)
+    columns = [value if value is not None else "" for value in header]
+    
+    # Collect non-empty rows
+    records = []
+    for row, values in enumerate(rows, start=min_row + 1):
+        # Skip empty rows, testing all of a row's values at once
+        if EMPTY_VALUES.issuperset(values):
+            continue
+        # Convert datetime objects to ISO format, only in rows that have any
+        if datetime in set(map(type, values)):
+            values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+        else:
+            values = list(values)
+        records.append({
+            "row": row,
+            "values": values
+        })
+    
+    chart_count, image_count = drawings
+    return {
+        "sheet_name": sheet_name,
+        "dimensions": dimensions,
+        "non_empty_cells": len(records),
+        "charts": chart_count,
+        "images": image_count,
+        "columns": columns,
+        "records": records
+    }
+
+def _sheet_info_dimensions(file_info: Dict[str, Any], sheet_name: str) -> Optional[str]:
+    """Get the dimensions recorded in the file info for a sheet, or None if there is no such sheet"""
+    for sheet_info in file_info["sheets"]:
+        if sheet_info["name"] == sheet_name:
+            return sheet_info["dimensions"]
+    return None
+
+def read_xlsx_file(file_path: str, sheet_name: str = None, cell_range: str = None) -> Dict[str, Any]:
     """Extract data from Microsoft Excel (.xlsx) files with optimized output.
     
     Args:
@@ -398,125 +645,225 @@ def read_xlsx_file(file_path: str, sheet_name: str = None, cell_range: str = Non
         cell_range: Optional cell range to read (e.g. 'A1:D10'). If None, reads all cells
         
     Returns:
-        JSON string containing file info and optionally sheet data
+        Dictionary containing file info and optionally sheet data
     """
     try:
-        workbook = openpyxl.load_workbook(file_path, data_only=True)
-        
-        # Basic file info
-        file_info = {
-            "file": os.path.basename(file_path),
-            "sheets": []
+        # Read-only mode streams the sheets instead of loading every cell up front, and
+        # shared strings are only parsed up to the last one the cells read use
+        reader = _LazyStringsExcelReader(file_path, read_only=True, data_only=True)
+        reader.read()
+    except Exception as e:
+        return {
+            "error": f"Failed to read Excel file: {str(e)}"
         }
-        
-        # Get info for all sheets
-        for ws in workbook.worksheets:
-            # Get sheet dimensions
-            min_col, min_row, max_col, max_row = openpyxl.utils.range_boundaries(ws.calculate_dimension())
-            
-            # Get column headers (first row)
-            columns = []
-            column_refs = []
-            for col in range(min_col, max_col + 1):
-                cell = ws.cell(min_row, col)
-                header = cell.value if cell.value is not None else f"Column {get_column_letter(col)}"
-                columns.append(header)
-                column_refs.append(get_column_letter(col))
-            
-            sheet_info = {
-                "name": ws.title,
-                "dimensions": ws.calculate_dimension(),
-                "row_count": ws.max_row,
-                "column_count": max_col - min_col + 1,
-                "columns": columns,
-                "column_refs": column_refs
-            }
-            file_info["sheets"].append(sheet_info)
+    workbook = reader.wb
+    try:
+        file_info = _xlsx_file_info(file_path, workbook)
         
         # If no specific sheet requested, return file info only
         if not sheet_name:
-            return json.dumps(file_info)
+            return file_info
         
         # Validate requested sheet exists
-        if sheet_name not in workbook.sheetnames:
-            return json.dumps({
+        dimensions = _sheet_info_dimensions(file_info, sheet_name)
+        if dimensions is None:
+            return {
                 "error": f"Sheet '{sheet_name}' not found in workbook"
-            })
+            }
         
         # Get the requested sheet
         sheet = workbook[sheet_name]
         
-        # Parse cell range if provided
-        if cell_range:
-            try:
-                min_col, min_row, max_col, max_row = openpyxl.utils.range_boundaries(cell_range)
-            except ValueError:
-                return json.dumps({
-                    "error": f"Invalid cell range format: {cell_range}"
-                })
-        else:
-            # Use full sheet range
-            min_col, min_row, max_col, max_row = openpyxl.utils.range_boundaries(sheet.calculate_dimension())
+        # Parse cell range if provided, otherwise use the full sheet range
+        try:
+            min_col, min_row, max_col, max_row = openpyxl.utils.range_boundaries(cell_range or dimensions)
+        except ValueError:
+            return {
+                "error": f"Invalid cell range format: {cell_range}"
+            }
         
-        # Get column headers (first row)
-        columns = []
-        for col in range(min_col, max_col + 1):
-            cell = sheet.cell(min_row, col)
-            columns.append(cell.value if cell.value is not None else "")
-        
-        # Collect non-empty rows
-        records = []
-        for row in range(min_row + 1, max_row + 1):
-            values = []
-            row_has_data = False
-            
-            for col in range(min_col, max_col + 1):
-                cell = sheet.cell(row, col)
-                value = cell.value
-                
-                # Convert datetime objects to ISO format
-                if isinstance(value, datetime.datetime):
-                    value = value.isoformat()
-                
-                values.append(value)
-                if value is not None and value != "":
-                    row_has_data = True
-            
-            if row_has_data:
-                records.append({
-                    "row": row,
-                    "values": values
-                })
-        
-        # Count charts and images
-        chart_count = len([drawing for drawing in sheet._charts])
-        image_count = len([drawing for drawing in sheet._images])
-        
-        # Prepare sheet data
-        sheet_data = {
-            "sheet_name": sheet_name,
-            "dimensions": cell_range or sheet.calculate_dimension(),
-            "non_empty_cells": len(records),
-            "charts": chart_count,
-            "images": image_count,
-            "columns": columns,
-            "records": records
-        }
+        # Read the range in one pass, starting with the header row
+        rows = _iter_sheet_values(file_path, sheet, min_row, max_row, min_col, max_col)
+        sheet_data = _xlsx_sheet_data(
+            sheet_name, cell_range or dimensions, rows, min_row, min_col, max_col, count_sheet_drawings(sheet)
+        )
         
         # Add sheet data to response
         file_info["sheet"] = [sheet_data]
         
-        return json.dumps(file_info)
+        return file_info
         
     except Exception as e:
-        return json.dumps({
+        return {
             "error": f"Failed to read Excel file: {str(e)}"
-        })
+        }
+    finally:
+        reader.close()
+
+class ParsedXlsxFile:
+    """An .xlsx file read once, giving the results of read_xlsx_file for any sheet and range.
+    
+    The file info is read on creation and the values of each sheet on its first
+    use; later reads of the sheet slice the stored values instead of reading the
+    file again. Results share their values with the stored ones and must not be
+    modified.
+    """
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        reader = _LazyStringsExcelReader(file_path, read_only=True, data_only=True)
+        reader.read()
+        try:
+            self._file_info = _xlsx_file_info(file_path, reader.wb)
+        finally:
+            reader.close()
+        # Values and drawing counts of each sheet read so far, by sheet name
+        self._sheets = {}
+    
+    def _sheet_values(self, sheet_name: str, dimensions: str) -> Tuple[List[tuple], tuple]:
+        """Read the values of a sheet's dimensions, row by row, and its chart and image counts"""
+        if sheet_name not in self._sheets:
+            min_col, min_row, max_col, max_row = openpyxl.utils.range_boundaries(dimensions)
+            reader = _LazyStringsExcelReader(self.file_path, read_only=True, data_only=True)
+            reader.read()
+            try:
+                sheet = reader.wb[sheet_name]
+                rows = list(_iter_sheet_values(self.file_path, sheet, min_row, max_row, min_col, max_col))
+                self._sheets[sheet_name] = (rows, count_sheet_drawings(sheet))
+            finally:
+                reader.close()
+        return self._sheets[sheet_name]
+    
+    def read(self, sheet_name: str = None, cell_range: str = None) -> Dict[str, Any]:
+        """Get the result read_xlsx_file gives for a sheet and range of the file"""
+        file_info = {**self._file_info, "sheets": list(self._file_info["sheets"])}
+        if not sheet_name:
+            return file_info
+        
+        dimensions = _sheet_info_dimensions(file_info, sheet_name)
+        if dimensions is None:
+            return {
+                "error": f"Sheet '{sheet_name}' not found in workbook"
+            }
+        try:
+            min_col, min_row, max_col, max_row = openpyxl.utils.range_boundaries(cell_range or dimensions)
+        except ValueError:
+            return {
+                "error": f"Invalid cell range format: {cell_range}"
+            }
+        
+        if None in (min_col, min_row, max_col, max_row):
+            # Whole rows or columns are not sliced, read_xlsx_file reports them
+            return read_xlsx_file(self.file_path, sheet_name, cell_range)
+        
+        try:
+            values, drawings = self._sheet_values(sheet_name, dimensions)
+        except Exception as e:
+            return {
+                "error": f"Failed to read Excel file: {str(e)}"
+            }
+        rows = _slice_sheet_rows(values, dimensions, min_row, max_row, min_col, max_col)
+        file_info["sheet"] = [_xlsx_sheet_data(
+            sheet_name, cell_range or dimensions, rows, min_row, min_col, max_col, drawings
+        )]
+        return file_info
+
+def _slice_sheet_rows(
+    values: List[tuple], dimensions: str, min_row: int, max_row: int, min_col: int, max_col: int
+) -> Iterator[tuple]:
+    """Yield the rows of a range from the values of a sheet's dimensions, like _iter_sheet_values.
+    
+    Cells outside the dimensions are empty, and rows past the last row of the
+    sheet are not yielded.
+    """
+    sheet_min_col, sheet_min_row, sheet_max_col, _ = openpyxl.utils.range_boundaries(dimensions)
+    width = max_col - min_col + 1
+    # Columns of the range inside the dimensions, and the empty cells on either side
+    first_col = max(min_col, sheet_min_col)
+    last_col = min(max_col, sheet_max_col)
+    if first_col > last_col:
+        first_col, last_col = min_col, min_col - 1
+    before = (None,) * (first_col - min_col)
+    after = (None,) * (max_col - last_col)
+    last_row = min(max_row, sheet_min_row + len(values) - 1)
+    for row in range(min_row, last_row + 1):
+        if row < sheet_min_row or last_col < first_col:
+            yield (None,) * width
+            continue
+        row_values = values[row - sheet_min_row]
+        yield before + tuple(row_values[first_col - sheet_min_col:last_col - sheet_min_col + 1]) + after
+
+# Namespaces of the Office package parts read by read_office_properties
+_OFFICE_NAMESPACES = {
+    'cp': 'http://schemas.openxmlformats.org/package/2006/metadata/core-properties',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'dcterms': 'http://purl.org/dc/terms/',
+    'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+}
+
+# Core properties listed by read_office_properties, as (label, element)
+_CORE_PROPERTIES = [
+    ("Title", "dc:title"),
+    ("Author", "dc:creator"),
+    ("Subject", "dc:subject"),
+    ("Keywords", "cp:keywords"),
+    ("Comments", "dc:description"),
+    ("Category", "cp:category"),
+    ("Created", "dcterms:created"),
+    ("Modified", "dcterms:modified"),
+]
+
+def read_office_properties(file_path: str) -> str:
+    """Read the document properties of a .docx, .xlsx or .pptx file without loading the document.
+    
+    The properties, and the sheet names or slide count, are read from the small XML
+    parts that hold them, straight from the file's zip archive.
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            names = set(archive.namelist())
+            content = ["--- Document Properties ---", f"Filename: {os.path.basename(file_path)}"]
+            
+            if 'xl/workbook.xml' in names:
+                workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+                sheets = [sheet.get('name') for sheet in workbook.iterfind('main:sheets/main:sheet', _OFFICE_NAMESPACES)]
+                content.append(f"Sheets: {', '.join(sheets)}")
+            elif 'ppt/presentation.xml' in names:
+                presentation = ET.fromstring(archive.read('ppt/presentation.xml'))
+                slide_count = len(presentation.findall('p:sldIdLst/p:sldId', _OFFICE_NAMESPACES))
+                content.append(f"Number of slides: {slide_count}")
+            
+            if 'docProps/core.xml' in names:
+                core = ET.fromstring(archive.read('docProps/core.xml'))
+                for label, tag in _CORE_PROPERTIES:
+                    value = core.findtext(tag, namespaces=_OFFICE_NAMESPACES)
+                    if not value:
+                        continue
+                    if tag.startswith('dcterms:'):
+                        # Dates are shown the way python-docx and python-pptx show them
+                        try:
+                            value = datetime.fromisoformat(value)
+                        except ValueError:
+                            pass
+                    content.append(f"{label}: {value}")
+            
+            content.append("-" * 40)
+            return "\n".join(content)
+    except Exception as e:
+        return f"Error reading document properties: {str(e)}"
+
+# Length units (EMU) in an inch, the unit shape positions and sizes are stored in
+_EMU_PER_INCH = 914400
 
 def read_pptx_file(file_path: str) -> str:
     """Extract text and identify objects from Microsoft PowerPoint (.pptx) files in sequential order."""
+    pptx = _import_pptx()
+    if pptx is None:
+        return "Error reading PPTX file: python-pptx is not installed"
+    MSO_SHAPE_TYPE = pptx.enum.shapes.MSO_SHAPE_TYPE
     try:
-        prs = Presentation(file_path)
+        prs = pptx.Presentation(file_path)
         full_text = []
         
         # Document properties
@@ -526,20 +873,8 @@ def read_pptx_file(file_path: str) -> str:
         
         # Try to get core properties
         try:
-            core_props = prs.core_properties
-            if hasattr(core_props, 'title') and core_props.title:
-                full_text.append(f"Title: {core_props.title}")
-            if hasattr(core_props, 'author') and core_props.author:
-                full_text.append(f"Author: {core_props.author}")
-            if hasattr(core_props, 'subject') and core_props.subject:
-                full_text.append(f"Subject: {core_props.subject}")
-            if hasattr(core_props, 'keywords') and core_props.keywords:
-                full_text.append(f"Keywords: {core_props.keywords}")
-            if hasattr(core_props, 'created') and core_props.created:
-                full_text.append(f"Created: {core_props.created}")
-            if hasattr(core_props, 'modified') and core_props.modified:
-                full_text.append(f"Modified: {core_props.modified}")
-        except:
+            _append_core_properties(full_text, prs.core_properties, _PPTX_CORE_PROPERTIES)
+        except Exception:
             pass  # Skip if properties can't be accessed
         
         full_text.append("-" * 40)
@@ -555,9 +890,19 @@ def read_pptx_file(file_path: str) -> str:
             
             full_text.append(f"Slide layouts: {total_layouts}")
             full_text.append("-" * 40)
-        except:
+        except Exception:
             full_text.append("-" * 40)
         
+        # Every slide has the presentation's dimensions, so their line is formatted once
+        dimensions_line = None
+        try:
+            if hasattr(prs, 'slide_width') and hasattr(prs, 'slide_height'):
+                slide_width = prs.slide_width / _EMU_PER_INCH
+                slide_height = prs.slide_height / _EMU_PER_INCH
+                dimensions_line = f"Dimensions: {slide_width:.2f}\" × {slide_height:.2f}\""
+        except Exception:
+            pass
+        
         # Process each slide
         for i, slide in enumerate(prs.slides):
             slide_content = [f"--- Slide {i+1} ---"]
@@ -566,22 +911,18 @@ def read_pptx_file(file_path: str) -> str:
             try:
                 layout_name = slide.slide_layout.name
                 slide_content.append(f"Layout: {layout_name}")
-            except:
+            except Exception:
                 pass
             
             # Get slide dimensions
-            try:
-                if hasattr(prs, 'slide_width') and hasattr(prs, 'slide_height'):
-                    slide_width = prs.slide_width / 914400  # Convert EMU to inches
-                    slide_height = prs.slide_height / 914400
-                    slide_content.append(f"Dimensions: {slide_width:.2f}\" × {slide_height:.2f}\"")
-            except:
-                pass
+            if dimensions_line is not None:
+                slide_content.append(dimensions_line)
                 
-            # Extract text from slide title separately
+            # Extract text from slide title separately; the title placeholder is looked up once
             title_text = ""
-            if slide.shapes.title:
-                title_text = slide.shapes.title.text
+            title_shape = slide.shapes.title
+            if title_shape:
+                title_text = title_shape.text
                 slide_content.append(f"Title: {title_text}")
             
             # Count shape types for summary
@@ -600,40 +941,48 @@ def read_pptx_file(file_path: str) -> str:
             
             # Process all shapes to extract content and position
             for shape_idx, shape in enumerate(slide.shapes):
-                # Skip the title as we've already handled it
-                if shape == slide.shapes.title:
+                # Skip the title as we've already handled it (shape objects are created on
+                # each access, so they compare by their XML element rather than identity)
+                if shape == title_shape:
                     continue
                 
                 # Get shape position
                 try:
-                    top = shape.top / 914400  # EMU to inches
-                    left = shape.left / 914400
-                except:
-                    # If we can't get position, use index as proxy for position
+                    top = shape.top / _EMU_PER_INCH
+                    left = shape.left / _EMU_PER_INCH
+                except TypeError:
+                    # Shapes without a position of their own have None extents; if we can't
+                    # get position, use index as proxy for position
                     top = shape_idx * 10
                     left = 0
                 
                 # Check type and extract content
                 if shape.has_text_frame:
-                    if shape.text.strip():
+                    # The paragraphs are read once, both to check for text and to format it
+                    paragraphs = shape.text_frame.paragraphs
+                    if any(para.text.strip() for para in paragraphs):
                         shape_counts['text_boxes'] += 1
                         
                         # Store text with paragraph formatting preserved
                         shape_text = []
                         
                         # Preserve text formatting - check paragraphs and runs
-                        for para in shape.text_frame.paragraphs:
+                        for para in paragraphs:
                             para_text = []
-                            for run in para.runs:
-                                text = run.text.strip()
+                            # Runs are read from the XML, as run.font would build a font object and
+                            # add an empty properties element to every run without formatting
+                            for r_element in para._p.r_lst:
+                                text = r_element.text.strip()
                                 if text:
                                     # Check for formatting
-                                    if hasattr(run, 'font') and hasattr(run.font, 'bold') and run.font.bold:
-                                        text = f"**{text}**"
-                                    if hasattr(run, 'font') and hasattr(run.font, 'italic') and run.font.italic:
-                                        text = f"*{text}*"
-                                    if hasattr(run, 'font') and hasattr(run.font, 'underline') and run.font.underline:
-                                        text = f"_{text}_"
+                                    rPr = r_element.rPr
+                                    if rPr is not None:
+                                        if rPr.b:
+                                            text = f"**{text}**"
+                                        if rPr.i:
+                                            text = f"*{text}*"
+                                        if rPr.u:
+                                            text = f"_{text}_"
                                     
                                     para_text.append(text)
                             
@@ -653,31 +1002,22 @@ def read_pptx_file(file_path: str) -> str:
                 elif shape.has_table:
                     shape_counts['tables'] += 1
                     
-                    # Process table data with column widths
-                    table_data = []
-                    col_widths = []
-                    
                     # Extract table content
+                    table_data = []
                     for row in shape.table.rows:
                         row_data = []
                         for cell in row.cells:
                             cell_text = cell.text.strip().replace('\n', ' ')
                             row_data.append(cell_text)
-                        
-                        # Update column widths
-                        for i, text in enumerate(row_data):
-                            while len(col_widths) <= i:
-                                col_widths.append(0)
-                            col_widths[i] = max(col_widths[i], len(text))
-                        
                         table_data.append(row_data)
                     
+                    # Store the table data, with column widths measured over all rows at once
                     slide_elements.append({
                         'type': 'table',
                         'top': top,
                         'left': left,
                         'content': table_data,
-                        'col_widths': col_widths
+                        'col_widths': _table_column_widths(table_data)
                     })
                 
                 elif shape.has_chart:
@@ -687,7 +1027,7 @@ def read_pptx_file(file_path: str) -> str:
                     try:
                         chart_type = str(shape.chart.chart_type).split('.')[-1]
                         chart_desc = f"Chart: {chart_type}"
-                    except:
+                    except Exception:
                         chart_desc = "Chart"
                     
                     slide_elements.append({
@@ -697,18 +1037,16 @@ def read_pptx_file(file_path: str) -> str:
                         'content': chart_desc
                     })
                 
-                elif shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+                # shape_type inspects the shape's XML, so it is read once for the checks below
+                elif (shape_type := shape.shape_type) == MSO_SHAPE_TYPE.PICTURE:
                     shape_counts['pictures'] += 1
                     
                     # Get picture details if possible
                     try:
-                        if hasattr(shape, 'width') and hasattr(shape, 'height'):
-                            pic_width = shape.width / 914400  # EMU to inches
-                            pic_height = shape.height / 914400
-                            pic_desc = f"Picture: {pic_width:.1f}\" × {pic_height:.1f}\""
-                        else:
-                            pic_desc = "Picture"
-                    except:
+                        pic_width = shape.width / _EMU_PER_INCH
+                        pic_height = shape.height / _EMU_PER_INCH
+                        pic_desc = f"Picture: {pic_width:.1f}\" × {pic_height:.1f}\""
+                    except TypeError:
                         pic_desc = "Picture"
                     
                     slide_elements.append({
@@ -718,7 +1056,7 @@ def read_pptx_file(file_path: str) -> str:
                         'content': pic_desc
                     })
                 
-                elif shape.shape_type == MSO_SHAPE_TYPE.MEDIA:
+                elif shape_type == MSO_SHAPE_TYPE.MEDIA:
                     shape_counts['videos'] += 1
                     
                     slide_elements.append({
@@ -728,7 +1066,7 @@ def read_pptx_file(file_path: str) -> str:
                         'content': "Video/Media"
                     })
                 
-                elif shape.shape_type == MSO_SHAPE_TYPE.DIAGRAM:
+                elif shape_type == MSO_SHAPE_TYPE.DIAGRAM:
                     shape_counts['diagrams'] += 1
                     
                     slide_elements.append({
@@ -744,9 +1082,8 @@ def read_pptx_file(file_path: str) -> str:
                     # Try to get text from drawing objects or other shapes
                     shape_text = ""
                     try:
-                        if hasattr(shape, 'text'):
-                            shape_text = shape.text
-                    except:
+                        shape_text = getattr(shape, 'text', "")
+                    except Exception:
                         pass
                     
                     slide_elements.append({
@@ -797,7 +1134,8 @@ def read_pptx_file(file_path: str) -> str:
                 
                 elif element_type == 'table':
                     table_data = element['content']
-                    col_widths = element['col_widths']
+                    # Cap width at 30 chars
+                    widths = [min(width, _MAX_COLUMN_WIDTH) for width in element['col_widths']]
                     
                     slide_content.append("--- Table ---")
                     
@@ -805,29 +1143,13 @@ def read_pptx_file(file_path: str) -> str:
                     if table_data:
                         # Header row
                         header_row = table_data[0]
-                        header_parts = []
-                        for i, text in enumerate(header_row):
-                            width = min(col_widths[i], 30)  # Cap width at 30 chars
-                            header_parts.append(text.ljust(width))
-                        slide_content.append("| " + " | ".join(header_parts) + " |")
+                        slide_content.append(_format_table_row(header_row, widths))
                         
                         # Separator
-                        separator_parts = []
-                        for i in range(len(header_row)):
-                            width = min(col_widths[i], 30)
-                            separator_parts.append("-" * width)
-                        slide_content.append("| " + " | ".join(separator_parts) + " |")
+                        slide_content.append(_format_table_row(["-" * width for width in widths[:len(header_row)]], widths))
                         
-                        # Data rows
-                        for row_idx, row_data in enumerate(table_data):
-                            if row_idx == 0:  # Skip header as we already displayed it
-                                continue
-                                
-                            row_parts = []
-                            for i, text in enumerate(row_data):
-                                width = min(col_widths[i], 30)
-                                row_parts.append(text.ljust(width))
-                            slide_content.append("| " + " | ".join(row_parts) + " |")
+                        # Data rows, skipping the header as we already displayed it
+                        slide_content.extend(_format_table_row(row_data, widths) for row_data in table_data[1:])
                     
                     slide_content.append("--- End Table ---")
             
@@ -1,10 +1,8 @@
 """PDF reader module with enhanced extraction capabilities."""
 
 import os
-from ..core.dependencies import (
-    has_pdfplumber, has_pymupdf, has_tabula,
-    PyPDF2, pdfplumber, fitz, tabula
-)
+# The PDF libraries are slow to import, so each is imported by the branch that uses it
+from ..core.dependencies import has_pdfplumber, has_pymupdf, has_tabula
 
 def read_pdf_file(file_path: str) -> str:
     """Extract text and identify images from PDF files with layout preservation."""
@@ -13,6 +11,7 @@ def read_pdf_file(file_path: str) -> str:
     # Try pdfplumber first if available
     if has_pdfplumber:
         try:
+            import pdfplumber
             content.append("--- Document Metadata ---")
             pdf = pdfplumber.open(file_path)
             
@@ -77,6 +76,10 @@ def read_pdf_file(file_path: str) -> str:
                     content.append("[This page appears to be empty or contains only non-text elements]")
                 else:
                     content.append(page_text)
+                
+                # The text and tables share the page's parsed objects, which are released
+                # here rather than kept for every page until the document is closed
+                page.close()
             
             pdf.close()
             return "\n\n".join(content)
@@ -86,6 +89,7 @@ def read_pdf_file(file_path: str) -> str:
     # Try PyMuPDF if available
     if has_pymupdf:
         try:
+            import fitz  # PyMuPDF
             pdf_document = fitz.open(file_path)
             
             # Extract document metadata
@@ -109,6 +113,7 @@ def read_pdf_file(file_path: str) -> str:
             tables_by_page = {}
             if has_tabula:
                 try:
+                    import tabula
                     # Extract tables from all pages
                     all_tables = tabula.read_pdf(file_path, pages='all', multiple_tables=True)
                     
@@ -143,11 +148,10 @@ def read_pdf_file(file_path: str) -> str:
                 text_blocks = []
                 for block in blocks:
                     if block["type"] == 0:  # Text block
-                        text = ""
-                        for line in block["lines"]:
-                            for span in line["spans"]:
-                                text += span["text"]
-                            text += "\n"
+                        # Join the spans of each line and the lines of the block in one pass
+                        text = "\n".join(
+                            "".join(span["text"] for span in line["spans"]) for line in block["lines"]
+                        )
                         
                         # Store the text block with its position
                         if text.strip():
@@ -160,8 +164,10 @@ def read_pdf_file(file_path: str) -> str:
                                 "text": text.strip()
                             })
                 
-                # Get image information with position
+                # Get image information with position; the position of each image in the page's
+                # drawings is looked up by xref, scanning the drawings once for the page
                 image_blocks = []
+                image_rects = None
                 for img_index, img in enumerate(page.get_images(full=True)):
                     xref = img[0]  # image reference number
                     
@@ -169,12 +175,13 @@ def read_pdf_file(file_path: str) -> str:
                     try:
                         base_image = pdf_document.extract_image(xref)
                         if base_image:
-                            # Try to get image position on page
-                            rect = None
-                            for item in page.get_drawings():
-                                if item["type"] == "image" and xref == item.get("xref"):
-                                    rect = item["rect"]
-                                    break
+                            # Try to get image position on page, from the first drawing of the image
+                            if image_rects is None:
+                                image_rects = {}
+                                for item in page.get_drawings():
+                                    if item["type"] == "image":
+                                        image_rects.setdefault(item.get("xref"), item["rect"])
+                            rect = image_rects.get(xref)
                             
                             if rect:
                                 y_pos = rect[1]  # Top y-coordinate
@@ -225,13 +232,9 @@ def read_pdf_file(file_path: str) -> str:
                     # Re-sort with tables included
                     page_elements.sort(key=lambda x: (x["y_pos"], x["x_pos"]))
                 
-                # If we have no elements, check if page has text using plain extraction
+                # A page without elements has no text, as its text blocks were all blank
                 if not page_elements:
-                    page_text = page.get_text()
-                    if page_text.strip():
-                        content.append(page_text.strip())
-                    else:
-                        content.append("[This page appears to be empty or contains only non-text elements]")
+                    content.append("[This page appears to be empty or contains only non-text elements]")
                 else:
                     # Output elements in order
                     for element in page_elements:
@@ -260,6 +263,7 @@ def read_pdf_file(file_path: str) -> str:
     
     # Use PyPDF2 as final fallback
     try:
+        import PyPDF2
         with open(file_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
             num_pages = len(pdf_reader.pages)
@@ -4,16 +4,22 @@ def read_text_file(file_path: str) -> str:
     """Read content from text-based files with proper encoding detection."""
     encodings = ['utf-8', 'latin-1', 'windows-1252', 'ascii']
     
+    # Read the file once, decoding its bytes with each encoding in turn
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    
     for encoding in encodings:
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                return f.read()
+            text = raw.decode(encoding)
         except UnicodeDecodeError:
             continue
+        # Translate line endings as reading in text mode does
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
 
-    # If all encodings fail, try binary mode as last resort
+    # If all encodings fail, replace the characters that can't be decoded as a last resort
     try:
-        with open(file_path, 'rb') as f:
-            return f.read().decode('utf-8', errors='replace')
+        return raw.decode('utf-8', errors='replace')
     except Exception as e:
         return f"Error: Could not decode file with available encodings: {str(e)}" 
\ No newline at end of file
@@ -721,6 +721,11 @@ def get_tool_definitions() -> list[types.Tool]:
                             "font_size": {"type": "integer"},
                             "alignment": {"type": "string"}
                         }
+                    },
+                    "streaming": {
+                        "type": "boolean",
+                        "description": "Append the column by streaming rows into a new file instead of loading the workbook, for very large files. Only applies when adding after the existing data. The rewritten file keeps only cell values and formulas: styles, number formats, column widths, merged cells, data validations, conditional formatting, comments, hyperlinks, charts, images and defined names are lost.",
+                        "default": False
                     }
                 },
                 "required": ["path", "sheet_name", "column_name"],
@@ -2,9 +2,14 @@
 
 from .formatters import summarize_content, print_output
 from .io_utils import save_to_file
+from .sheet_utils import EMPTY_VALUES, count_sheet_drawings, first_row_values, sheet_dimension
 
 __all__ = [
     'summarize_content',
     'print_output',
     'save_to_file',
+    'EMPTY_VALUES',
+    'count_sheet_drawings',
+    'first_row_values',
+    'sheet_dimension',
 ] 
\ No newline at end of file
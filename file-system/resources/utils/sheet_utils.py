@@ -0,0 +1,84 @@
+"""Helpers for reading worksheets opened in read-only mode."""
+import re
+from typing import Any, Tuple
+
+from openpyxl.drawing.spreadsheet_drawing import SpreadsheetDrawing
+from openpyxl.packaging.relationship import get_rels_path, get_dependents
+from openpyxl.xml.constants import IMAGE_NS
+from openpyxl.xml.functions import fromstring
+
+# Cell reference of a cell element in raw worksheet XML, as (column letters, row number)
+_CELL_REF = re.compile(rb'<(?:\w+:)?c\s[^>]*?\br="([A-Z]{1,3})(\d+)"')
+
+def sheet_dimension(ws: Any) -> str:
+    """Get the dimensions of a read-only worksheet, like the calculate_dimension() of a loaded one.
+    
+    The sheet is measured from the cell references in its raw XML instead of being
+    parsed. Its dimension record is not used, as writers often leave it stale.
+    Sheets without cells are reported as A1:A1, the dimensions openpyxl gives
+    empty sheets.
+    """
+    columns = set()
+    first_row = last_row = None
+    tail = b""
+    with ws._get_source() as src:
+        for chunk in iter(lambda: src.read(1 << 20), b""):
+            refs = _CELL_REF.findall(tail + chunk)
+            if refs:
+                columns.update(column for column, _ in refs)
+                # Cells are stored in row order, so the first and last ones give the row range
+                if first_row is None:
+                    first_row = refs[0][1]
+                last_row = refs[-1][1]
+            # Keep the end of the chunk in case a tag is split across reads. A tag that was
+            # already complete may be matched twice, which does not change the result
+            tail = chunk[-256:]
+    if last_row is None:
+        return "A1:A1"
+    column_order = lambda column: (len(column), column)
+    min_column = min(columns, key=column_order).decode()
+    max_column = max(columns, key=column_order).decode()
+    return f"{min_column}{first_row.decode()}:{max_column}{last_row.decode()}"
+
+def count_sheet_drawings(ws: Any) -> Tuple[int, int]:
+    """Count the charts and images of a read-only worksheet.
+    
+    openpyxl only loads drawings for fully loaded worksheets, so they are counted
+    from the anchors of the sheet's drawing parts, without reading the charts or
+    image data themselves.
+    """
+    archive = ws.parent._archive
+    names = set(archive.namelist())
+    rels_path = get_rels_path(ws._worksheet_path)
+    if rels_path not in names:
+        return 0, 0
+    chart_count = image_count = 0
+    for rel in get_dependents(archive, rels_path).find(SpreadsheetDrawing._rel_type):
+        try:
+            drawing = SpreadsheetDrawing.from_tree(fromstring(archive.read(rel.target)))
+        except TypeError:
+            # Unsupported DrawingML, which openpyxl skips as well
+            continue
+        chart_count += len(drawing._chart_rels)
+        drawing_rels_path = get_rels_path(rel.target)
+        if drawing_rels_path in names:
+            deps = get_dependents(archive, drawing_rels_path)
+            image_count += sum(
+                1 for blip in drawing._blip_rels
+                if deps.get(blip.embed) is not None and deps.get(blip.embed).Type == IMAGE_NS
+            )
+    return chart_count, image_count
+
+# Cell values that do not make a row count as data
+EMPTY_VALUES = frozenset((None, ""))
+
+def first_row_values(sheet: Any, row: int, min_col: int, max_col: int) -> tuple:
+    """Read the values of one row of a read-only worksheet, padded to the column range.
+    
+    The row is streamed once; looking each cell up in a read-only sheet parses the
+    sheet again from its start.
+    """
+    values = next(sheet.iter_rows(
+        min_row=row, max_row=row, min_col=min_col, max_col=max_col, values_only=True
+    ), None)
+    return values or (None,) * (max_col - min_col + 1)
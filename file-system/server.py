@@ -12,25 +12,9 @@ import time
 from datetime import datetime
 
 
-# checking some crusial imports because in the client config file the env might not have the following dependencies
-try:
-    import PyPDF2
-except ImportError:
-    print("PyPDF2 not installed. To read PDF files: pip install PyPDF2")
-
-try:
-    import docx  # for .docx files
-except ImportError:
-    print("python-docx not installed. To read Word files: pip install python-docx")
-
-try:
-    import fitz  # PyMuPDF
-
-    has_pymupdf = True
-except ImportError:
-    has_pymupdf = False
-    print("PyMuPDF not installed. For better PDF image detection: pip install pymupdf")
-
+# checking some crusial imports because in the client config file the env might not have the following dependencies.
+# The optional document libraries are checked by resources.core without importing them, and are
+# only imported by the reader that needs them
 try:
     import openpyxl  # for .xlsx files
     from openpyxl.utils import get_column_letter
@@ -41,61 +25,6 @@ except ImportError:
     has_openpyxl = False
     print("openpyxl not installed. To read Excel files: pip install openpyxl")
 
-try:
-    from pptx import Presentation  # for .pptx files
-except ImportError:
-    print(
-        "python-pptx not installed. To read PowerPoint files: pip install python-pptx"
-    )
-
-try:
-    import pdfplumber
-
-    has_pdfplumber = True
-except ImportError:
-    has_pdfplumber = False
-    print(
-        "pdfplumber not installed. For better PDF text extraction: pip install pdfplumber"
-    )
-
-try:
-    import tabula
-
-    has_tabula = True
-except ImportError:
-    has_tabula = False
-    print(
-        "Tabula-py not installed. For better PDF table extraction: pip install tabula-py"
-    )
-
-try:
-    from PIL import Image
-
-    has_pil = True
-except ImportError:
-    print("Pillow not installed. For better image analysis: pip install Pillow")
-    has_pil = False
-
-try:
-    import ebooklib
-    from ebooklib import epub
-    from bs4 import BeautifulSoup
-
-    has_epub_support = True
-except ImportError:
-    has_epub_support = False
-    print(
-        "EPUB support not available. To read EPUB files: pip install ebooklib beautifulsoup4"
-    )
-
-try:
-    import striprtf.striprtf as striprtf
-
-    has_rtf_support = True
-except ImportError:
-    has_rtf_support = False
-    print("RTF support not available. To read RTF files: pip install striprtf")
-
 from resources.core import (
     # Feature flags
     has_pymupdf,
@@ -122,17 +51,8 @@ from resources import (
     PROMPTS,
 )
 
-from resources.readers import (
-    read_text_file,
-    read_pdf_file,
-    read_docx_file,
-    read_xlsx_file,
-    read_pptx_file,
-    read_csv_file,
-    read_epub_file,
-    read_rtf_file,
-)
 from resources.utils.formatters import summarize_content
+from resources.utils.sheet_utils import first_row_values
 
 # Import Excel tools
 from resources.excel_tools import (
@@ -266,7 +186,10 @@ async def read_resource(uri: AnyUrl) -> str:
 
                 # Standard file content extraction
                 result = read_file(
-                    path, summarize=summarize, max_summary_length=max_length
+                    path,
+                    summarize=summarize,
+                    max_summary_length=max_length,
+                    metadata_only=metadata_only,
                 )
 
                 if not result["success"]:
@@ -318,25 +241,22 @@ async def read_resource(uri: AnyUrl) -> str:
 
                     for sheet in workbook.worksheets:
                         # Get sheet dimensions
-                        min_col, min_row, max_col, max_row = range_boundaries(
-                            sheet.calculate_dimension()
-                        )
+                        dimensions = sheet.calculate_dimension()
+                        min_col, min_row, max_col, max_row = range_boundaries(dimensions)
 
                         output_lines.append(f"\n📄 Sheet: {sheet.title}")
-                        output_lines.append(
-                            f"   Dimensions: {sheet.calculate_dimension()}"
-                        )
+                        output_lines.append(f"   Dimensions: {dimensions}")
                         output_lines.append(f"   Rows: {sheet.max_row}")
                         output_lines.append(f"   Columns: {max_col - min_col + 1}")
 
                         # Get column headers
+                        header_values = first_row_values(sheet, min_row, min_col, max_col)
                         columns = []
                         column_refs = []
-                        for col in range(min_col, max_col + 1):
-                            cell = sheet.cell(min_row, col)
+                        for col, value in zip(range(min_col, max_col + 1), header_values):
                             header = (
-                                cell.value
-                                if cell.value is not None
+                                value
+                                if value is not None
                                 else f"Column {get_column_letter(col)}"
                             )
                             columns.append(header)
@@ -588,7 +508,12 @@ async def call_tool(tool_name: str, arguments: dict) -> list[types.TextContent]:
                 ]
 
             # Standard file content extraction
-            result = read_file(path, summarize=summarize, max_summary_length=max_length)
+            result = read_file(
+                path,
+                summarize=summarize,
+                max_summary_length=max_length,
+                metadata_only=metadata_only,
+            )
 
             if not result["success"]:
                 return [
@@ -646,24 +571,23 @@ async def call_tool(tool_name: str, arguments: dict) -> list[types.TextContent]:
                 output_lines.append("\nSheet Information:")
 
                 for sheet in workbook.worksheets:
-                    # Get sheet dimensions
-                    min_col, min_row, max_col, max_row = range_boundaries(
-                        sheet.calculate_dimension()
-                    )
+                    # Get sheet dimensions, computed once for the bounds and the output
+                    dimensions = sheet.calculate_dimension()
+                    min_col, min_row, max_col, max_row = range_boundaries(dimensions)
 
                     output_lines.append(f"\n📄 Sheet: {sheet.title}")
-                    output_lines.append(f"   Dimensions: {sheet.calculate_dimension()}")
+                    output_lines.append(f"   Dimensions: {dimensions}")
                     output_lines.append(f"   Rows: {sheet.max_row}")
                     output_lines.append(f"   Columns: {max_col - min_col + 1}")
 
                     # Get column headers
+                    header_values = first_row_values(sheet, min_row, min_col, max_col)
                     columns = []
                     column_refs = []
-                    for col in range(min_col, max_col + 1):
-                        cell = sheet.cell(min_row, col)
+                    for col, value in zip(range(min_col, max_col + 1), header_values):
                         header = (
-                            cell.value
-                            if cell.value is not None
+                            value
+                            if value is not None
                             else f"Column {get_column_letter(col)}"
                         )
                         columns.append(header)
@@ -1566,6 +1490,7 @@ async def call_tool(tool_name: str, arguments: dict) -> list[types.TextContent]:
             column_position = arguments.get("column_position")
             data = arguments.get("data")
             header_style = arguments.get("header_style")
+            streaming = arguments.get("streaming", False)
             
             # If path doesn't exist, try to find it in allowed directories
             if not os.path.exists(path):
@@ -1590,7 +1515,9 @@ async def call_tool(tool_name: str, arguments: dict) -> list[types.TextContent]:
                 ]
                 
             # Add column
-            result = add_excel_column(path, sheet_name, column_name, column_position, data, header_style)
+            result = add_excel_column(
+                path, sheet_name, column_name, column_position, data, header_style, streaming=streaming
+            )
 
             if result["success"]:
                 return [types.TextContent(type="text", text=result["message"])]
@@ -0,0 +1,20 @@
+"""Tests for the EPUB reader."""
+import unittest
+
+from resources.readers.ebook_readers import _chapter_to_text, has_epub_support
+
+@unittest.skipUnless(has_epub_support, "ebooklib and lxml are not installed")
+class ChapterToTextTest(unittest.TestCase):
+    def test_utf8_without_declaration(self):
+        html = "<html><body><p>café</p></body></html>".encode("utf-8")
+        self.assertEqual(_chapter_to_text(html), "café")
+
+    def test_utf8_with_xml_declaration(self):
+        html = '<?xml version="1.0" encoding="utf-8"?><html><body><p>naïve</p></body></html>'.encode("utf-8")
+        self.assertEqual(_chapter_to_text(html), "naïve")
+
+    def test_empty_document(self):
+        self.assertEqual(_chapter_to_text(b"  "), "")
+
+if __name__ == "__main__":
+    unittest.main()
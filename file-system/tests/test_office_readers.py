@@ -0,0 +1,82 @@
+"""Tests for the Excel reader, comparing the calamine and openpyxl reading paths."""
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+
+import openpyxl
+
+from resources.readers import office_readers
+
+def _write_workbook(path: str) -> None:
+    """Write a workbook whose sheets are large enough to be read with calamine"""
+    rows = office_readers._CALAMINE_MIN_ROWS + 200
+    wb = openpyxl.Workbook()
+    values = wb.active
+    values.title = "Values"
+    values.append(["int", "float", "large", "text", "flag", "day", "moment", "clock", "span", "blank"])
+    for i in range(rows):
+        values.append([
+            i, i / 7, 1e20, f"row {i}", i % 3 == 0, date(2024, 1, 1 + i % 28),
+            datetime(2024, 1, 1, 5, 6, 7) + timedelta(hours=i), time(i % 24, 30),
+            timedelta(hours=30), "" if i % 4 else None
+        ])
+    # Escaped characters and error cells, which calamine reads differently
+    special = wb.create_sheet("Special")
+    special.append(["text", "error"])
+    for i in range(rows):
+        special.append([f"x_x005F_y {i}" if i % 2 else "_x000D_", "#DIV/0!" if i % 5 == 0 else i])
+    wb.save(path)
+
+@unittest.skipUnless(office_readers.has_calamine, "python-calamine is not installed")
+class CalamineParityTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        handle, cls.path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(handle)
+        _write_workbook(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.path)
+
+    def assert_same_as_openpyxl(self, sheet_name, cell_range=None):
+        result = office_readers.read_xlsx_file(self.path, sheet_name, cell_range)
+        with mock.patch.object(office_readers, "has_calamine", False):
+            expected = office_readers.read_xlsx_file(self.path, sheet_name, cell_range)
+        self.assertNotIn("error", expected)
+        self.assert_same_result(result, expected)
+
+    def assert_same_result(self, result, expected):
+        # Rows are compared one at a time, as a diff of whole results is too slow to report
+        records, expected_records = result["sheet"][0].pop("records"), expected["sheet"][0].pop("records")
+        self.assertEqual(result, expected)
+        self.assertEqual(len(records), len(expected_records))
+        for record, expected_record in zip(records, expected_records):
+            self.assertEqual(record, expected_record)
+
+    def test_values_match_openpyxl(self):
+        with mock.patch.object(office_readers, "CalamineWorkbook", wraps=office_readers.CalamineWorkbook) as calamine:
+            self.assert_same_as_openpyxl("Values")
+        self.assertTrue(calamine.from_path.called)
+
+    def test_range_matches_openpyxl(self):
+        self.assert_same_as_openpyxl("Values", "B3:H1100")
+
+    def test_escapes_and_errors_match_openpyxl(self):
+        self.assert_same_as_openpyxl("Special")
+        records = office_readers.read_xlsx_file(self.path, "Special")["sheet"][0]["records"]
+        self.assertEqual(records[0]["values"], ["_x000D_", "#DIV/0!"])
+        self.assertEqual(records[1]["values"], ["x_x005F_y 1", 1])
+
+    def test_parsed_file_matches_reader(self):
+        parsed = office_readers.ParsedXlsxFile(self.path)
+        for sheet_name, cell_range in (("Values", None), ("Values", "A1:C10"), ("Special", "A900:B1300")):
+            self.assert_same_result(
+                parsed.read(sheet_name, cell_range),
+                office_readers.read_xlsx_file(self.path, sheet_name, cell_range)
+            )
+
+if __name__ == "__main__":
+    unittest.main()